@@ -0,0 +1,64 @@
+"""
+Benchmark for computer opponent strategies
+Trains each strategy on a long move sequence, then measures per-move decision latency
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from strategies import STRATEGIES, create_strategy
+
+
+def bench_strategy(name, warmup_rounds=1_000_000, timed_rounds=100_000, seed=1):
+    """
+    Measure choose() + observe() latency for one strategy
+    
+    Args:
+        name: Registered strategy name
+        warmup_rounds: Rounds fed to the strategy before timing
+        timed_rounds: Rounds to time after warm-up
+        seed: Seed for the generated opponent moves
+    
+    Returns:
+        Mean microseconds per move
+    """
+    rng = random.Random(seed)
+    strategy = create_strategy(name)
+    
+    # Slightly biased opponent so predictive strategies have something to learn
+    opponent = rng.choices(range(3), weights=(5, 3, 2), k=warmup_rounds + timed_rounds)
+    
+    for move in opponent[:warmup_rounds]:
+        strategy.observe(move, strategy.choose())
+    
+    timed = opponent[warmup_rounds:]
+    start = time.perf_counter()
+    for move in timed:
+        strategy.observe(move, strategy.choose())
+    elapsed = time.perf_counter() - start
+    
+    return elapsed / len(timed) * 1e6
+
+
+def main():
+    """Run the strategy benchmark"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors strategy benchmark')
+    parser.add_argument('--warmup', type=int, default=1_000_000, help='Rounds played before timing')
+    parser.add_argument('--rounds', type=int, default=100_000, help='Rounds timed per strategy')
+    args = parser.parse_args()
+    
+    print(f"Per-move latency after {args.warmup:,} warm-up rounds")
+    for name in STRATEGIES:
+        micros = bench_strategy(name, args.warmup, args.rounds)
+        print(f"  {name:<10} {micros:8.3f} us/move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Load test for the asyncio match server
+Connects many scripted clients and reports sustained rounds per second
+"""
+
+import asyncio
+import random
+import sys
+import os
+import time
+
+# Add multiplayer and src directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'multiplayer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from async_server import AsyncGameServer
+from utils import create_message, parse_message
+
+MOVES = ["Rock", "Paper", "Scissors"]
+
+
+def raise_fd_limit(needed):
+    """Raise the open-file limit where the platform allows it"""
+    try:
+        import resource
+    except ImportError:
+        return
+    
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+async def run_client(host, port, deadline, counters):
+    """Answer every round prompt with a random move until the deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    counters["connected"] += 1
+    
+    try:
+        while True:
+            # An unpaired client never gets a prompt, so never wait past the deadline
+            try:
+                line = await asyncio.wait_for(reader.readline(), deadline - time.perf_counter())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            
+            msg = parse_message(line.decode())
+            if not msg:
+                continue
+            
+            if msg.get("type") == "move":
+                writer.write((create_message("move", player="client",
+                                             move=random.choice(MOVES)) + "\n").encode())
+            elif msg.get("type") == "result":
+                counters["results"] += 1
+            elif msg.get("type") == "disconnect":
+                break
+    finally:
+        writer.close()
+
+
+async def load_test(clients, duration, host=None, port=50007):
+    """
+    Run the load test
+    
+    Args:
+        clients: Number of simultaneous clients
+        duration: Seconds to keep playing
+        host: External server to target (None starts one in-process)
+        port: Server port
+    
+    Returns:
+        Dictionary of results
+    """
+    server = None
+    if host is None:
+        server = AsyncGameServer('127.0.0.1', 0, max_clients=clients, verbose=False)
+        await server.start()
+        host, port = '127.0.0.1', server.port
+    
+    counters = {"connected": 0, "results": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    
+    tasks = [asyncio.create_task(run_client(host, port, deadline, counters))
+             for _ in range(clients)]
+    await asyncio.wait(tasks)
+    elapsed = time.perf_counter() - start
+    
+    if server is not None:
+        await server.stop()
+    
+    # Each resolved round produces one result per client in the match
+    rounds = counters["results"] // 2
+    return {
+        "clients": counters["connected"],
+        "rounds": rounds,
+        "seconds": elapsed,
+        "rounds_per_second": rounds / elapsed,
+    }
+
+
+def main():
+    """Main function to run the load test"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors match server load test')
+    parser.add_argument('--clients', type=int, default=1000, help='Simultaneous clients (even number)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+    parser.add_argument('--host', default=None, help='External server (default: start one in-process)')
+    parser.add_argument('--port', type=int, default=50007, help='External server port')
+    args = parser.parse_args()
+    
+    # Both ends of every connection live in this process when the server is in-process
+    raise_fd_limit(args.clients * 2 + 256)
+    
+    results = asyncio.run(load_test(args.clients, args.duration, args.host, args.port))
+    print(f"Clients connected: {results['clients']}")
+    print(f"Rounds played:     {results['rounds']}")
+    print(f"Elapsed:           {results['seconds']:.2f}s")
+    print(f"Rounds per second: {results['rounds_per_second']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
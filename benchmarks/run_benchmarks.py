@@ -0,0 +1,230 @@
+"""
+Micro-benchmark suite for the Rock-Paper-Scissors core
+Times game logic, message encoding and a loopback Wi-Fi round trip,
+reports JSON and compares against a saved baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py --save-baseline baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json
+"""
+
+import json
+import platform
+import statistics
+import sys
+import os
+import threading
+import time
+
+# Add multiplayer and src directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'multiplayer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import wifi_client
+import wifi_server
+from game_logic import GameLogic
+from move_providers import IterableMoveProvider
+from utils import create_message, parse_message
+
+MOVES = ["Rock", "Paper", "Scissors"]
+
+# A benchmark is slower than its baseline if it exceeds it by this fraction
+DEFAULT_TOLERANCE = 0.25
+
+# Seconds to wait for the round-trip benchmark's server to start listening
+SERVER_START_TIMEOUT = 10.0
+
+
+def bench_decide_winner(loops):
+    """All nine move pairs through GameLogic.decide_winner"""
+    game = GameLogic()
+    pairs = [(a, b) for a in MOVES for b in MOVES] * (loops // 9 + 1)
+    pairs = pairs[:loops]
+    decide = game.decide_winner
+    
+    start = time.perf_counter()
+    for player, opponent in pairs:
+        decide(player, opponent)
+    return time.perf_counter() - start
+
+
+def bench_play_round(loops):
+    """GameLogic.play_round with a fixed computer move and bounded history"""
+    game = GameLogic(history_limit=1000)
+    moves = (MOVES * (loops // 3 + 1))[:loops]
+    play = game.play_round
+    
+    start = time.perf_counter()
+    for move in moves:
+        play(move, "Rock")
+    return time.perf_counter() - start
+
+
+def bench_create_message(loops):
+    """utils.create_message for a typical result message"""
+    start = time.perf_counter()
+    for round_num in range(loops):
+        create_message("result", winner="server", server_move="Rock", client_move="Scissors",
+                       server_score=round_num, client_score=0, round=round_num)
+    return time.perf_counter() - start
+
+
+def bench_parse_message(loops):
+    """utils.parse_message for a typical result message"""
+    data = create_message("result", winner="server", server_move="Rock", client_move="Scissors",
+                          server_score=10, client_score=3, round=13)
+    
+    start = time.perf_counter()
+    for _ in range(loops):
+        parse_message(data)
+    return time.perf_counter() - start
+
+
+def bench_wifi_round_trip(loops):
+    """
+    Full WiFiServer/WiFiClient game over loopback TCP
+    
+    Both sides play scripted moves without console output, so the time
+    covers connection setup, the handshake and `loops` lockstep rounds
+    (move, move, result).
+    """
+    server_moves = IterableMoveProvider(MOVES[i % 3] for i in range(loops))
+    client_moves = IterableMoveProvider(MOVES[(i + 1) % 3] for i in range(loops))
+    
+    server = wifi_server.WiFiServer(host='127.0.0.1', port=0,
+                                    move_provider=server_moves, verbose=False)
+    
+    start = time.perf_counter()
+    server_thread = threading.Thread(target=server.start, daemon=True)
+    server_thread.start()
+    if not server.started.wait(SERVER_START_TIMEOUT) or not server.running:
+        raise RuntimeError("WiFiServer did not start listening")
+    port = server.server_socket.getsockname()[1]
+    
+    client = wifi_client.WiFiClient('127.0.0.1', port, move_provider=client_moves, verbose=False)
+    client.connect()
+    server_thread.join()
+    elapsed = time.perf_counter() - start
+    
+    if client.client_score != loops:
+        raise RuntimeError(f"Round trip finished {client.client_score} of {loops} rounds")
+    return elapsed
+
+
+# name -> (function, loops per sample)
+BENCHMARKS = {
+    "decide_winner": (bench_decide_winner, 100_000),
+    "play_round": (bench_play_round, 50_000),
+    "create_message": (bench_create_message, 50_000),
+    "parse_message": (bench_parse_message, 50_000),
+    "wifi_round_trip": (bench_wifi_round_trip, 500),
+}
+
+
+def run_benchmark(name, repeats=5, scale=1.0):
+    """
+    Time one benchmark several times
+    
+    Args:
+        name: Key in BENCHMARKS
+        repeats: Number of timed samples
+        scale: Multiplier for the loop count (use < 1 for quick runs)
+    
+    Returns:
+        Dict with per-operation timings in nanoseconds
+    """
+    func, loops = BENCHMARKS[name]
+    loops = max(1, int(loops * scale))
+    
+    samples = [func(loops) / loops * 1e9 for _ in range(repeats)]
+    
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "ns_per_op": statistics.median(samples),
+        "min_ns_per_op": min(samples),
+        "max_ns_per_op": max(samples),
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with a baseline report
+    
+    Args:
+        results: "benchmarks" section of a report
+        baseline: "benchmarks" section of the baseline report
+        tolerance: Allowed slowdown as a fraction of the baseline
+    
+    Returns:
+        List of (name, baseline ns, current ns, ratio) for every regression
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ns_per_op"]
+        ratio = result["ns_per_op"] / before if before else 1.0
+        if ratio > 1 + tolerance:
+            regressions.append((name, before, result["ns_per_op"], ratio))
+    return regressions
+
+
+def main():
+    """Run the benchmark suite"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors micro-benchmark suite')
+    parser.add_argument('names', nargs='*', help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--repeats', type=int, default=5, help='Timed samples per benchmark')
+    parser.add_argument('--quick', action='store_true', help='Run a tenth of the usual loops')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--baseline', help='Fail if slower than this saved report')
+    parser.add_argument('--save-baseline', help='Also save the report as a baseline file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown against the baseline (0.25 = 25%%)')
+    args = parser.parse_args()
+    
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    scale = 0.1 if args.quick else 1.0
+    
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "benchmarks": {},
+    }
+    for name in names:
+        report["benchmarks"][name] = run_benchmark(name, args.repeats, scale)
+        print(f"  {name:<16} {report['benchmarks'][name]['ns_per_op']:12.1f} ns/op",
+              file=sys.stderr)
+    
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+        
+        regressions = compare(report["benchmarks"], baseline, args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(f"❌ {name} regressed: {before:.1f} -> {after:.1f} ns/op ({ratio:.2f}x)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
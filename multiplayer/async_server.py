@@ -0,0 +1,321 @@
+"""
+Asyncio game server for Rock-Paper-Scissors Multiplayer
+Accepts many clients at once and pairs them into independent matches
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from utils import get_local_ip, create_message, parse_message, validate_move
+
+# Rounds of history each match keeps, so long-running servers stay flat in memory
+MATCH_HISTORY_LIMIT = 1000
+
+# Unsent bytes a client may fall behind by before it is dropped
+MAX_SEND_BUFFER = 256 * 1024
+
+
+class ClientSession:
+    """One connected client"""
+    
+    def __init__(self, reader, writer, client_id):
+        self.reader = reader
+        self.writer = writer
+        self.client_id = client_id
+        self.address = writer.get_extra_info("peername")
+        self.match = None
+        self.side = None  # 0 or 1 inside the match
+    
+    def send(self, message):
+        """
+        Queue a message on the client's transport (never blocks)
+        
+        A client that stopped reading is dropped once MAX_SEND_BUFFER bytes
+        are waiting for it, instead of buffering without limit.
+        """
+        if self.writer.is_closing():
+            return
+        self.writer.write((message + "\n").encode())
+        if self.writer.transport.get_write_buffer_size() > MAX_SEND_BUFFER:
+            # close() would wait to flush what the client is not reading
+            self.writer.transport.abort()
+    
+    def close(self):
+        """Close the client's connection"""
+        if not self.writer.is_closing():
+            self.writer.close()
+
+
+class Match:
+    """A match between two clients with its own GameLogic"""
+    
+    def __init__(self, match_id, first, second):
+        self.match_id = match_id
+        self.players = (first, second)
+        self.game_logic = GameLogic(history_limit=MATCH_HISTORY_LIMIT)
+        self.moves = [None, None]
+        self.current_round = 1
+        self.finished = False
+        
+        for side, session in enumerate(self.players):
+            session.match = self
+            session.side = side
+    
+    def start(self):
+        """Tell both clients the first round has started"""
+        self._prompt_round()
+    
+    def _prompt_round(self):
+        # Same round prompt WiFiServer sends, without revealing any move
+        prompt = create_message("move", player="server", round=self.current_round)
+        for session in self.players:
+            session.send(prompt)
+    
+    def submit(self, side, move):
+        """
+        Record a client's move and resolve the round once both have moved
+        
+        Args:
+            side: 0 or 1
+            move: The client's move
+        
+        Returns:
+            True if this move completed the round
+        """
+        if self.finished or self.moves[side] is not None or not validate_move(move):
+            return False
+        
+        self.moves[side] = move
+        if self.moves[1 - side] is None:
+            return False
+        
+        first_move, second_move = self.moves
+        _, result, _ = self.game_logic.play_round(first_move, second_move)
+        scores = (self.game_logic.player_score, self.game_logic.computer_score)
+        
+        # Every client sees itself as "client" and its opponent as "server"
+        for own_side, session in enumerate(self.players):
+            other = 1 - own_side
+            if result == "tie":
+                winner = "tie"
+            elif (result == "player1") == (own_side == 0):
+                winner = "client"
+            else:
+                winner = "server"
+            
+            session.send(create_message("result",
+                                        winner=winner,
+                                        server_move=self.moves[other],
+                                        client_move=self.moves[own_side],
+                                        server_score=scores[other],
+                                        client_score=scores[own_side],
+                                        round=self.current_round))
+        
+        self.moves = [None, None]
+        self.current_round += 1
+        self._prompt_round()
+        return True
+    
+    def end(self, leaving_side):
+        """
+        End the match when one client leaves
+        
+        Args:
+            leaving_side: Side of the client that left
+        """
+        if self.finished:
+            return
+        self.finished = True
+        
+        opponent = self.players[1 - leaving_side]
+        opponent.send(create_message("disconnect"))
+        opponent.close()
+
+
+class AsyncGameServer:
+    """Asyncio server that hosts many concurrent matches"""
+    
+    def __init__(self, host='0.0.0.0', port=50007, max_clients=10000, verbose=True):
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+        self.verbose = verbose
+        
+        self.server = None
+        self.clients = {}
+        self.matches = {}
+        self.waiting = None
+        self.rounds_resolved = 0
+        
+        self._handlers = set()
+        self._next_client_id = 0
+        self._next_match_id = 0
+    
+    def log(self, text):
+        """Print a status line unless the server runs quietly"""
+        if self.verbose:
+            print(text)
+    
+    async def start(self):
+        """Start listening for clients"""
+        self.server = await asyncio.start_server(
+            self._handle_client, self.host, self.port,
+            reuse_address=True, backlog=min(self.max_clients, 4096))
+        
+        # Port 0 picks a free port, report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        
+        self.log("=" * 60)
+        self.log("🎮 Rock-Paper-Scissors Match Server Started!")
+        self.log("=" * 60)
+        self.log(f"Server IP: {get_local_ip()}")
+        self.log(f"Server Port: {self.port}")
+        self.log(f"Max Clients: {self.max_clients}")
+        self.log("=" * 60)
+    
+    async def serve_forever(self):
+        """Start the server and run until cancelled"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+    
+    async def stop(self):
+        """Disconnect every client and stop listening"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        
+        for session in list(self.clients.values()):
+            session.send(create_message("disconnect"))
+            session.close()
+        
+        # Let every client handler see its connection close and clean up
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        
+        self.log("\n👋 Server stopped")
+    
+    def stats(self):
+        """
+        Get server counters
+        
+        Returns:
+            Dictionary with connected clients, active matches and resolved rounds
+        """
+        return {
+            "clients": len(self.clients),
+            "matches": len(self.matches),
+            "rounds": self.rounds_resolved,
+        }
+    
+    async def _handle_client(self, reader, writer):
+        """Serve one client for the lifetime of its connection"""
+        if len(self.clients) >= self.max_clients:
+            writer.write((create_message("disconnect", reason="server full") + "\n").encode())
+            writer.close()
+            return
+        
+        session = ClientSession(reader, writer, self._next_client_id)
+        self._next_client_id += 1
+        self.clients[session.client_id] = session
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        
+        session.send(create_message("handshake", player="server", version="1.0"))
+        self._pair(session)
+        
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                
+                try:
+                    if not self._handle_message(session, line):
+                        break
+                except Exception as e:
+                    # A bad message must not end the match for the opponent too
+                    self.log(f"⚠️ Skipping malformed message from client {session.client_id}: {e}")
+                
+                # Stop reading from a client that is not reading its replies
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # readline() refuses lines longer than the stream limit (64 KiB)
+            self.log(f"⚠️ Dropping client {session.client_id}: message too long")
+        finally:
+            self._drop(session)
+            self._handlers.discard(handler)
+    
+    def _handle_message(self, session, line: bytes) -> bool:
+        """
+        Act on one line from a client
+        
+        Returns:
+            False once the client asked to disconnect
+        """
+        msg = parse_message(line.decode())
+        if not isinstance(msg, dict):
+            return True
+        
+        msg_type = msg.get("type")
+        if msg_type == "move":
+            match = session.match
+            if match is not None and match.submit(session.side, msg.get("move")):
+                self.rounds_resolved += 1
+        elif msg_type == "disconnect":
+            return False
+        return True
+    
+    def _pair(self, session):
+        """Pair a new client with the waiting one, or make it wait"""
+        if self.waiting is None:
+            self.waiting = session
+            return
+        
+        opponent, self.waiting = self.waiting, None
+        match = Match(self._next_match_id, opponent, session)
+        self._next_match_id += 1
+        self.matches[match.match_id] = match
+        match.start()
+    
+    def _drop(self, session):
+        """Forget a client and end its match"""
+        self.clients.pop(session.client_id, None)
+        if self.waiting is session:
+            self.waiting = None
+        
+        match = session.match
+        if match is not None:
+            match.end(session.side)
+            self.matches.pop(match.match_id, None)
+        
+        session.close()
+
+
+def main():
+    """Main function to start the asyncio match server"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors multi-client match server')
+    parser.add_argument('--host', default='0.0.0.0', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=50007, help='Port to listen on')
+    parser.add_argument('--max-clients', type=int, default=10000, help='Maximum simultaneous clients')
+    args = parser.parse_args()
+    
+    server = AsyncGameServer(args.host, args.port, args.max_clients)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n👋 Server shutting down...")
+
+
+if __name__ == "__main__":
+    main()
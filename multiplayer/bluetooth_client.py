@@ -13,7 +13,9 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils import create_message, parse_message
+from moves import parse_move
+from framing import MessageStream
+import metrics
 
 # Try to import Bluetooth libraries
 try:
@@ -45,7 +47,9 @@ class BluetoothClient:
         
         self.bluetooth_type = BLUETOOTH_TYPE
         self.socket = None
+        self.stream = None
         self.running = False
+        self.round_timer = metrics.round_timer()
     
     def find_service(self):
         """Find the Rock-Paper-Scissors service"""
@@ -88,16 +92,17 @@ class BluetoothClient:
             # Create socket and connect
             self.socket = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
             self.socket.connect((host, port))
+            self.stream = MessageStream(self.socket)
             
             print("✅ Connected to server!")
             self.running = True
             
             # Receive handshake
-            data = self.socket.recv(1024).decode().strip()
-            handshake = parse_message(data)
+            handshake = self.stream.receive()
             
             if handshake and handshake.get("type") == "handshake":
                 print(f"🤝 Handshake received from {handshake.get('player')}")
+                self.stream.answer_handshake(handshake, "client")
                 self.game_loop()
             else:
                 print("❌ Invalid handshake from server")
@@ -125,49 +130,45 @@ class BluetoothClient:
                 
                 # Wait for server move
                 print("⏳ Waiting for opponent to make a move...")
-                data = self.socket.recv(1024).decode().strip()
+                server_msg = self.stream.receive()
                 
-                if not data:
+                if server_msg is None:
                     print("❌ Connection lost!")
                     break
                 
-                server_msg = parse_message(data)
-                
                 if server_msg and server_msg.get("type") == "move":
                     print("✅ Opponent has made their move")
                     
                     # Get client move
+                    self.round_timer.start()
                     client_move = None
-                    while client_move not in ["Rock", "Paper", "Scissors"]:
+                    while client_move is None:
                         move_input = input("Your move (Rock/Paper/Scissors): ").strip()
                         
                         if move_input.lower() == 'quit':
-                            disconnect_msg = create_message("disconnect")
-                            self.socket.send(disconnect_msg + "\n")
+                            self.stream.send_message("disconnect")
                             self.running = False
                             break
                         
-                        move_input = move_input.capitalize()
-                        if move_input in ["Rock", "Paper", "Scissors"]:
-                            client_move = move_input
-                        else:
+                        client_move = parse_move(move_input)
+                        if client_move is None:
                             print("❌ Invalid move! Please choose Rock, Paper, or Scissors")
                     
                     if not self.running:
                         break
                     
                     # Send move to server
-                    move_msg = create_message("move", player="client", 
-                                             move=client_move, round=round_num)
-                    self.socket.send(move_msg + "\n")
+                    self.stream.send_message("move", player="client", 
+                                            move=client_move, round=round_num)
                     print(f"✅ Sent your move: {client_move}")
+                    self.round_timer.moved()
                     
                     # Wait for result
                     print("⏳ Waiting for result...")
-                    result_data = self.socket.recv(1024).decode().strip()
-                    result_msg = parse_message(result_data)
+                    result_msg = self.stream.receive()
                     
                     if result_msg and result_msg.get("type") == "result":
+                        self.round_timer.finished()
                         winner = result_msg.get("winner")
                         server_move = result_msg.get("server_move")
                         client_move_result = result_msg.get("client_move")
@@ -239,6 +240,7 @@ def main():
     parser.add_argument('--host', help='Server Bluetooth address (optional, will search if not provided)')
     parser.add_argument('--port', type=int, help='Server port (optional)')
     args = parser.parse_args()
+    metrics.enable_from_env()
     
     client = BluetoothClient()
     client.connect(args.host, args.port)
@@ -13,7 +13,9 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils import create_message, parse_message
+from moves import WINNERS, parse_move
+from framing import MessageStream
+import metrics
 
 # Try to import Bluetooth libraries
 try:
@@ -46,7 +48,9 @@ class BluetoothServer:
         self.bluetooth_type = BLUETOOTH_TYPE
         self.server_socket = None
         self.client_socket = None
+        self.stream = None
         self.running = False
+        self.round_timer = metrics.round_timer()
     
     def start_classic(self):
         """Start classic Bluetooth server using PyBluez"""
@@ -87,10 +91,10 @@ class BluetoothServer:
             # Accept connection
             self.client_socket, client_info = self.server_socket.accept()
             print(f"\n✅ Client connected: {client_info}")
+            self.stream = MessageStream(self.client_socket)
             
-            # Send handshake
-            handshake = create_message("handshake", player="server", version="1.0")
-            self.client_socket.send(handshake + "\n")
+            # Send handshake (advertises the binary codec, JSON stays the fallback)
+            self.stream.offer_codecs("server")
             
             # Game loop
             self.game_loop()
@@ -115,49 +119,53 @@ class BluetoothServer:
                 print(f"\n--- Round {round_num} ---")
                 
                 # Get server move
+                self.round_timer.start()
                 server_move = None
-                while server_move not in ["Rock", "Paper", "Scissors"]:
+                while server_move is None:
                     move_input = input("Your move (Rock/Paper/Scissors): ").strip()
                     
                     if move_input.lower() == 'quit':
-                        disconnect_msg = create_message("disconnect")
-                        self.client_socket.send(disconnect_msg + "\n")
+                        self.stream.send_message("disconnect")
                         self.running = False
                         break
                     
-                    move_input = move_input.capitalize()
-                    if move_input in ["Rock", "Paper", "Scissors"]:
-                        server_move = move_input
-                    else:
+                    server_move = parse_move(move_input)
+                    if server_move is None:
                         print("❌ Invalid move! Please choose Rock, Paper, or Scissors")
                 
                 if not self.running:
                     break
                 
                 # Send move to client
-                move_msg = create_message("move", player="server", 
-                                         move=server_move, round=round_num)
-                self.client_socket.send(move_msg + "\n")
+                self.stream.send_message("move", player="server", 
+                                        move=server_move, round=round_num)
                 print(f"✅ Sent your move: {server_move}")
+                self.round_timer.moved()
                 
                 # Wait for client move
                 print("⏳ Waiting for opponent's move...")
-                data = self.client_socket.recv(1024).decode().strip()
+                client_msg = self.stream.receive()
+                while client_msg is not None:
+                    if client_msg.get("type") == "handshake":
+                        # The client confirms its codec with a handshake of its own
+                        self.stream.accept_codec(client_msg)
+                    elif client_msg.get("type") == "move" and \
+                            parse_move(str(client_msg.get("move"))) is None:
+                        print(f"⚠️ Ignoring invalid move from client: {client_msg.get('move')!r}")
+                    else:
+                        break
+                    client_msg = self.stream.receive()
                 
-                if not data:
+                if client_msg is None:
                     print("❌ Connection lost!")
                     break
                 
-                client_msg = parse_message(data)
-                
                 if client_msg and client_msg.get("type") == "move":
-                    client_move = client_msg.get("move")
+                    client_move = parse_move(str(client_msg.get("move")))
                     print(f"📨 Received opponent's move: {client_move}")
                     
                     # Determine winner
-                    from game_logic import GameLogic
-                    game = GameLogic()
-                    result = game.decide_winner(server_move, client_move)
+                    result = WINNERS[(server_move, client_move)]
                     
                     if result == "player1":
                         server_score += 1
@@ -172,14 +180,14 @@ class BluetoothServer:
                         winner = "tie"
                     
                     # Send result
-                    result_msg = create_message("result", 
-                                               winner=winner,
-                                               server_move=server_move,
-                                               client_move=client_move,
-                                               server_score=server_score,
-                                               client_score=client_score,
-                                               round=round_num)
-                    self.client_socket.send(result_msg + "\n")
+                    self.stream.send_message("result", 
+                                            winner=winner,
+                                            server_move=server_move,
+                                            client_move=client_move,
+                                            server_score=server_score,
+                                            client_score=client_score,
+                                            round=round_num)
+                    self.round_timer.finished()
                     
                     # Display result
                     print("\n" + "=" * 40)
@@ -232,6 +240,7 @@ def main():
         return
     
     print(f"Using {BLUETOOTH_TYPE} Bluetooth")
+    metrics.enable_from_env()
     
     server = BluetoothServer()
     server.start()
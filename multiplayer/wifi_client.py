@@ -1,9 +1,13 @@
 """
 Wi-Fi Client for Rock-Paper-Scissors Multiplayer
 Connects to a server to play multiplayer
+
+The game mode (lockstep or concurrent) is chosen by the server and
+announced in its handshake.
 """
 
 import socket
+import threading
 import json
 import sys
 import os
@@ -11,77 +15,121 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils import create_message, parse_message
+from commit_reveal import DRAIN_TIMEOUT, RoundBook
+from framing import MessageStream
+from heartbeat import HANDSHAKE_TIMEOUT, HEARTBEAT_INTERVAL, shared_monitor
+import metrics
+from move_providers import ConsoleMoveProvider, create_move_provider
 
 
 class WiFiClient:
     """Wi-Fi client for multiplayer Rock-Paper-Scissors"""
     
-    def __init__(self, host, port=50007):
+    def __init__(self, host, port=50007, move_provider=None, verbose=True,
+                 heartbeat=HEARTBEAT_INTERVAL):
         self.host = host
         self.port = port
         self.socket = None
+        self.stream = None
         self.running = False
         
         self.client_score = 0
         self.server_score = 0
         
+        self.round_book = RoundBook()
+        
+        self.move_provider = move_provider or ConsoleMoveProvider()
+        self.verbose = verbose
+        
+        # Seconds between keepalive pings (None or 0 disables them)
+        self.heartbeat = heartbeat
+        self.monitor = None
+        
+        # Round latency histograms (no-op unless metrics.enable() ran first)
+        self.round_timer = metrics.round_timer()
+    
     def connect(self):
         """Connect to the server"""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            print(f"🔌 Connecting to {self.host}:{self.port}...")
+            self.log(f"🔌 Connecting to {self.host}:{self.port}...")
+            # Bounded until the handshake is done, the heartbeat takes over after that
+            self.socket.settimeout(HANDSHAKE_TIMEOUT)
             self.socket.connect((self.host, self.port))
-            print("✅ Connected to server!")
+            self.stream = MessageStream(self.socket)
+            self.log("✅ Connected to server!")
+            if self.heartbeat:
+                self.start_heartbeat()
             
             # Receive handshake
             handshake = self.receive_message()
             if handshake and handshake.get("type") == "handshake":
-                print(f"🤝 Handshake received from {handshake.get('player')}")
+                self.log(f"🤝 Handshake received from {handshake.get('player')}")
+                self.stream.answer_handshake(handshake, "client")
+                self.socket.settimeout(None)
                 self.running = True
                 
                 # Start game loop
-                self.game_loop()
+                if handshake.get("mode") == "concurrent":
+                    self.concurrent_loop()
+                else:
+                    self.game_loop()
             else:
                 print("❌ Invalid handshake from server")
                 
         except ConnectionRefusedError:
             print("❌ Connection refused. Make sure the server is running.")
+        except socket.timeout:
+            print("❌ Server did not answer in time.")
         except Exception as e:
             print(f"❌ Connection error: {e}")
         finally:
             self.disconnect()
     
-    def send_message(self, message):
+    def start_heartbeat(self):
+        """Ping the server and give up on it if it stops answering"""
+        self.monitor = shared_monitor(self.heartbeat)
+        self.monitor.add(self.stream, on_dead=self.on_peer_timeout)
+    
+    def on_peer_timeout(self, stream):
+        """The server went silent: unblock the game loop, which then stops"""
+        print(f"💀 Server stopped responding (no reply for {self.monitor.timeout:.0f}s)")
+        stream.shutdown()
+    
+    def log(self, text=""):
+        """Print a status line unless running quietly (bot/scripted play)"""
+        if self.verbose:
+            print(text)
+    
+    def send_message(self, msg_type, **kwargs):
         """Send a message to the server"""
         try:
-            self.socket.sendall((message + "\n").encode())
+            self.stream.send_message(msg_type, **kwargs)
         except Exception as e:
             print(f"❌ Error sending message: {e}")
     
     def receive_message(self):
         """Receive a message from the server"""
         try:
-            data = self.socket.recv(1024).decode().strip()
-            return parse_message(data)
+            return self.stream.receive()
         except Exception as e:
             print(f"❌ Error receiving message: {e}")
             return None
     
     def game_loop(self):
         """Main game loop"""
-        print("\n🎮 Game started! Type 'Rock', 'Paper', or 'Scissors' to play")
-        print("Type 'quit' to exit\n")
+        self.log("\n🎮 Game started! Type 'Rock', 'Paper', or 'Scissors' to play")
+        self.log("Type 'quit' to exit\n")
         
         round_num = 0
         
         while self.running:
             try:
                 round_num += 1
-                print(f"\n--- Round {round_num} ---")
+                self.log(f"\n--- Round {round_num} ---")
                 
                 # Wait for server move first
-                print("⏳ Waiting for opponent to make a move...")
+                self.log("⏳ Waiting for opponent to make a move...")
                 server_msg = self.receive_message()
                 
                 if server_msg is None:
@@ -89,81 +137,184 @@ class WiFiClient:
                     break
                 
                 if server_msg.get("type") == "disconnect":
-                    print("👋 Server disconnected")
+                    self.log("👋 Server disconnected")
                     break
                 
                 if server_msg.get("type") == "move":
-                    print("✅ Opponent has made their move")
+                    self.log("✅ Opponent has made their move")
                     
                     # Get client move
-                    client_move = None
-                    while client_move not in ["Rock", "Paper", "Scissors"]:
-                        move_input = input("Your move (Rock/Paper/Scissors): ").strip()
-                        
-                        if move_input.lower() == 'quit':
-                            disconnect_msg = create_message("disconnect")
-                            self.send_message(disconnect_msg)
-                            self.running = False
-                            break
-                        
-                        # Capitalize first letter
-                        move_input = move_input.capitalize()
-                        if move_input in ["Rock", "Paper", "Scissors"]:
-                            client_move = move_input
-                        else:
-                            print("❌ Invalid move! Please choose Rock, Paper, or Scissors")
-                    
-                    if not self.running:
+                    self.round_timer.start()
+                    client_move = self.next_move()
+                    if client_move is None:
                         break
                     
                     # Send move to server
-                    move_msg = create_message("move", player="client", 
-                                             move=client_move, round=round_num)
-                    self.send_message(move_msg)
-                    print(f"✅ Sent your move: {client_move}")
+                    self.send_message("move", player="client", 
+                                     move=client_move, round=round_num)
+                    self.log(f"✅ Sent your move: {client_move}")
+                    self.round_timer.moved()
                     
                     # Wait for result
-                    print("⏳ Waiting for result...")
+                    self.log("⏳ Waiting for result...")
                     result_msg = self.receive_message()
                     
                     if result_msg and result_msg.get("type") == "result":
-                        winner = result_msg.get("winner")
-                        server_move = result_msg.get("server_move")
-                        client_move_result = result_msg.get("client_move")
-                        self.server_score = result_msg.get("server_score", 0)
-                        self.client_score = result_msg.get("client_score", 0)
-                        
-                        # Determine outcome
-                        if winner == "client":
-                            outcome = "You Win!"
-                        elif winner == "server":
-                            outcome = "You Lose!"
-                        else:
-                            outcome = "It's a Tie!"
-                        
-                        # Display result
-                        print("\n" + "=" * 40)
-                        print(f"🎯 {outcome}")
-                        print(f"   You: {client_move_result}")
-                        print(f"   Opponent: {server_move}")
-                        print(f"\n📊 Score: {self.client_score} - {self.server_score}")
-                        print("=" * 40)
+                        self.round_timer.finished()
+                        self.show_result(result_msg)
                     
             except KeyboardInterrupt:
-                print("\n\n👋 Disconnecting...")
-                disconnect_msg = create_message("disconnect")
-                self.send_message(disconnect_msg)
+                self.log("\n\n👋 Disconnecting...")
+                self.send_message("disconnect")
                 break
             except Exception as e:
                 print(f"❌ Error in game loop: {e}")
                 break
     
+    def next_move(self):
+        """
+        Get the local player's move from the move provider
+        
+        Returns:
+            Canonical move name, or None if the player left
+        """
+        move = self.move_provider.next_move()
+        if move is None:
+            self.send_message("disconnect")
+            self.running = False
+        return move
+    
+    def show_result(self, result_msg):
+        """
+        Update the scores from a result message and display it
+        
+        Args:
+            result_msg: Result message from the server
+        """
+        winner = result_msg.get("winner")
+        server_move = result_msg.get("server_move")
+        client_move = result_msg.get("client_move")
+        self.server_score = result_msg.get("server_score", 0)
+        self.client_score = result_msg.get("client_score", 0)
+        self.move_provider.observe(client_move, server_move)
+        
+        # Determine outcome
+        if winner == "client":
+            outcome = "You Win!"
+        elif winner == "server":
+            outcome = "You Lose!"
+        else:
+            outcome = "It's a Tie!"
+        
+        # Display result
+        self.log("\n" + "=" * 40)
+        self.log(f"🎯 Round {result_msg.get('round')}: {outcome}")
+        self.log(f"   You: {client_move}")
+        self.log(f"   Opponent: {server_move}")
+        self.log(f"\n📊 Score: {self.client_score} - {self.server_score}")
+        self.log("=" * 40)
+    
+    def concurrent_loop(self):
+        """
+        Game loop for concurrent mode
+        
+        Moves can be typed at any time. Each one is sent as soon as the
+        server has committed to its move for that round, and a receiver
+        thread checks every reveal against the commitment.
+        """
+        self.log("\n🎮 Game started in concurrent mode! Type 'Rock', 'Paper', or 'Scissors' to play")
+        self.log("Type 'quit' to exit\n")
+        
+        receiver = threading.Thread(target=self.receive_results, daemon=True)
+        receiver.start()
+        
+        round_num = 0
+        
+        try:
+            while self.running:
+                self.round_timer.start(round_num + 1)
+                client_move = self.move_provider.next_move()
+                if client_move is None:
+                    # Collect the results still on their way before leaving
+                    self.round_book.wait_for_reveals(round_num, timeout=DRAIN_TIMEOUT)
+                    if self.running:
+                        self.send_message("disconnect")
+                    break
+                if not self.running:
+                    break
+                
+                round_num += 1
+                if not self.round_book.has_commit(round_num):
+                    self.log("⏳ Waiting for opponent to commit...")
+                if not self.round_book.wait_for_commit(round_num):
+                    break
+                
+                self.send_message("move", player="client", move=client_move, round=round_num)
+                self.round_timer.moved(round_num)
+                self.log(f"✅ Round {round_num}: sent {client_move}")
+        except (KeyboardInterrupt, EOFError):
+            self.log("\n\n👋 Disconnecting...")
+            self.send_message("disconnect")
+        
+        self.running = False
+        self.round_book.close()
+        receiver.join(timeout=1)
+    
+    def receive_results(self):
+        """Receiver thread for concurrent mode: store commitments, show results"""
+        while self.running:
+            server_msg = self.receive_message()
+            
+            if server_msg is None:
+                if self.running:
+                    print("\n❌ Connection lost! Press Enter to exit")
+                break
+            
+            msg_type = server_msg.get("type")
+            
+            if msg_type == "disconnect":
+                self.log("\n👋 Server disconnected. Press Enter to exit")
+                break
+            
+            if msg_type == "commit":
+                self.round_book.record_commit(server_msg.get("round"), server_msg.get("digest"))
+            
+            elif msg_type == "result":
+                if not self.round_book.verify_reveal(server_msg.get("round"),
+                                                     server_msg.get("server_move"),
+                                                     server_msg.get("nonce")):
+                    print("\n⚠️ Opponent's move does not match its commitment!")
+                self.round_timer.finished(server_msg.get("round"))
+                self.show_result(server_msg)
+        
+        self.running = False
+        self.round_book.close()
+    
     def disconnect(self):
         """Disconnect from the server"""
         self.running = False
+        if self.monitor:
+            self.monitor.remove(self.stream)
         if self.socket:
             self.socket.close()
-        print("\n👋 Disconnected from server")
+        self.log("\n👋 Disconnected from server")
+
+
+def discover_server():
+    """
+    Look for a joinable game on the local network
+    
+    Returns:
+        (host, port) of the first compatible game with a free slot, or (None, None)
+    """
+    from discovery import find_games
+    
+    print("🔎 Looking for games on the local network...")
+    for game in find_games():
+        if game["compatible"] and game["slots"]:
+            print(f"🎮 Found {game['name']} at {game['address']}:{game['port']}")
+            return game["address"], game["port"]
+    return None, None
 
 
 def main():
@@ -171,12 +322,43 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Rock-Paper-Scissors Wi-Fi Client')
-    parser.add_argument('host', help='Server IP address')
+    parser.add_argument('host', nargs='?',
+                        help='Server IP address (default: first game found on the LAN)')
     parser.add_argument('--port', type=int, default=50007, help='Server port')
+    parser.add_argument('--bot', metavar='STRATEGY',
+                        help='Let a computer strategy play instead of the keyboard')
+    parser.add_argument('--moves-file', help='Play the moves listed in this file, one per line')
+    parser.add_argument('--rounds', type=int, help='Rounds to play with --bot or --moves-file')
+    parser.add_argument('--quiet', action='store_true', help='No per-round output')
+    parser.add_argument('--heartbeat', type=float, default=HEARTBEAT_INTERVAL, metavar='SECONDS',
+                        help='Seconds between keepalive pings, 0 to disable')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Print latency and traffic metrics when the game ends')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve metrics at http://127.0.0.1:PORT/metrics during the game')
     args = parser.parse_args()
     
-    client = WiFiClient(args.host, args.port)
+    # Before the game objects are created, which look the instruments up once
+    if args.metrics:
+        metrics.enable()
+    if args.metrics_port is not None:
+        metrics.start_endpoint(args.metrics_port)
+    
+    host, port = args.host, args.port
+    if host is None:
+        host, port = discover_server()
+        if host is None:
+            print("❌ No games found on the local network, pass the server IP instead")
+            sys.exit(1)
+    
+    provider = create_move_provider(args.bot, args.moves_file, args.rounds)
+    client = WiFiClient(host, port, move_provider=provider, verbose=not args.quiet,
+                        heartbeat=args.heartbeat)
     client.connect()
+    
+    if args.metrics:
+        print("\n📈 Metrics")
+        print(metrics.instruments().registry.format_summary())
 
 
 if __name__ == "__main__":
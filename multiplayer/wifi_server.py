@@ -1,6 +1,11 @@
 """
 Wi-Fi Server for Rock-Paper-Scissors Multiplayer
 Hosts a game and waits for a client to connect
+
+Two modes are supported:
+  - lockstep (default): the server sends its move, then the client answers
+  - concurrent: the server commits to its move (see commit_reveal.py), the
+    client plays whenever it likes and the server reveals in the result
 """
 
 import socket
@@ -12,26 +17,65 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from commit_reveal import DEFAULT_MAX_IN_FLIGHT, DRAIN_TIMEOUT, RoundBook
+from discovery import BeaconBroadcaster
+from framing import MessageStream
 from game_logic import GameLogic
-from utils import get_local_ip, create_message, parse_message
+from heartbeat import HEARTBEAT_INTERVAL, shared_monitor
+import metrics
+from moves import parse_move
+from move_providers import ConsoleMoveProvider, create_move_provider
+from replay import ReplayWriter
+from stats import RoundStats
+from utils import get_local_ip
 
 
 class WiFiServer:
     """Wi-Fi server for multiplayer Rock-Paper-Scissors"""
     
-    def __init__(self, host='0.0.0.0', port=50007):
+    def __init__(self, host='0.0.0.0', port=50007, concurrent=False,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, move_provider=None, verbose=True,
+                 advertise=False, record=None, heartbeat=HEARTBEAT_INTERVAL):
         self.host = host
         self.port = port
         self.server_socket = None
         self.client_socket = None
         self.client_address = None
+        self.stream = None
         self.game_logic = GameLogic()
+        self.stats = RoundStats()
+        self.game_logic.add_listener(self.stats)
         self.running = False
         
+        # Set once the server listens for the client, or has given up trying
+        self.started = threading.Event()
+        
         self.server_move = None
         self.client_move = None
         self.current_round = 0
         
+        self.concurrent = concurrent
+        self.round_book = RoundBook(max_in_flight)
+        
+        self.move_provider = move_provider or ConsoleMoveProvider()
+        self.verbose = verbose
+        
+        # Broadcast LAN beacons while waiting for the client
+        self.advertise = advertise
+        self.beacon = None
+        
+        # Replay file every scored round is appended to
+        self.record = record
+        self.recorder = None
+        
+        # Seconds between keepalive pings (None or 0 disables them)
+        self.heartbeat = heartbeat
+        self.monitor = None
+        
+        # Latency histograms (None/no-op unless metrics.enable() ran first)
+        self.metrics = metrics.instruments()
+        self.round_timer = metrics.round_timer()
+    
     def start(self):
         """Start the server and listen for connections"""
         try:
@@ -41,153 +85,331 @@ class WiFiServer:
             self.server_socket.listen(1)
             
             self.running = True
+            self.started.set()
             local_ip = get_local_ip()
             
-            print("=" * 60)
-            print("🎮 Rock-Paper-Scissors Server Started!")
-            print("=" * 60)
-            print(f"Server IP: {local_ip}")
-            print(f"Server Port: {self.port}")
-            print(f"\nShare this information with the client:")
-            print(f"  IP: {local_ip}")
-            print(f"  Port: {self.port}")
-            print("=" * 60)
-            print("Waiting for client to connect...")
+            self.log("=" * 60)
+            self.log("🎮 Rock-Paper-Scissors Server Started!")
+            self.log("=" * 60)
+            self.log(f"Server IP: {local_ip}")
+            self.log(f"Server Port: {self.port}")
+            self.log(f"\nShare this information with the client:")
+            self.log(f"  IP: {local_ip}")
+            self.log(f"  Port: {self.port}")
+            self.log("=" * 60)
+            self.log("Waiting for client to connect...")
             
+            if self.advertise:
+                self.start_advertising()
             self.client_socket, self.client_address = self.server_socket.accept()
-            print(f"\n✅ Client connected from {self.client_address}")
+            self.stop_advertising()
+            self.log(f"\n✅ Client connected from {self.client_address}")
+            self.stream = MessageStream(self.client_socket)
+            if self.heartbeat:
+                self.start_heartbeat()
+            if self.record:
+                self.start_recording()
             
-            # Send handshake
-            handshake = create_message("handshake", player="server", version="1.0")
-            self.send_message(handshake)
+            # Send handshake (advertises the binary codec, JSON stays the fallback)
+            mode = "concurrent" if self.concurrent else "lockstep"
+            self.stream.offer_codecs("server", mode=mode)
             
             # Start game loop
-            self.game_loop()
+            if self.concurrent:
+                self.concurrent_loop()
+            else:
+                self.game_loop()
             
         except Exception as e:
             print(f"❌ Server error: {e}")
         finally:
             self.stop()
     
-    def send_message(self, message):
+    def start_advertising(self):
+        """Broadcast LAN beacons so clients can find the game"""
+        try:
+            mode = "concurrent" if self.concurrent else "lockstep"
+            self.beacon = BeaconBroadcaster(self.server_socket.getsockname()[1], mode=mode)
+        except OSError as e:
+            print(f"⚠️ LAN discovery unavailable: {e}")
+            return
+        self.beacon.start()
+        self.log("📣 Advertising the game on the local network")
+    
+    def start_recording(self):
+        """Write every round of this match to the replay file"""
+        try:
+            self.recorder = ReplayWriter(self.record, "server", f"client {self.client_address[0]}")
+        except OSError as e:
+            print(f"⚠️ Not recording the match: {e}")
+            return
+        self.game_logic.add_listener(self.recorder)
+        self.log(f"🎬 Recording to {self.record}")
+    
+    def start_heartbeat(self):
+        """Ping the client and drop it if it stops answering"""
+        self.monitor = shared_monitor(self.heartbeat)
+        self.monitor.add(self.stream, on_dead=self.on_peer_timeout)
+    
+    def on_peer_timeout(self, stream):
+        """The client went silent: unblock the game loop, which then stops"""
+        print(f"💀 Client stopped responding (no reply for {self.monitor.timeout:.0f}s)")
+        stream.shutdown()
+    
+    def stop_advertising(self):
+        """Stop broadcasting beacons"""
+        beacon, self.beacon = self.beacon, None
+        if beacon:
+            beacon.stop()
+    
+    def log(self, text=""):
+        """Print a status line unless running quietly (bot/scripted play)"""
+        if self.verbose:
+            print(text)
+    
+    def send_message(self, msg_type, **kwargs):
         """Send a message to the client"""
         try:
-            self.client_socket.sendall((message + "\n").encode())
+            self.stream.send_message(msg_type, **kwargs)
         except Exception as e:
             print(f"❌ Error sending message: {e}")
     
     def receive_message(self):
         """Receive a message from the client"""
         try:
-            data = self.client_socket.recv(1024).decode().strip()
-            return parse_message(data)
+            msg = self.stream.receive()
+            
+            # The client confirms its codec with a handshake of its own and
+            # may ask for the match statistics at any time
+            while msg is not None and msg.get("type") in ("handshake", "stats"):
+                if msg["type"] == "handshake":
+                    self.stream.accept_codec(msg)
+                else:
+                    self.send_message("stats", stats=self.stats.snapshot())
+                msg = self.stream.receive()
+            
+            return msg
         except Exception as e:
             print(f"❌ Error receiving message: {e}")
             return None
     
+    def receive_move(self):
+        """
+        Receive the client's next message, skipping moves that are not valid
+        
+        Returns:
+            The message (a move message's "move" is the canonical name), or
+            None if the connection was lost
+        """
+        while (msg := self.receive_message()) is not None:
+            if msg.get("type") != "move":
+                return msg
+            move = parse_move(str(msg.get("move")))
+            if move is not None:
+                msg["move"] = move
+                return msg
+            print(f"⚠️ Ignoring invalid move from client: {msg.get('move')!r}")
+        return None
+    
     def game_loop(self):
         """Main game loop"""
-        print("\n🎮 Game started! Type 'Rock', 'Paper', or 'Scissors' to play")
-        print("Type 'quit' to exit\n")
+        self.log("\n🎮 Game started! Type 'Rock', 'Paper', or 'Scissors' to play")
+        self.log("Type 'quit' to exit\n")
         
         while self.running:
             try:
                 self.current_round += 1
-                print(f"\n--- Round {self.current_round} ---")
+                self.log(f"\n--- Round {self.current_round} ---")
                 
                 # Get server move
-                self.server_move = None
-                while self.server_move not in ["Rock", "Paper", "Scissors"]:
-                    move_input = input("Your move (Rock/Paper/Scissors): ").strip()
-                    
-                    if move_input.lower() == 'quit':
-                        disconnect_msg = create_message("disconnect")
-                        self.send_message(disconnect_msg)
-                        self.running = False
-                        break
-                    
-                    # Capitalize first letter
-                    move_input = move_input.capitalize()
-                    if move_input in ["Rock", "Paper", "Scissors"]:
-                        self.server_move = move_input
-                    else:
-                        print("❌ Invalid move! Please choose Rock, Paper, or Scissors")
-                
-                if not self.running:
+                self.round_timer.start()
+                self.server_move = self.next_move()
+                if self.server_move is None:
                     break
                 
                 # Send move to client
-                move_msg = create_message("move", player="server", 
-                                         move=self.server_move, round=self.current_round)
-                self.send_message(move_msg)
-                print(f"✅ Sent your move: {self.server_move}")
+                self.send_message("move", player="server", 
+                                 move=self.server_move, round=self.current_round)
+                self.log(f"✅ Sent your move: {self.server_move}")
+                self.round_timer.moved()
                 
                 # Wait for client move
-                print("⏳ Waiting for opponent's move...")
-                client_msg = self.receive_message()
+                self.log("⏳ Waiting for opponent's move...")
+                client_msg = self.receive_move()
                 
                 if client_msg is None:
                     print("❌ Connection lost!")
                     break
                 
                 if client_msg.get("type") == "disconnect":
-                    print("👋 Client disconnected")
+                    self.log("👋 Client disconnected")
                     break
                 
                 if client_msg.get("type") == "move":
                     self.client_move = client_msg.get("move")
-                    print(f"📨 Received opponent's move: {self.client_move}")
+                    self.log(f"📨 Received opponent's move: {self.client_move}")
                     
-                    # Determine winner
-                    result = self.game_logic.decide_winner(self.server_move, self.client_move)
-                    
-                    if result == "player1":
-                        self.game_logic.player_score += 1
-                        outcome = "You Win!"
-                        winner = "server"
-                    elif result == "player2":
-                        self.game_logic.computer_score += 1
-                        outcome = "You Lose!"
-                        winner = "client"
-                    else:
-                        outcome = "It's a Tie!"
-                        winner = "tie"
-                    
-                    # Send result to client
-                    result_msg = create_message("result", 
-                                               winner=winner,
-                                               server_move=self.server_move,
-                                               client_move=self.client_move,
-                                               server_score=self.game_logic.player_score,
-                                               client_score=self.game_logic.computer_score,
-                                               round=self.current_round)
-                    self.send_message(result_msg)
-                    
-                    # Display result
-                    print("\n" + "=" * 40)
-                    print(f"🎯 {outcome}")
-                    print(f"   You: {self.server_move}")
-                    print(f"   Opponent: {self.client_move}")
-                    print(f"\n📊 Score: {self.game_logic.player_score} - {self.game_logic.computer_score}")
-                    print("=" * 40)
+                    self.finish_round(self.current_round, self.server_move, self.client_move)
+                    self.round_timer.finished()
                     
             except KeyboardInterrupt:
-                print("\n\n👋 Server shutting down...")
-                disconnect_msg = create_message("disconnect")
-                self.send_message(disconnect_msg)
+                self.log("\n\n👋 Server shutting down...")
+                self.send_message("disconnect")
                 break
             except Exception as e:
                 print(f"❌ Error in game loop: {e}")
                 break
     
+    def next_move(self):
+        """
+        Get the local player's move from the move provider
+        
+        Returns:
+            Canonical move name, or None if the player left
+        """
+        move = self.move_provider.next_move()
+        if move is None:
+            self.send_message("disconnect")
+            self.running = False
+        return move
+    
+    def finish_round(self, round_num, server_move, client_move, nonce=None):
+        """
+        Score a round, send the result to the client and display it
+        
+        Args:
+            round_num: Round number
+            server_move: Server's move
+            client_move: Client's move
+            nonce: Commitment nonce to reveal (concurrent mode only)
+        """
+        # Scores the round and feeds the history and the replay recorder
+        _, result, _ = self.game_logic.play_round(server_move, client_move)
+        
+        if result == "player1":
+            outcome = "You Win!"
+            winner = "server"
+        elif result == "player2":
+            outcome = "You Lose!"
+            winner = "client"
+        else:
+            outcome = "It's a Tie!"
+            winner = "tie"
+        
+        self.move_provider.observe(server_move, client_move)
+        
+        reveal = {} if nonce is None else {"nonce": nonce}
+        
+        # Send result to client
+        self.send_message("result", 
+                         winner=winner,
+                         server_move=server_move,
+                         client_move=client_move,
+                         server_score=self.game_logic.player_score,
+                         client_score=self.game_logic.computer_score,
+                         round=round_num,
+                         **reveal)
+        
+        # Display result
+        self.log("\n" + "=" * 40)
+        self.log(f"🎯 Round {round_num}: {outcome}")
+        self.log(f"   You: {server_move}")
+        self.log(f"   Opponent: {client_move}")
+        self.log(f"\n📊 Score: {self.game_logic.player_score} - {self.game_logic.computer_score}")
+        self.log("=" * 40)
+    
+    def concurrent_loop(self):
+        """
+        Game loop for concurrent mode
+        
+        The local player's moves are committed as soon as they are typed, up
+        to max_in_flight rounds ahead of the client. A receiver thread
+        resolves each round the moment the client's move for it arrives, so
+        a round costs the client a single round trip.
+        """
+        self.log("\n🎮 Game started in concurrent mode! Type 'Rock', 'Paper', or 'Scissors' to play")
+        self.log("Type 'quit' to exit\n")
+        
+        receiver = threading.Thread(target=self.receive_moves, daemon=True)
+        receiver.start()
+        
+        try:
+            while self.running:
+                # Never run too far ahead of the client
+                if not self.round_book.wait_for_slot():
+                    break
+                
+                self.round_timer.start(self.current_round + 1)
+                move = self.move_provider.next_move()
+                if move is None:
+                    # Let the rounds already committed finish before leaving
+                    self.round_book.wait_until_idle(timeout=DRAIN_TIMEOUT)
+                    if self.running:
+                        self.send_message("disconnect")
+                    break
+                if not self.running:
+                    break
+                
+                self.current_round += 1
+                digest = self.round_book.commit(self.current_round, move)
+                self.send_message("commit", player="server",
+                                 round=self.current_round, digest=digest)
+                self.round_timer.moved(self.current_round)
+                if self.metrics is not None:
+                    self.metrics.in_flight.record(self.round_book.in_flight())
+                self.log(f"🔒 Round {self.current_round}: committed to {move}")
+        except (KeyboardInterrupt, EOFError):
+            self.log("\n\n👋 Server shutting down...")
+            self.send_message("disconnect")
+        
+        self.running = False
+        self.round_book.close()
+        receiver.join(timeout=1)
+    
+    def receive_moves(self):
+        """Receiver thread for concurrent mode: resolve rounds as moves arrive"""
+        while self.running:
+            client_msg = self.receive_message()
+            
+            if client_msg is None:
+                if self.running:
+                    print("\n❌ Connection lost! Press Enter to exit")
+                break
+            
+            if client_msg.get("type") == "disconnect":
+                self.log("\n👋 Client disconnected. Press Enter to exit")
+                break
+            
+            if client_msg.get("type") == "move":
+                round_num = client_msg.get("round")
+                client_move = parse_move(str(client_msg.get("move")))
+                if client_move is None or not self.round_book.submit(round_num, client_move):
+                    print(f"\n⚠️ Ignoring move for uncommitted round {round_num}")
+                    continue
+                
+                for round_num, server_move, client_move, nonce in self.round_book.pop_ready():
+                    self.finish_round(round_num, server_move, client_move, nonce)
+                    self.round_timer.finished(round_num)
+        
+        self.running = False
+        self.round_book.close()
+    
     def stop(self):
         """Stop the server and close connections"""
         self.running = False
+        self.started.set()
+        self.stop_advertising()
+        if self.monitor:
+            self.monitor.remove(self.stream)
+        if self.recorder:
+            self.game_logic.remove_listener(self.recorder)
+            self.recorder.close()
+            self.log(f"🎬 Saved {self.recorder.rounds} rounds to {self.record}")
         if self.client_socket:
             self.client_socket.close()
         if self.server_socket:
             self.server_socket.close()
-        print("\n👋 Server stopped")
+        self.log("\n👋 Server stopped")
 
 
 def main():
@@ -196,10 +418,44 @@ def main():
     
     parser = argparse.ArgumentParser(description='Rock-Paper-Scissors Wi-Fi Server')
     parser.add_argument('--port', type=int, default=50007, help='Port to listen on')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='Commit/reveal mode: both players move at the same time')
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help='Rounds the server may commit ahead of the client (concurrent mode)')
+    parser.add_argument('--bot', metavar='STRATEGY',
+                        help='Let a computer strategy play instead of the keyboard')
+    parser.add_argument('--moves-file', help='Play the moves listed in this file, one per line')
+    parser.add_argument('--rounds', type=int, help='Rounds to play with --bot or --moves-file')
+    parser.add_argument('--quiet', action='store_true', help='No per-round output')
+    parser.add_argument('--no-advertise', action='store_true',
+                        help='Do not broadcast the game for LAN discovery')
+    parser.add_argument('--record', metavar='FILE',
+                        help='Save the match as a replay file (see src/replay.py)')
+    parser.add_argument('--heartbeat', type=float, default=HEARTBEAT_INTERVAL, metavar='SECONDS',
+                        help='Seconds between keepalive pings, 0 to disable')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Print latency and traffic metrics when the game ends')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve metrics at http://127.0.0.1:PORT/metrics during the game')
     args = parser.parse_args()
     
-    server = WiFiServer(port=args.port)
+    # Before the game objects are created, which look the instruments up once
+    if args.metrics:
+        metrics.enable()
+    if args.metrics_port is not None:
+        metrics.start_endpoint(args.metrics_port)
+    
+    provider = create_move_provider(args.bot, args.moves_file, args.rounds)
+    server = WiFiServer(port=args.port, concurrent=args.concurrent,
+                        max_in_flight=args.max_in_flight,
+                        move_provider=provider, verbose=not args.quiet,
+                        advertise=not args.no_advertise, record=args.record,
+                        heartbeat=args.heartbeat)
     server.start()
+    
+    if args.metrics:
+        print("\n📈 Metrics")
+        print(metrics.instruments().registry.format_summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+"""
+Compact binary codec for Rock-Paper-Scissors network messages
+Fixed-size struct frames for the hot message types, JSON stays the fallback
+
+Every binary frame starts with a type byte that has the high bit set, so it
+can never be confused with a JSON message (which always starts with "{").
+"""
+
+import struct
+from typing import Optional
+
+from moves import MOVE_CODES, MOVE_NAMES
+
+# Codec names exchanged in the handshake
+CODEC_JSON = "json"
+CODEC_BINARY = "binary"
+SUPPORTED_CODECS = (CODEC_BINARY, CODEC_JSON)
+
+# Frame type bytes
+MOVE = 0x81
+RESULT = 0x82
+DISCONNECT = 0x83
+PING = 0x84
+PONG = 0x85
+
+# Player / winner names that fit in one byte
+PLAYER_NAMES = ("server", "client", "host", "guest", "player")
+PLAYER_CODES = {name: code for code, name in enumerate(PLAYER_NAMES)}
+WINNER_NAMES = ("tie",) + PLAYER_NAMES
+WINNER_CODES = {name: code for code, name in enumerate(WINNER_NAMES)}
+
+# Move frame flags: which optional fields are present
+_HAS_MOVE = 0x01
+_HAS_ROUND = 0x02
+
+# type, flags, player, move, round
+_MOVE_STRUCT = struct.Struct(">BBBBI")
+# type, winner, server_move, client_move, server_score, client_score, round
+_RESULT_STRUCT = struct.Struct(">BBBBIII")
+# type
+_DISCONNECT_STRUCT = struct.Struct(">B")
+# type, timestamp
+_PING_STRUCT = struct.Struct(">Bd")
+
+# Frame type -> total frame size, used by the stream framer
+FRAME_SIZES = {
+    MOVE: _MOVE_STRUCT.size,
+    RESULT: _RESULT_STRUCT.size,
+    DISCONNECT: _DISCONNECT_STRUCT.size,
+    PING: _PING_STRUCT.size,
+    PONG: _PING_STRUCT.size,
+}
+
+_RESULT_KEYS = frozenset(("type", "winner", "server_move", "client_move",
+                          "server_score", "client_score", "round"))
+_PING_KEYS = frozenset(("type", "ts"))
+
+
+def encode_binary(msg_type: str, fields: dict) -> Optional[bytes]:
+    """
+    Encode a message as a fixed-size binary frame
+    
+    Args:
+        msg_type: Message type
+        fields: Message fields (without "type")
+    
+    Returns:
+        Encoded frame, or None if the message needs the JSON fallback
+    """
+    try:
+        if msg_type == "move":
+            if not set(fields) <= {"player", "move", "round"}:
+                return None
+            flags = 0
+            move = 0
+            round_num = 0
+            if "move" in fields:
+                flags |= _HAS_MOVE
+                move = MOVE_CODES[fields["move"]]
+            if "round" in fields:
+                flags |= _HAS_ROUND
+                round_num = fields["round"]
+            return _MOVE_STRUCT.pack(MOVE, flags, PLAYER_CODES[fields["player"]], move, round_num)
+        
+        if msg_type == "result":
+            if set(fields) | {"type"} != _RESULT_KEYS:
+                return None
+            return _RESULT_STRUCT.pack(RESULT,
+                                       WINNER_CODES[fields["winner"]],
+                                       MOVE_CODES[fields["server_move"]],
+                                       MOVE_CODES[fields["client_move"]],
+                                       fields["server_score"],
+                                       fields["client_score"],
+                                       fields["round"])
+        
+        if msg_type == "disconnect":
+            return _DISCONNECT_STRUCT.pack(DISCONNECT) if not fields else None
+        
+        if msg_type in ("ping", "pong"):
+            if set(fields) | {"type"} != _PING_KEYS:
+                return None
+            return _PING_STRUCT.pack(PING if msg_type == "ping" else PONG, fields["ts"])
+    except (KeyError, TypeError, struct.error):
+        # Unknown names, missing fields or values out of range
+        return None
+    
+    return None
+
+
+def decode_binary(frame: bytes) -> Optional[dict]:
+    """
+    Decode a binary frame back into the same dict JSON would give
+    
+    Args:
+        frame: One complete frame
+    
+    Returns:
+        Parsed message, or None if the frame is invalid
+    """
+    try:
+        frame_type = frame[0]
+        
+        if frame_type == MOVE:
+            _, flags, player, move, round_num = _MOVE_STRUCT.unpack(frame)
+            msg = {"type": "move", "player": PLAYER_NAMES[player]}
+            if flags & _HAS_MOVE:
+                msg["move"] = MOVE_NAMES[move]
+            if flags & _HAS_ROUND:
+                msg["round"] = round_num
+            return msg
+        
+        if frame_type == RESULT:
+            _, winner, server_move, client_move, server_score, client_score, round_num = \
+                _RESULT_STRUCT.unpack(frame)
+            return {
+                "type": "result",
+                "winner": WINNER_NAMES[winner],
+                "server_move": MOVE_NAMES[server_move],
+                "client_move": MOVE_NAMES[client_move],
+                "server_score": server_score,
+                "client_score": client_score,
+                "round": round_num,
+            }
+        
+        if frame_type == DISCONNECT:
+            return {"type": "disconnect"}
+        
+        if frame_type in (PING, PONG):
+            _, timestamp = _PING_STRUCT.unpack(frame)
+            return {"type": "ping" if frame_type == PING else "pong", "ts": timestamp}
+    except (IndexError, struct.error):
+        return None
+    
+    return None
+
+
+def choose_codec(offered) -> str:
+    """
+    Pick the best codec both sides support
+    
+    Args:
+        offered: Codec names from the peer's handshake (may be None)
+    
+    Returns:
+        Codec name (JSON if nothing better is offered)
+    """
+    for codec in SUPPORTED_CODECS:
+        if offered and codec in offered:
+            return codec
+    return CODEC_JSON
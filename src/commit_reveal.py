@@ -0,0 +1,250 @@
+"""
+Commit/reveal bookkeeping for concurrent Rock-Paper-Scissors rounds
+Lets the server lock in its move before the client plays, so neither side
+has to wait for the other to go first and several rounds can be in flight
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Random bytes mixed into every commitment so moves cannot be brute-forced
+NONCE_BYTES = 16
+
+# Rounds the server may commit to before the client catches up
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Seconds a leaving player waits for rounds that are still in flight
+DRAIN_TIMEOUT = 5.0
+
+
+def make_commitment(move: str, round_num: int, nonce: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Commit to a move without revealing it
+    
+    Args:
+        move: Move name (Rock/Paper/Scissors)
+        round_num: Round the move belongs to
+        nonce: Hex nonce to use (a fresh one is generated if None)
+    
+    Returns:
+        Tuple of (digest, nonce), both hex strings
+    """
+    if nonce is None:
+        nonce = secrets.token_hex(NONCE_BYTES)
+    digest = hashlib.sha256(f"{round_num}:{move}:{nonce}".encode()).hexdigest()
+    return digest, nonce
+
+
+def verify_commitment(digest: str, move: str, round_num: int, nonce: str) -> bool:
+    """
+    Check that a revealed move matches an earlier commitment
+    
+    Args:
+        digest: Digest received in the commit message
+        move: Revealed move
+        round_num: Round number
+        nonce: Revealed nonce
+    
+    Returns:
+        True if the reveal matches the commitment
+    """
+    if not isinstance(digest, str) or not isinstance(nonce, str):
+        return False
+    expected, _ = make_commitment(move, round_num, nonce)
+    return hmac.compare_digest(expected, digest)
+
+
+class RoundBook:
+    """
+    Rounds that have been committed but not resolved yet, keyed by round
+    
+    The server side calls commit() for its own moves and submit() for the
+    client's moves, then collects finished rounds in order with pop_ready().
+    The client side records the server's commitments with record_commit()
+    and checks the reveal in each result with verify_reveal().
+    
+    All methods are thread-safe so the input loop and the network receiver
+    can share one book. Once the connection ends, close() releases every
+    waiting thread.
+    """
+    
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self._changed = threading.Condition()
+        self.closed = False
+        
+        # Server side: round -> [own move, nonce, peer move or None]
+        self._pending: Dict[int, list] = {}
+        self._next_to_resolve = 1
+        
+        # Client side: round -> peer digest
+        self._commitments: Dict[int, str] = {}
+        self._revealed = 0
+    
+    def close(self):
+        """Wake every waiting thread, waits return False from now on"""
+        with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+    
+    def _wait(self, ready, timeout):
+        """Wait for ready() under the lock, False on timeout or close"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.closed or ready(), timeout)
+            return not self.closed and ready()
+    
+    # ---- server side ----
+    
+    def commit(self, round_num: int, move: str) -> str:
+        """
+        Record our move for a round and return the digest to send
+        
+        Args:
+            round_num: Round number
+            move: Our move
+        
+        Returns:
+            Hex digest for the commit message
+        """
+        digest, nonce = make_commitment(move, round_num)
+        with self._changed:
+            self._pending[round_num] = [move, nonce, None]
+            self._changed.notify_all()
+        return digest
+    
+    def submit(self, round_num, move: str) -> bool:
+        """
+        Record the peer's move for a committed round
+        
+        Args:
+            round_num: Round number from the peer's move message
+            move: The peer's move
+        
+        Returns:
+            False if the round was never committed or already has a move
+        """
+        with self._changed:
+            entry = self._pending.get(round_num)
+            if entry is None or entry[2] is not None:
+                return False
+            entry[2] = move
+            self._changed.notify_all()
+            return True
+    
+    def pop_ready(self) -> List[Tuple[int, str, str, str]]:
+        """
+        Remove the rounds that have both moves, oldest first
+        
+        Rounds are handed out strictly in order so scores are applied in the
+        same sequence on both sides, even if the peer answers out of order.
+        
+        Returns:
+            List of (round, own move, peer move, nonce)
+        """
+        ready = []
+        with self._changed:
+            while True:
+                entry = self._pending.get(self._next_to_resolve)
+                if entry is None or entry[2] is None:
+                    break
+                del self._pending[self._next_to_resolve]
+                ready.append((self._next_to_resolve, entry[0], entry[2], entry[1]))
+                self._next_to_resolve += 1
+            if ready:
+                self._changed.notify_all()
+        return ready
+    
+    def in_flight(self) -> int:
+        """Number of committed rounds that are not resolved yet"""
+        with self._changed:
+            return len(self._pending)
+    
+    def wait_for_slot(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until another round may be committed
+        
+        Args:
+            timeout: Seconds to wait (None waits forever)
+        
+        Returns:
+            True if a slot is free
+        """
+        return self._wait(lambda: len(self._pending) < self.max_in_flight, timeout)
+    
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every committed round has been resolved
+        
+        Args:
+            timeout: Seconds to wait (None waits forever)
+        
+        Returns:
+            True if nothing is in flight any more
+        """
+        return self._wait(lambda: not self._pending, timeout)
+    
+    # ---- client side ----
+    
+    def record_commit(self, round_num, digest: str):
+        """
+        Store the peer's commitment for a round
+        
+        Args:
+            round_num: Round number
+            digest: Digest from the commit message
+        """
+        with self._changed:
+            self._commitments[round_num] = digest
+            self._changed.notify_all()
+    
+    def has_commit(self, round_num: int) -> bool:
+        """True if the peer has committed to this round"""
+        with self._changed:
+            return round_num in self._commitments
+    
+    def wait_for_commit(self, round_num: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the peer has committed to a round
+        
+        Args:
+            round_num: Round number
+            timeout: Seconds to wait (None waits forever)
+        
+        Returns:
+            True if the commitment has arrived
+        """
+        return self._wait(lambda: round_num in self._commitments, timeout)
+    
+    def wait_for_reveals(self, count: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until results for the first `count` rounds have been checked
+        
+        Args:
+            count: Number of rounds played so far
+            timeout: Seconds to wait (None waits forever)
+        
+        Returns:
+            True if every result has arrived
+        """
+        return self._wait(lambda: self._revealed >= count, timeout)
+    
+    def verify_reveal(self, round_num, move: str, nonce: str) -> bool:
+        """
+        Check a revealed move against the stored commitment and forget it
+        
+        Args:
+            round_num: Round number
+            move: Revealed move
+            nonce: Revealed nonce
+        
+        Returns:
+            True if the peer played the move it committed to
+        """
+        with self._changed:
+            digest = self._commitments.pop(round_num, None)
+            self._revealed += 1
+            self._changed.notify_all()
+        return digest is not None and verify_commitment(digest, move, round_num, nonce)
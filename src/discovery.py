@@ -0,0 +1,316 @@
+"""
+LAN game discovery for Rock-Paper-Scissors
+Hosts broadcast a small UDP beacon every second; guests listen on a single
+non-blocking socket and keep a deduplicated, self-expiring list of games
+"""
+
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils import truncate_utf8
+
+# UDP port beacons are sent to (the game itself defaults to 50007)
+DISCOVERY_PORT = 50008
+
+# Seconds between beacons
+BEACON_INTERVAL = 1.0
+
+# A game disappears from the list after this many seconds without a beacon
+BEACON_TTL = 3.5
+
+# Bumped whenever the game protocol changes incompatibly
+PROTOCOL_VERSION = 1
+
+BEACON_MAGIC = b"RPS"
+
+# Flag bit set on the last beacon a host sends before it stops advertising
+FLAG_CLOSING = 0x01
+
+# Flag bit set by hosts playing the concurrent (round/commit) protocol
+FLAG_CONCURRENT = 0x02
+
+# Game modes a host can advertise (see multiplayer/wifi_server.py)
+MODES = ("lockstep", "concurrent")
+
+# magic, protocol version, flags, IPv4 address, game port, free slots, name length
+_HEADER = struct.Struct(">3sBB4sHBB")
+
+MAX_NAME_BYTES = 32
+
+# Largest datagram accepted by the listener
+MAX_BEACON_SIZE = _HEADER.size + MAX_NAME_BYTES
+
+
+def encode_beacon(address: str, port: int, slots: int, name: str = "",
+                  closing: bool = False, mode: str = "lockstep") -> bytes:
+    """
+    Pack a beacon datagram
+    
+    Args:
+        address: IPv4 address guests should connect to ("0.0.0.0" means
+            "use the address the beacon came from")
+        port: TCP port of the game
+        slots: Number of players that can still join
+        name: Short display name, truncated to 32 bytes
+        closing: Mark this as the host's final beacon
+        mode: Game mode the host plays, "lockstep" or "concurrent"
+    
+    Returns:
+        Datagram of at most MAX_BEACON_SIZE bytes
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown game mode: {mode!r}")
+    name_bytes = truncate_utf8(name, MAX_NAME_BYTES)
+    flags = FLAG_CLOSING if closing else 0
+    if mode == "concurrent":
+        flags |= FLAG_CONCURRENT
+    return _HEADER.pack(BEACON_MAGIC, PROTOCOL_VERSION, flags, socket.inet_aton(address),
+                        port, max(0, min(slots, 255)), len(name_bytes)) + name_bytes
+
+
+def decode_beacon(data: bytes, source: str, modes: Tuple[str, ...] = MODES) -> Optional[Dict]:
+    """
+    Unpack a beacon datagram
+    
+    Args:
+        data: Datagram payload
+        source: IP address the datagram was received from
+        modes: Game modes this guest can play; other games are not compatible
+    
+    Returns:
+        Game dictionary, or None if the datagram is not a valid beacon
+    """
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, flags, packed_ip, port, slots, name_length = _HEADER.unpack_from(data)
+    name = data[_HEADER.size:_HEADER.size + name_length]
+    if magic != BEACON_MAGIC or len(name) != name_length or port == 0:
+        return None
+    
+    address = socket.inet_ntoa(packed_ip)
+    if address == "0.0.0.0":
+        address = source
+    mode = "concurrent" if flags & FLAG_CONCURRENT else "lockstep"
+    return {
+        "address": address,
+        "port": port,
+        "slots": slots,
+        "version": version,
+        "mode": mode,
+        "compatible": version == PROTOCOL_VERSION and mode in modes,
+        "name": name.decode("utf-8", "replace") or address,
+        "closing": bool(flags & FLAG_CLOSING),
+    }
+
+
+class BeaconBroadcaster:
+    """Periodically advertises a hosted game on the local network"""
+    
+    def __init__(self, port: int, slots: int = 1, name: str = "", address: str = "0.0.0.0",
+                 interval: float = BEACON_INTERVAL,
+                 target: Tuple[str, int] = ("<broadcast>", DISCOVERY_PORT),
+                 mode: str = "lockstep"):
+        """
+        Args:
+            port: TCP port the game listens on
+            slots: Free player slots to advertise
+            name: Display name shown to guests
+            address: Address to advertise (default: the beacon's source address)
+            interval: Seconds between beacons
+            target: Where beacons are sent (a unicast address works for tests)
+            mode: Game mode to advertise, "lockstep" or "concurrent"
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown game mode: {mode!r}")
+        self.port = port
+        self.slots = slots
+        self.name = name or socket.gethostname()
+        self.address = address
+        self.interval = interval
+        self.target = target
+        self.mode = mode
+        self.sent = 0
+        
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start broadcasting in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="rps-beacon")
+            self._thread.start()
+    
+    def set_slots(self, slots: int):
+        """Change the advertised free slots and announce it right away"""
+        self.slots = slots
+        self.send()
+    
+    def send(self, closing: bool = False) -> bool:
+        """
+        Send one beacon now
+        
+        Returns:
+            True if the datagram was sent
+        """
+        beacon = encode_beacon(self.address, self.port, self.slots, self.name, closing,
+                               self.mode)
+        try:
+            self._socket.sendto(beacon, self.target)
+        except OSError:
+            # No broadcast route (e.g. offline); the next beacon tries again
+            return False
+        self.sent += 1
+        return True
+    
+    def stop(self):
+        """Stop broadcasting and tell listeners the game is gone"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+        self.send(closing=True)
+        self._socket.close()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.send()
+            self._stop.wait(self.interval)
+
+
+class BeaconListener:
+    """
+    Collects beacons on one non-blocking UDP socket
+    
+    Nothing here blocks or starts threads: call poll() periodically (for
+    example from a Tk after() callback) to drain pending datagrams and
+    expire silent hosts. Games are keyed by (address, port), so repeated
+    beacons only refresh an existing entry.
+    """
+    
+    def __init__(self, port: int = DISCOVERY_PORT, host: str = "", ttl: float = BEACON_TTL,
+                 modes: Tuple[str, ...] = MODES):
+        """
+        Args:
+            port: UDP port to listen on (0 picks a free port)
+            host: Interface address to bind ("" listens on all of them)
+            ttl: Seconds a game stays listed without a new beacon
+            modes: Game modes this guest can play; other games are listed as
+                not compatible
+        """
+        self.ttl = ttl
+        self.modes = modes
+        self.games: Dict[Tuple[str, int], Dict] = {}
+        
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            # Lets several guests on one machine listen at the same time
+            try:
+                self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        self._socket.bind((host, port))
+        self._socket.setblocking(False)
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the listener is bound to"""
+        return self._socket.getsockname()
+    
+    def fileno(self) -> int:
+        """Socket descriptor, for use with select/selectors"""
+        return self._socket.fileno()
+    
+    def poll(self, now: Optional[float] = None) -> List[Tuple[str, Dict]]:
+        """
+        Read every pending beacon and drop expired games
+        
+        Args:
+            now: Current time.monotonic() value (for tests)
+        
+        Returns:
+            Changes since the last poll as ("added" | "updated" | "removed", game)
+            tuples; beacons that change nothing produce no entry
+        """
+        if now is None:
+            now = time.monotonic()
+        changes = {}
+        
+        while True:
+            try:
+                data, (source, _) = self._socket.recvfrom(MAX_BEACON_SIZE)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # Closed socket or ICMP error from an earlier send
+                break
+            
+            game = decode_beacon(data, source, self.modes)
+            if game is None:
+                continue
+            key = (game["address"], game["port"])
+            known = self.games.get(key)
+            
+            if game.pop("closing"):
+                if known:
+                    del self.games[key]
+                    changes[key] = ("removed", known)
+                continue
+            
+            game["last_seen"] = now
+            self.games[key] = game
+            if known is None or changes.get(key, ("",))[0] == "added":
+                changes[key] = ("added", game)
+            elif self._visible(known) != self._visible(game):
+                changes[key] = ("updated", game)
+        
+        for key, game in list(self.games.items()):
+            if now - game["last_seen"] > self.ttl:
+                del self.games[key]
+                changes[key] = ("removed", game)
+        
+        # A game added and updated in one poll is still just "added"
+        return list(changes.values())
+    
+    def list_games(self) -> List[Dict]:
+        """Current games, compatible ones with free slots first"""
+        return sorted(self.games.values(),
+                      key=lambda g: (not g["compatible"], g["slots"] == 0, g["name"].lower()))
+    
+    def close(self):
+        """Close the socket"""
+        self._socket.close()
+    
+    @staticmethod
+    def _visible(game: Dict) -> tuple:
+        return (game["name"], game["slots"], game["version"], game["mode"])
+
+
+def find_games(timeout: float = BEACON_INTERVAL * 2, port: int = DISCOVERY_PORT) -> List[Dict]:
+    """
+    Listen for beacons for a while and return the games heard
+    
+    Args:
+        timeout: Seconds to listen (beacons arrive about once a second)
+        port: Discovery UDP port
+    
+    Returns:
+        Games as from BeaconListener.list_games()
+    """
+    import select
+    
+    listener = BeaconListener(port)
+    try:
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            select.select([listener], [], [], remaining)
+            listener.poll()
+        return listener.list_games()
+    finally:
+        listener.close()
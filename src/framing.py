@@ -0,0 +1,381 @@
+"""
+Stream framing for Rock-Paper-Scissors network messages
+Splits a TCP/RFCOMM byte stream into whole messages: newline-delimited JSON
+or fixed-size binary frames (see binary_codec.py)
+"""
+
+import socket
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from binary_codec import (CODEC_BINARY, CODEC_JSON, FRAME_SIZES, SUPPORTED_CODECS,
+                          choose_codec, decode_binary, encode_binary)
+from heartbeat import Heartbeat
+import metrics
+from utils import create_message, parse_message
+
+# Size of the reusable receive buffer
+RECV_SIZE = 4096
+
+# Largest message we are willing to buffer before giving up on the peer
+MAX_MESSAGE_SIZE = 64 * 1024
+
+
+class FrameTooLarge(Exception):
+    """Raised when a peer sends a message longer than MAX_MESSAGE_SIZE"""
+
+
+class UnknownFrame(Exception):
+    """Raised when a binary frame has an unknown type byte"""
+
+
+class MessageFramer:
+    """
+    Accumulates raw bytes and yields complete messages
+    
+    Bytes are appended to a single bytearray. A leading byte with the high
+    bit set marks a fixed-size binary frame, anything else is JSON up to the
+    next newline. Each newline is only searched for once, so a message split
+    over many reads is never rescanned, and consumed bytes are dropped in one
+    step per feed.
+    """
+    
+    def __init__(self, max_message_size: int = MAX_MESSAGE_SIZE):
+        self.max_message_size = max_message_size
+        self._buffer = bytearray()
+        self._scan_from = 0
+    
+    def feed(self, data) -> List[bytes]:
+        """
+        Add received bytes and collect the messages they complete
+        
+        Args:
+            data: Received bytes (bytes, bytearray or memoryview)
+        
+        Returns:
+            Complete messages without their trailing newline (may be empty)
+        """
+        buffer = self._buffer
+        buffer += data
+        
+        frames = []
+        start = 0
+        size = len(buffer)
+        
+        # Copy each message out exactly once through a view of the buffer
+        with memoryview(buffer) as view:
+            while start < size:
+                frame_type = buffer[start]
+                
+                if frame_type & 0x80:
+                    frame_size = FRAME_SIZES.get(frame_type)
+                    if frame_size is None:
+                        raise UnknownFrame(f"Unknown binary frame type 0x{frame_type:02x}")
+                    if start + frame_size > size:
+                        self._scan_from = 0
+                        break
+                    frames.append(bytes(view[start:start + frame_size]))
+                    start += frame_size
+                    continue
+                
+                newline = buffer.find(b"\n", max(start, self._scan_from))
+                if newline == -1:
+                    # Partial JSON message, remember how far we have looked
+                    self._scan_from = size
+                    break
+                if newline > start:
+                    frames.append(bytes(view[start:newline]))
+                start = newline + 1
+                self._scan_from = 0
+            else:
+                self._scan_from = 0
+        
+        if start:
+            del buffer[:start]
+            self._scan_from = max(self._scan_from - start, 0)
+        
+        if len(buffer) > self.max_message_size:
+            raise FrameTooLarge(f"Message exceeds {self.max_message_size} bytes")
+        
+        return frames
+    
+    def pending(self) -> int:
+        """Number of buffered bytes that do not form a complete message yet"""
+        return len(self._buffer)
+    
+    def clear(self):
+        """Drop any partially received message"""
+        self._buffer.clear()
+        self._scan_from = 0
+
+
+class MessageStream:
+    """
+    Message-level wrapper around a connected socket
+    
+    Works with TCP sockets and PyBluez RFCOMM sockets. Several messages that
+    arrive in one segment are queued and handed out one at a time, so peers
+    can pipeline messages without waiting for each reply.
+    
+    Incoming frames are decoded whatever their codec; self.codec only picks
+    how outgoing messages are encoded and starts as JSON until negotiated.
+    Sending is safe from several threads, receiving is meant for one.
+    
+    Pings are answered and pongs recorded in self.heartbeat as they are
+    read, so receive() and read_messages() never return either.
+    """
+    
+    def __init__(self, sock):
+        self.sock = sock
+        self.framer = MessageFramer()
+        self.closed = False
+        self.codec = CODEC_JSON
+        self._send_lock = threading.Lock()
+        
+        # Our ping interval, announced in the handshake (None: we do not ping)
+        self.heartbeat_interval = None
+        self.heartbeat = Heartbeat()
+        
+        # None unless metrics were enabled before the connection was made
+        self.metrics = metrics.instruments()
+        
+        self._pending = deque()
+        self._recv_buffer = bytearray(RECV_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._recv_into = getattr(sock, "recv_into", None)
+        
+        # Small messages go out at once instead of waiting for the peer's
+        # delayed ACK (Nagle), which otherwise adds ~40 ms to every round
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (OSError, AttributeError):
+            # Not a TCP socket (socketpair, RFCOMM)
+            pass
+    
+    def send(self, message: str):
+        """
+        Send one message
+        
+        Args:
+            message: Message created with utils.create_message
+        """
+        self._send_bytes((message + "\n").encode())
+    
+    def send_message(self, msg_type: str, **kwargs):
+        """
+        Encode and send one message with the negotiated codec
+        
+        Args:
+            msg_type: Type of message
+            **kwargs: Message fields
+        """
+        instruments = self.metrics
+        if instruments is None:
+            self._send_bytes(self._encode(msg_type, kwargs))
+            return
+        start = time.perf_counter_ns()
+        data = self._encode(msg_type, kwargs)
+        instruments.encode.record_since(start)
+        self._send_bytes(data)
+    
+    def _encode(self, msg_type: str, fields: dict) -> bytes:
+        """One frame in the negotiated codec (JSON for types it cannot carry)"""
+        if self.codec == CODEC_BINARY:
+            frame = encode_binary(msg_type, fields)
+            if frame is not None:
+                return frame
+        return (create_message(msg_type, **fields) + "\n").encode()
+    
+    def _send_bytes(self, data: bytes):
+        with self._send_lock:
+            self.sock.sendall(data)
+        if self.metrics is not None:
+            self.metrics.bytes_out.add(len(data))
+    
+    def offer_codecs(self, player: str, version: str = "1.0", **extra):
+        """
+        Send the opening handshake advertising the codecs we can speak
+        
+        Args:
+            player: Our role name
+            version: Protocol version
+            **extra: Additional handshake fields (e.g. the game mode)
+        """
+        if self.heartbeat_interval:
+            extra.setdefault("heartbeat", self.heartbeat_interval)
+        self.send(create_message("handshake", player=player, version=version,
+                                 codecs=list(SUPPORTED_CODECS), **extra))
+    
+    def answer_handshake(self, handshake: dict, player: str) -> str:
+        """
+        Pick a codec from the peer's handshake and confirm it
+        
+        Peers that did not advertise any codecs only speak JSON and are not
+        sent anything extra.
+        
+        Args:
+            handshake: Handshake message received from the peer
+            player: Our role name
+        
+        Returns:
+            The codec now used for outgoing messages
+        """
+        self._note_peer_heartbeat(handshake)
+        offered = handshake.get("codecs")
+        if offered:
+            codec = choose_codec(offered)
+            extra = {"heartbeat": self.heartbeat_interval} if self.heartbeat_interval else {}
+            self.send(create_message("handshake", player=player,
+                                     version=handshake.get("version", "1.0"), codec=codec, **extra))
+            self.codec = codec
+        return self.codec
+    
+    def accept_codec(self, handshake: dict):
+        """
+        Switch outgoing messages to the codec the peer confirmed
+        
+        Args:
+            handshake: Handshake message with a "codec" field
+        """
+        self._note_peer_heartbeat(handshake)
+        codec = handshake.get("codec")
+        if codec in SUPPORTED_CODECS:
+            self.codec = codec
+    
+    def _note_peer_heartbeat(self, handshake: dict):
+        """Remember the ping interval the peer announced, if any"""
+        interval = handshake.get("heartbeat")
+        if isinstance(interval, (int, float)) and interval > 0:
+            self.heartbeat.peer_interval = float(interval)
+    
+    def send_ping(self, now: Optional[float] = None):
+        """
+        Send a ping carrying our clock, echoed back in the pong
+        
+        Raises:
+            OSError: If the connection is broken
+        """
+        if now is None:
+            now = time.monotonic()
+        self.heartbeat.last_ping = now
+        self.heartbeat.pings_sent += 1
+        self.send_message("ping", ts=now)
+    
+    def _read(self) -> bool:
+        """Read once from the socket into the framer, False on EOF"""
+        if self._recv_into is not None:
+            count = self._recv_into(self._recv_view)
+            if not count:
+                return False
+            frames = self.framer.feed(self._recv_view[:count])
+        else:
+            data = self.sock.recv(RECV_SIZE)
+            if not data:
+                return False
+            count = len(data)
+            frames = self.framer.feed(data)
+        
+        self.heartbeat.data_received()
+        self._pending.extend(frames)
+        if self.metrics is not None:
+            self.metrics.bytes_in.add(count)
+            self.metrics.receive_backlog.record(len(self._pending))
+        return True
+    
+    def receive(self) -> Optional[dict]:
+        """
+        Block until the next complete message arrives
+        
+        Frames that are not valid messages are skipped.
+        
+        Returns:
+            Parsed message, or None once the connection is closed
+        """
+        try:
+            while not self.closed:
+                while self._pending:
+                    msg = self._decode(self._pending.popleft())
+                    if msg is not None:
+                        return msg
+                
+                # Silence only counts against the peer while we wait for it
+                self.heartbeat.listen()
+                if not self._read():
+                    self.closed = True
+        finally:
+            self.heartbeat.stop_listening()
+        
+        return None
+    
+    def read_messages(self) -> Optional[List[dict]]:
+        """
+        Read once and return every message that is now complete
+        
+        For event loops: only call this when the socket is readable, then
+        it never blocks.
+        
+        Returns:
+            Parsed messages (may be empty), or None once the connection is closed
+        """
+        if not self.closed and not self._read():
+            self.closed = True
+        
+        messages = [msg for msg in map(self._decode, self._pending) if msg is not None]
+        self._pending.clear()
+        if not messages and self.closed:
+            return None
+        return messages
+    
+    def _decode(self, frame: bytes) -> Optional[dict]:
+        """Parse one frame of either codec, None if it is not a valid message"""
+        if self.metrics is not None:
+            start = time.perf_counter_ns()
+        if frame[0] & 0x80:
+            msg = decode_binary(frame)
+        else:
+            msg = parse_message(frame.decode(errors="replace"))
+        if self.metrics is not None:
+            self.metrics.decode.record_since(start)
+        
+        if msg is not None and msg.get("type") in ("ping", "pong"):
+            self._handle_heartbeat(msg)
+            return None
+        return msg
+    
+    def _handle_heartbeat(self, msg: dict):
+        """Answer a ping or record a pong"""
+        self.heartbeat.beat()
+        if msg["type"] == "pong":
+            sample = self.heartbeat.pong_received(msg.get("ts"))
+            if sample is not None and self.metrics is not None:
+                self.metrics.rtt.record(int(sample * 1e9))
+            return
+        timestamp = msg.get("ts")
+        if not isinstance(timestamp, (int, float)):
+            return
+        try:
+            self.send_message("pong", ts=timestamp)
+        except OSError:
+            # Connection is going away; the reader will see EOF
+            pass
+    
+    def has_pending(self) -> bool:
+        """True if complete messages are already buffered"""
+        return bool(self._pending)
+    
+    def shutdown(self):
+        """Shut the socket down so a thread blocked in receive() sees EOF"""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except (OSError, AttributeError):
+            pass
+    
+    def close(self):
+        """Close the underlying socket"""
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
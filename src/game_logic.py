@@ -3,17 +3,53 @@ Game logic for Rock-Paper-Scissors
 Handles game rules, winner determination, and scoring
 """
 
-import random
-from typing import Literal, Tuple
+import operator
+from array import array
+from typing import List, Literal, Optional, Sequence, Tuple
+
+from history import (INVALID_ROUND, OPPONENT_SHIFT, PLAYER_SHIFT, RESCORE_TABLE, RESULT_SHIFT,
+                     RESULT_TABLE, RoundHistory, pack_rounds)
+from moves import (MOVE_CODES, MOVE_NAMES, OUTCOMES, RESULT_CODES, RESULT_NAMES,
+                   WINNERS, ResultCode)
+from rng import MoveSource
+from strategies import RandomStrategy, Strategy
 
 Move = Literal["Rock", "Paper", "Scissors"]
 Result = Literal["player1", "player2", "tie"]
 
 
+class RoundListener:
+    """
+    Receives every round a GameLogic plays (e.g. to persist or log them)
+    
+    Subclasses override on_round; on_rounds gets whole batches from
+    play_rounds and by default unpacks them into on_round calls.
+    """
+    
+    def on_round(self, player_code: int, opponent_code: int, result_code: int):
+        """Called after each single round"""
+        pass
+    
+    def on_rounds(self, packed: bytes):
+        """
+        Called after a batch of rounds
+        
+        Args:
+            packed: One byte per round, packed like history.pack_round
+        """
+        for value in packed:
+            self.on_round((value >> PLAYER_SHIFT) & 3, (value >> OPPONENT_SHIFT) & 3,
+                          (value >> RESULT_SHIFT) & 3)
+    
+    def on_reset(self):
+        """Called when the scores are reset"""
+        pass
+
+
 class GameLogic:
     """Core game logic for Rock-Paper-Scissors"""
     
-    MOVES = ["Rock", "Paper", "Scissors"]
+    MOVES = list(MOVE_NAMES)
     
     # Define what each move beats
     WINS = {
@@ -22,15 +58,50 @@ class GameLogic:
         "Paper": "Rock"
     }
     
-    def __init__(self):
+    # Integer move encoding used by the batch engine (index into MOVES)
+    MOVE_CODES = MOVE_CODES
+    
+    # Outcome codes produced by the batch engine: (player - opponent) % 3
+    RESULTS = RESULT_NAMES
+    RESULT_CODES = RESULT_CODES
+    
+    # (player - opponent) % 3 for a difference in -2..2, using negative indexing
+    _MOD3 = (0, 1, 2, 1, 2)
+    
+    def __init__(self, history_limit: Optional[int] = None, strategy: Optional[Strategy] = None,
+                 seed: Optional[int] = None, rng: Optional[MoveSource] = None):
+        """
+        Args:
+            history_limit: Optional cap on stored rounds (oldest rounds are evicted)
+            strategy: Computer opponent strategy (defaults to RandomStrategy)
+            seed: Seed for a reproducible game (ignored if rng is given)
+            rng: Move source of this game; also handed to the strategy when
+                rng or seed is given
+        """
+        self.rng = rng if rng is not None else MoveSource(seed)
+        if strategy is None:
+            strategy = RandomStrategy(self.rng)
+        elif rng is not None or seed is not None:
+            strategy.use_rng(self.rng)
+        self.strategy = strategy
         self.player_score = 0
         self.computer_score = 0
         self.rounds_played = 0
-        self.history = []
+        self.history = RoundHistory(max_rounds=history_limit)
+        self.listeners: List[RoundListener] = []
+    
+    def add_listener(self, listener: RoundListener):
+        """Register a listener for every round played from now on"""
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener: RoundListener):
+        """Unregister a listener (no error if it is not registered)"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
     
     def get_computer_move(self) -> Move:
-        """Generate a random move for the computer"""
-        return random.choice(self.MOVES)
+        """Generate a move for the computer using the current strategy"""
+        return MOVE_NAMES[self.strategy.choose()]
     
     def decide_winner(self, player_move: Move, opponent_move: Move) -> Result:
         """
@@ -43,13 +114,7 @@ class GameLogic:
         Returns:
             "player1" if player wins, "player2" if opponent wins, "tie" if draw
         """
-        if player_move == opponent_move:
-            return "tie"
-        
-        if self.WINS[player_move] == opponent_move:
-            return "player1"
-        
-        return "player2"
+        return WINNERS[(player_move, opponent_move)]
     
     def play_round(self, player_move: Move, computer_move: Move = None) -> Tuple[Move, Result, str]:
         """
@@ -65,13 +130,16 @@ class GameLogic:
         if computer_move is None:
             computer_move = self.get_computer_move()
         
-        result = self.decide_winner(player_move, computer_move)
+        player_code = MOVE_CODES[player_move]
+        computer_code = MOVE_CODES[computer_move]
+        result_code = OUTCOMES[player_code][computer_code]
+        result = RESULT_NAMES[result_code]
         
         # Update scores
-        if result == "player1":
+        if result_code == ResultCode.PLAYER1:
             self.player_score += 1
             message = f"You Win! {player_move} beats {computer_move}"
-        elif result == "player2":
+        elif result_code == ResultCode.PLAYER2:
             self.computer_score += 1
             message = f"You Lose! {computer_move} beats {player_move}"
         else:
@@ -80,21 +148,130 @@ class GameLogic:
         self.rounds_played += 1
         
         # Store in history
-        self.history.append({
-            "round": self.rounds_played,
-            "player_move": player_move,
-            "computer_move": computer_move,
-            "result": result
-        })
+        self.history.append(player_code, computer_code, result_code)
+        
+        # Let the strategy learn from the player's move
+        self.strategy.observe(player_code, computer_code)
+        
+        for listener in self.listeners:
+            listener.on_round(player_code, computer_code, result_code)
         
         return computer_move, result, message
     
+    def play_rounds(self, player_moves: Sequence[int], opponent_moves: Sequence[int]):
+        """
+        Play many rounds at once from integer-encoded moves
+        
+        Moves are encoded as indexes into MOVES (0=Rock, 1=Paper, 2=Scissors).
+        Outcomes are computed in a single pass as (player - opponent) % 3 and
+        scores are updated in bulk, giving the same totals as calling
+        play_round once per round. Rounds are appended to history in one
+        packed block and no per-round messages are built. The strategy is not
+        consulted since both sides' moves are given.
+        
+        Args:
+            player_moves: Player move codes (array('b'), bytes, list or NumPy array)
+            opponent_moves: Opponent move codes, same length as player_moves
+        
+        Returns:
+            Outcome codes indexing RESULTS (0=tie, 1=player1, 2=player2), as a
+            NumPy int8 array for NumPy input and array('b') otherwise
+        """
+        if len(player_moves) != len(opponent_moves):
+            raise ValueError("player_moves and opponent_moves must have the same length")
+        
+        if hasattr(player_moves, "__array_interface__") or hasattr(opponent_moves, "__array_interface__"):
+            # NumPy is only imported when the caller already handed us NumPy data
+            import numpy as np
+            
+            if len(player_moves) == 0:
+                return np.empty(0, dtype=np.int8)
+            
+            player = np.asarray(player_moves)
+            opponent = np.asarray(opponent_moves)
+            if player.dtype.kind not in "iu" or opponent.dtype.kind not in "iu":
+                raise ValueError("Move codes must be integers")
+            
+            # Check the original values: narrowing first would wrap 256 to 0
+            self._check_codes(int(min(player.min(), opponent.min())),
+                              int(max(player.max(), opponent.max())))
+            player = player.astype(np.int8, copy=False)
+            opponent = opponent.astype(np.int8, copy=False)
+            
+            outcomes = (player - opponent) % 3
+            wins = int(np.count_nonzero(outcomes == 1))
+            losses = int(np.count_nonzero(outcomes == 2))
+        else:
+            if len(player_moves) == 0:
+                return array('b')
+            
+            player = player_moves
+            opponent = opponent_moves
+            self._check_codes(min(min(player), min(opponent)),
+                              max(max(player), max(opponent)))
+            
+            outcomes = array('b', map(self._MOD3.__getitem__,
+                                      map(operator.sub, player, opponent)))
+            wins = outcomes.count(1)
+            losses = outcomes.count(2)
+        
+        # Update scores in bulk
+        self.player_score += wins
+        self.computer_score += losses
+        self.rounds_played += len(outcomes)
+        packed = pack_rounds(player, opponent, outcomes)
+        self.history.extend_packed(packed)
+        for listener in self.listeners:
+            listener.on_rounds(packed)
+        
+        return outcomes
+    
+    def play_packed(self, packed: bytes) -> bytes:
+        """
+        Play rounds stored one packed byte per round (history/replay format)
+        
+        Only the move bits are trusted: results are recomputed with two
+        bytes.translate passes and counted with bytes.count, so scoring
+        never leaves C. Scores, history and listeners are updated exactly
+        like play_rounds.
+        
+        Args:
+            packed: Packed rounds (bytes, bytearray or memoryview)
+        
+        Returns:
+            The rounds repacked with their recomputed results
+        """
+        rounds = bytes(packed).translate(RESCORE_TABLE)
+        if INVALID_ROUND in rounds:
+            raise ValueError("Move codes must be 0 (Rock), 1 (Paper) or 2 (Scissors)")
+        if not rounds:
+            return rounds
+        
+        outcomes = rounds.translate(RESULT_TABLE)
+        self.player_score += outcomes.count(ResultCode.PLAYER1)
+        self.computer_score += outcomes.count(ResultCode.PLAYER2)
+        self.rounds_played += len(rounds)
+        self.history.extend_packed(rounds)
+        for listener in self.listeners:
+            listener.on_rounds(rounds)
+        
+        return rounds
+    
+    @staticmethod
+    def _check_codes(lowest: int, highest: int):
+        """Raise ValueError if move codes fall outside 0..2"""
+        if lowest < 0 or highest > 2:
+            raise ValueError("Move codes must be 0 (Rock), 1 (Paper) or 2 (Scissors)")
+    
     def reset_scores(self):
-        """Reset all scores and history"""
+        """Reset all scores, history and what the strategy has learned"""
         self.player_score = 0
         self.computer_score = 0
         self.rounds_played = 0
-        self.history = []
+        self.history.clear()
+        self.strategy.reset()
+        for listener in self.listeners:
+            listener.on_reset()
     
     def reset_round(self):
         """Reset only the current round (keeps scores)"""
@@ -0,0 +1,240 @@
+"""
+Connection keepalive for Rock-Paper-Scissors
+Peers ping each other every few seconds, measure the round-trip time from
+the pongs and give up on a peer that has gone silent for too long
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Seconds between pings
+HEARTBEAT_INTERVAL = 2.0
+
+# A peer silent for this long (while we are listening) is considered dead
+PEER_TIMEOUT = 8.0
+
+# The timeout is never shorter than this many of the peer's own intervals
+MISSED_BEATS = 3
+
+# Weight of a new sample in the smoothed RTT (as in TCP's SRTT)
+RTT_GAIN = 0.125
+
+# Seconds a new connection may take to connect and exchange handshakes
+HANDSHAKE_TIMEOUT = 10.0
+
+
+class Heartbeat:
+    """
+    Liveness and round-trip state of one connection
+    
+    framing.MessageStream keeps one of these: every read counts as a sign
+    of life, pings are answered and pongs update the RTT. Silence only
+    counts once the peer's first ping or pong showed it is keeping the
+    connection alive, and only while someone is actually reading the
+    stream, so a command-line player thinking over a move is not mistaken
+    for a dead peer.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        # Ping interval the peer announced in its handshake; None if it does not ping
+        self.peer_interval: Optional[float] = None
+        self.last_received = clock()
+        self.last_ping = float("-inf")
+        self.listening_since: Optional[float] = None
+        self.peer_active = False
+        self.pings_sent = 0
+        self.rtt: Optional[float] = None
+        self.rtt_min: Optional[float] = None
+        self.rtt_samples = 0
+    
+    def data_received(self):
+        """Record that bytes arrived from the peer"""
+        self.last_received = self.clock()
+    
+    def beat(self):
+        """Record a ping or pong from the peer"""
+        self.peer_active = True
+    
+    def listen(self):
+        """Start counting silence (someone is waiting for the peer)"""
+        if self.listening_since is None:
+            self.listening_since = self.clock()
+    
+    def stop_listening(self):
+        """Stop counting silence"""
+        self.listening_since = None
+    
+    def silent_for(self, now: Optional[float] = None) -> float:
+        """Seconds the peer has been silent while we were listening"""
+        if self.listening_since is None or not self.peer_active:
+            return 0.0
+        if now is None:
+            now = self.clock()
+        return now - max(self.last_received, self.listening_since)
+    
+    def pong_received(self, timestamp, now: Optional[float] = None):
+        """
+        Fold a pong into the RTT estimate
+        
+        Args:
+            timestamp: Our clock value echoed back by the peer
+            now: Current clock value (for tests)
+        
+        Returns:
+            The RTT sample in seconds, None if the timestamp was not ours
+        """
+        if now is None:
+            now = self.clock()
+        try:
+            sample = now - float(timestamp)
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= sample < 3600:
+            # Not one of our timestamps
+            return None
+        self.rtt = sample if self.rtt is None else self.rtt + RTT_GAIN * (sample - self.rtt)
+        self.rtt_min = sample if self.rtt_min is None else min(self.rtt_min, sample)
+        self.rtt_samples += 1
+        return sample
+
+
+def _shutdown(stream):
+    # Wakes up a thread blocked in recv(), which then sees EOF
+    stream.shutdown()
+
+
+class HeartbeatMonitor:
+    """
+    Pings every registered stream and reports dead peers
+    
+    One monitor serves any number of connections with a single periodic
+    tick(): event loops call it from a timer, blocking programs use
+    start(), which runs one thread for all of them. A dead peer is
+    reported at most timeout + interval seconds after it went silent.
+    """
+    
+    def __init__(self, interval: float = HEARTBEAT_INTERVAL, timeout: float = PEER_TIMEOUT):
+        """
+        Args:
+            interval: Seconds between pings (and between ticks)
+            timeout: Seconds of silence before a peer is declared dead
+        """
+        if interval <= 0 or timeout <= interval:
+            raise ValueError("interval must be positive and timeout longer than interval")
+        self.interval = interval
+        self.timeout = timeout
+        self._streams: Dict[object, Callable] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def add(self, stream, on_dead: Optional[Callable] = None, listening: bool = False):
+        """
+        Start keeping a stream alive
+        
+        Call before the handshake is sent, so it announces our interval.
+        
+        Args:
+            stream: framing.MessageStream
+            on_dead: Called as on_dead(stream) when the peer stops
+                responding (default: shut the socket down, so a blocked
+                receive() returns None)
+            listening: The stream is always being read (event loops);
+                blocking readers are tracked by MessageStream.receive()
+        """
+        stream.heartbeat_interval = self.interval
+        if listening:
+            stream.heartbeat.listen()
+        with self._lock:
+            self._streams[stream] = on_dead or _shutdown
+    
+    def remove(self, stream):
+        """Stop watching a stream"""
+        with self._lock:
+            self._streams.pop(stream, None)
+    
+    def peer_timeout(self, heartbeat: Heartbeat) -> float:
+        """Silence allowed for a peer, allowing for its own ping interval"""
+        return max(self.timeout, MISSED_BEATS * (heartbeat.peer_interval or 0))
+    
+    def tick(self, now: Optional[float] = None) -> List:
+        """
+        Send due pings and drop dead peers
+        
+        Args:
+            now: Current time.monotonic() value (for tests)
+        
+        Returns:
+            Streams declared dead by this tick
+        """
+        with self._lock:
+            streams = list(self._streams.items())
+        
+        dead = []
+        for stream, on_dead in streams:
+            heartbeat = stream.heartbeat
+            if stream.closed:
+                self.remove(stream)
+                continue
+            if heartbeat.peer_interval is None:
+                # Handshake not finished, or a peer without heartbeats
+                continue
+            current = heartbeat.clock() if now is None else now
+            
+            alive = heartbeat.silent_for(current) <= self.peer_timeout(heartbeat)
+            if alive and current - heartbeat.last_ping >= self.interval:
+                try:
+                    stream.send_ping(current)
+                except OSError:
+                    alive = False
+            if not alive:
+                self.remove(stream)
+                dead.append(stream)
+                try:
+                    on_dead(stream)
+                except Exception as e:
+                    print(f"❌ Error closing dead connection: {e}")
+        return dead
+    
+    def __len__(self) -> int:
+        return len(self._streams)
+    
+    def start(self):
+        """Tick from one background thread (for programs without an event loop)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="rps-heartbeat")
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.tick()
+
+
+_shared_monitors: Dict[float, HeartbeatMonitor] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_monitor(interval: float = HEARTBEAT_INTERVAL) -> HeartbeatMonitor:
+    """
+    The process-wide monitor for blocking programs, started on first use
+    
+    Every connection of the command-line server and client pinging at the
+    same interval shares its single thread.
+    
+    Args:
+        interval: Seconds between pings; the timeout is PEER_TIMEOUT or
+            MISSED_BEATS intervals, whichever is longer
+    """
+    with _shared_lock:
+        monitor = _shared_monitors.get(interval)
+        if monitor is None:
+            monitor = HeartbeatMonitor(interval, max(PEER_TIMEOUT, MISSED_BEATS * interval))
+            monitor.start()
+            _shared_monitors[interval] = monitor
+        return monitor
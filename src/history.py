@@ -0,0 +1,249 @@
+"""
+Compact round history for Rock-Paper-Scissors
+Stores every round as a single packed byte instead of a dict per round
+"""
+
+import operator
+from collections.abc import Mapping, Sequence
+from typing import Iterator, Optional
+
+from moves import MOVE_NAMES, RESULT_NAMES
+
+# Packed round layout: bits 0-1 player move, bits 2-3 opponent move, bits 4-5 result
+PLAYER_SHIFT = 0
+OPPONENT_SHIFT = 2
+RESULT_SHIFT = 4
+
+# bytes.translate tables that pull a single column out of packed rounds
+PLAYER_TABLE = bytes((b >> PLAYER_SHIFT) & 3 for b in range(256))
+OPPONENT_TABLE = bytes((b >> OPPONENT_SHIFT) & 3 for b in range(256))
+RESULT_TABLE = bytes((b >> RESULT_SHIFT) & 3 for b in range(256))
+
+# Packed round -> the same moves with the result recomputed from the rules;
+# bytes whose move bits are not 0..2 map to INVALID_ROUND
+INVALID_ROUND = 0xFF
+RESCORE_TABLE = bytes(
+    INVALID_ROUND if (b >> PLAYER_SHIFT) & 3 == 3 or (b >> OPPONENT_SHIFT) & 3 == 3 or b >= 64
+    else (b & 0x0F) | ((((b >> PLAYER_SHIFT) & 3) - ((b >> OPPONENT_SHIFT) & 3)) % 3) << RESULT_SHIFT
+    for b in range(256))
+
+# Per-code shifted values so packing can run through C-level map()
+_OPPONENT_BITS = tuple(code << OPPONENT_SHIFT for code in range(3))
+_RESULT_BITS = tuple(code << RESULT_SHIFT for code in range(3))
+
+
+def pack_round(player_code: int, opponent_code: int, result_code: int) -> int:
+    """
+    Pack one round into a single byte
+    
+    Args:
+        player_code: Player move code (0=Rock, 1=Paper, 2=Scissors)
+        opponent_code: Opponent move code
+        result_code: Result code (0=tie, 1=player1, 2=player2)
+    
+    Returns:
+        Packed round as an int in 0..63
+    """
+    return (player_code << PLAYER_SHIFT) | (opponent_code << OPPONENT_SHIFT) | (result_code << RESULT_SHIFT)
+
+
+def pack_rounds(player_codes, opponent_codes, result_codes) -> bytes:
+    """
+    Pack whole columns of rounds into bytes in a single pass
+    
+    Args:
+        player_codes: Player move codes (any sequence of ints or NumPy array)
+        opponent_codes: Opponent move codes
+        result_codes: Result codes
+    
+    Returns:
+        One packed byte per round
+    """
+    if any(hasattr(column, "__array_interface__")
+           for column in (player_codes, opponent_codes, result_codes)):
+        import numpy as np
+        
+        packed = (np.asarray(player_codes, dtype=np.uint8) << PLAYER_SHIFT) \
+            | (np.asarray(opponent_codes, dtype=np.uint8) << OPPONENT_SHIFT) \
+            | (np.asarray(result_codes, dtype=np.uint8) << RESULT_SHIFT)
+        return packed.tobytes()
+    
+    return bytes(map(operator.or_,
+                     map(operator.or_, player_codes, map(_OPPONENT_BITS.__getitem__, opponent_codes)),
+                     map(_RESULT_BITS.__getitem__, result_codes)))
+
+
+class RoundView(Mapping):
+    """Read-only dict-like view of one packed round"""
+    
+    __slots__ = ("_round", "_packed")
+    
+    KEYS = ("round", "player_move", "computer_move", "result")
+    
+    def __init__(self, round_number: int, packed: int):
+        self._round = round_number
+        self._packed = packed
+    
+    def __getitem__(self, key):
+        if key == "round":
+            return self._round
+        if key == "player_move":
+            return MOVE_NAMES[(self._packed >> PLAYER_SHIFT) & 3]
+        if key == "computer_move":
+            return MOVE_NAMES[(self._packed >> OPPONENT_SHIFT) & 3]
+        if key == "result":
+            return RESULT_NAMES[(self._packed >> RESULT_SHIFT) & 3]
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+    
+    def __len__(self) -> int:
+        return len(self.KEYS)
+    
+    def __repr__(self):
+        return f"RoundView({dict(self)!r})"
+
+
+class RoundHistory(Sequence):
+    """
+    Columnar round history backed by a bytearray (one byte per round)
+    
+    With max_rounds set the history acts as a ring buffer: appends stay O(1)
+    and the oldest rounds are evicted, so memory never exceeds max_rounds bytes.
+    """
+    
+    def __init__(self, max_rounds: Optional[int] = None):
+        if max_rounds is not None and max_rounds <= 0:
+            raise ValueError("max_rounds must be a positive integer")
+        
+        self.max_rounds = max_rounds
+        self._buffer = bytearray()
+        self._start = 0  # Index of the oldest round once the ring is full
+        self._total = 0  # Rounds recorded since the last clear
+    
+    def __len__(self) -> int:
+        return len(self._buffer)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        size = len(self._buffer)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        
+        packed = self._buffer[(self._start + index) % size]
+        return RoundView(self.first_round + index, packed)
+    
+    def __repr__(self):
+        return f"RoundHistory(rounds={len(self)}, max_rounds={self.max_rounds})"
+    
+    @property
+    def first_round(self) -> int:
+        """Round number of the oldest round still stored"""
+        return self._total - len(self._buffer) + 1
+    
+    @property
+    def total_rounds(self) -> int:
+        """Rounds recorded since the last clear, including evicted ones"""
+        return self._total
+    
+    def append(self, player_code: int, opponent_code: int, result_code: int):
+        """
+        Record a single round
+        
+        Args:
+            player_code: Player move code
+            opponent_code: Opponent move code
+            result_code: Result code
+        """
+        packed = pack_round(player_code, opponent_code, result_code)
+        buffer = self._buffer
+        
+        if self.max_rounds is None or len(buffer) < self.max_rounds:
+            buffer.append(packed)
+        else:
+            # Ring is full, overwrite the oldest round
+            buffer[self._start] = packed
+            self._start = (self._start + 1) % self.max_rounds
+        
+        self._total += 1
+    
+    def extend(self, player_codes, opponent_codes, result_codes):
+        """
+        Record many rounds at once
+        
+        Args:
+            player_codes: Player move codes
+            opponent_codes: Opponent move codes
+            result_codes: Result codes
+        """
+        self.extend_packed(pack_rounds(player_codes, opponent_codes, result_codes))
+    
+    def extend_packed(self, data: bytes):
+        """
+        Record rounds that are already packed one byte per round
+        
+        Args:
+            data: Packed rounds in chronological order
+        """
+        count = len(data)
+        self._total += count
+        capacity = self.max_rounds
+        buffer = self._buffer
+        
+        if capacity is None:
+            buffer += data
+            return
+        
+        if count >= capacity:
+            # Only the newest rounds survive
+            buffer[:] = data[count - capacity:]
+            self._start = 0
+            return
+        
+        room = capacity - len(buffer)
+        if room:
+            buffer += data[:room]
+            data = data[room:]
+            if not data:
+                return
+        
+        # Buffer is full, overwrite the oldest rounds (wrapping once at most)
+        count = len(data)
+        start = self._start
+        head = min(count, capacity - start)
+        buffer[start:start + head] = data[:head]
+        if head < count:
+            buffer[:count - head] = data[head:]
+        self._start = (start + count) % capacity
+    
+    def clear(self):
+        """Remove all rounds"""
+        self._buffer = bytearray()
+        self._start = 0
+        self._total = 0
+    
+    def packed(self) -> bytes:
+        """
+        Get all stored rounds in chronological order
+        
+        Returns:
+            One packed byte per round
+        """
+        return bytes(self._buffer[self._start:] + self._buffer[:self._start])
+    
+    def player_moves(self) -> bytes:
+        """Player move codes in chronological order, one byte per round"""
+        return self.packed().translate(PLAYER_TABLE)
+    
+    def computer_moves(self) -> bytes:
+        """Opponent move codes in chronological order, one byte per round"""
+        return self.packed().translate(OPPONENT_TABLE)
+    
+    def results(self) -> bytes:
+        """Result codes in chronological order, one byte per round"""
+        return self.packed().translate(RESULT_TABLE)
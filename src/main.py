@@ -4,17 +4,13 @@ Main entry point for Rock-Paper-Scissors Game
 
 import sys
 import os
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from typing import Callable, Optional
-import threading
-import socket
-import json
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import all modules explicitly for PyInstaller
+# The UI imports its networking modules lazily, inside the multiplayer
+# screens. PyInstaller still finds them because it follows imports inside
+# functions too.
 try:
     from ui import create_app
 except ImportError:
@@ -0,0 +1,126 @@
+"""
+Host-side match engine for two-player Rock-Paper-Scissors
+The host resolves every round exactly once and sends the outcome to the
+guest, so both screens show the same winner and the same score
+"""
+
+import threading
+from typing import Dict, Optional
+
+from game_logic import GameLogic
+from moves import parse_move
+from stats import RoundStats
+
+# Sides of a match
+HOST = "host"
+GUEST = "guest"
+
+# Name of each side in result messages, the same "server"/"client" the
+# command-line servers use (the host plays the server's part)
+RESULT_NAMES = {HOST: "server", GUEST: "client"}
+
+_WINNERS = {"player1": RESULT_NAMES[HOST], "player2": RESULT_NAMES[GUEST], "tie": "tie"}
+
+
+class MatchEngine:
+    """
+    Authoritative round resolution for a hosted match
+    
+    Each side submits one move per round. When both moves are in, the round
+    is scored with GameLogic (host as player 1, guest as player 2) and a
+    result message is produced. The result uses the same fields as the
+    command-line server's result message:
+        
+        winner        "server" (host), "client" (guest) or "tie"
+        server_move   host's move
+        client_move   guest's move
+        server_score  host's score after the round
+        client_score  guest's score after the round
+        round         round number, starting at 1
+    
+    submit() is thread-safe: the host's button handler and the network
+    listener may call it concurrently.
+    
+    stats keeps running statistics of the match (host as player 1), ready
+    to answer a "stats" query without walking the history.
+    """
+    
+    def __init__(self, history_limit: Optional[int] = 1000):
+        self.game_logic = GameLogic(history_limit=history_limit)
+        self.stats = RoundStats()
+        self.game_logic.add_listener(self.stats)
+        self.round = 1
+        self._moves: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, side: str, move: str) -> Optional[dict]:
+        """
+        Record a side's move for the current round
+        
+        Args:
+            side: HOST or GUEST
+            move: Move name, any case
+        
+        Returns:
+            Result message fields if this move completed the round, else None
+        
+        Raises:
+            ValueError: If the side or move is invalid, or the side has
+                already moved this round
+        """
+        if side not in (HOST, GUEST):
+            raise ValueError(f"Unknown side: {side!r}")
+        canonical = parse_move(str(move))
+        if canonical is None:
+            raise ValueError(f"Invalid move: {move!r}")
+        
+        with self._lock:
+            if side in self._moves:
+                raise ValueError(f"{side} has already moved in round {self.round}")
+            self._moves[side] = canonical
+            if len(self._moves) < 2:
+                return None
+            
+            host_move = self._moves[HOST]
+            guest_move = self._moves[GUEST]
+            _, result, _ = self.game_logic.play_round(host_move, guest_move)
+            
+            outcome = {
+                "winner": _WINNERS[result],
+                "server_move": host_move,
+                "client_move": guest_move,
+                "server_score": self.game_logic.player_score,
+                "client_score": self.game_logic.computer_score,
+                "round": self.round,
+            }
+            
+            self._moves.clear()
+            self.round += 1
+            return outcome
+    
+    def prompt(self) -> dict:
+        """
+        Fields of the "move" message that opens the current round
+        
+        This is the command-line server's round prompt without the host's
+        move; command-line guests wait for it before asking for theirs.
+        """
+        with self._lock:
+            return {"player": HOST, "round": self.round}
+    
+    def has_moved(self, side: str) -> bool:
+        """True if the side has already submitted a move this round"""
+        with self._lock:
+            return side in self._moves
+    
+    def snapshot_stats(self) -> dict:
+        """Consistent copy of the match statistics (see stats.RoundStats.snapshot)"""
+        with self._lock:
+            return self.stats.snapshot()
+    
+    def reset(self):
+        """Start the match over"""
+        with self._lock:
+            self.game_logic.reset_scores()
+            self._moves.clear()
+            self.round = 1
@@ -0,0 +1,464 @@
+"""
+Latency and throughput metrics for Rock-Paper-Scissors multiplayer
+Fixed-bucket log-linear (HDR-style) histograms and counters, exported as a
+text snapshot or over a small local HTTP endpoint in Prometheus format
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Linear sub-buckets per power of two is 2 ** (SUB_BUCKET_BITS - 1), so a
+# quantile is off by at most 1 / 16 of its value
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+
+# Largest value kept exactly (~18 minutes in nanoseconds); larger values
+# land in the last bucket but still count towards max and sum
+MAX_VALUE = (1 << 40) - 1
+
+# Durations are recorded in integer nanoseconds and exported in seconds
+NANOSECONDS = 1e-9
+
+# Quantiles shown in snapshots
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+DEFAULT_PORT = 9464
+
+# Setting this (e.g. RPS_METRICS_PORT=9464) turns metrics on at startup
+PORT_ENV = "RPS_METRICS_PORT"
+
+
+def bucket_index(value: int) -> int:
+    """Bucket a non-negative integer falls in"""
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Smallest and largest value of a bucket"""
+    if index < _SUB_BUCKETS:
+        return index, index
+    shift = index // _HALF - 1
+    low = (index - shift * _HALF) << shift
+    return low, low + (1 << shift) - 1
+
+
+BUCKET_COUNT = bucket_index(MAX_VALUE) + 1
+
+
+class Histogram:
+    """
+    Distribution of non-negative integers in fixed log-linear buckets
+    
+    Recording is one bit_length() and one list increment, and the memory
+    used never grows. Updates are not locked: a count may very rarely be
+    lost when two threads record into the same histogram at once.
+    """
+    
+    def __init__(self, name: str, help: str = "", scale: float = 1.0):
+        """
+        Args:
+            name: Metric name, e.g. "rps_rtt_seconds"
+            help: One-line description
+            scale: Factor from recorded units to exported units
+                (NANOSECONDS for durations)
+        """
+        self.name = name
+        self.help = help
+        self.scale = scale
+        self.reset()
+    
+    def reset(self):
+        """Forget every recorded value"""
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+    
+    def record(self, value: int):
+        """Record one value (negative values count as 0)"""
+        if value < 0:
+            value = 0
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value > MAX_VALUE:
+            value = MAX_VALUE
+        if value < _SUB_BUCKETS:
+            self.counts[value] += 1
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS
+            self.counts[(shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)] += 1
+    
+    def record_since(self, start_ns: int):
+        """Record the nanoseconds elapsed since a time.perf_counter_ns() value"""
+        self.record(time.perf_counter_ns() - start_ns)
+    
+    def quantile(self, q: float) -> int:
+        """
+        Value below which a share q of the recorded values fall
+        
+        Returns:
+            Largest value of the bucket holding that rank (capped at the
+            true maximum), 0 if nothing was recorded
+        """
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self._bucket_value(index)
+        return self.max
+    
+    def quantiles(self, qs=QUANTILES) -> List[int]:
+        """Several quantiles in one pass over the buckets"""
+        if not self.count:
+            return [0] * len(qs)
+        ranks = [max(1, int(q * self.count + 0.5)) for q in qs]
+        values = []
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while len(values) < len(ranks) and seen >= ranks[len(values)]:
+                values.append(self._bucket_value(index))
+        values.extend([self.max] * (len(ranks) - len(values)))
+        return values
+    
+    def _bucket_value(self, index: int) -> int:
+        # The last bucket also holds everything above MAX_VALUE
+        high = bucket_bounds(index)[1]
+        return self.max if high >= MAX_VALUE else min(high, self.max)
+    
+    def snapshot(self) -> Dict:
+        """Count, sum, mean, quantiles and max in exported units"""
+        scale = self.scale
+        return {
+            "count": self.count,
+            "sum": self.total * scale,
+            "mean": self.total * scale / self.count if self.count else 0.0,
+            "quantiles": {str(q): value * scale
+                          for q, value in zip(QUANTILES, self.quantiles())},
+            "max": self.max * scale,
+        }
+
+
+class Counter:
+    """A monotonically increasing total"""
+    
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self.value = 0
+    
+    def add(self, amount: int = 1):
+        """Increase the total"""
+        self.value += amount
+    
+    def reset(self):
+        self.value = 0
+    
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Registry:
+    """Named histograms and counters, created on first use"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+    
+    def histogram(self, name: str, help: str = "", scale: float = 1.0) -> Histogram:
+        """Get or create a histogram"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help, scale)
+            return metric
+    
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Get or create a counter"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(name, help)
+            return metric
+    
+    def metrics(self) -> List:
+        with self._lock:
+            return list(self._metrics.values())
+    
+    def reset(self):
+        """Zero every metric"""
+        for metric in self.metrics():
+            metric.reset()
+    
+    def snapshot(self) -> Dict:
+        """Every metric as plain, JSON-friendly data"""
+        return {metric.name: metric.snapshot() for metric in self.metrics()}
+    
+    def format_prometheus(self) -> str:
+        """
+        Every metric in the Prometheus text exposition format
+        
+        Histograms are exported as summaries (quantiles, _sum, _count)
+        plus a _max gauge, which keeps a scrape to a few lines per metric.
+        """
+        lines = []
+        for metric in self.metrics():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {metric.name} counter")
+                lines.append(f"{metric.name} {metric.value}")
+                continue
+            
+            lines.append(f"# TYPE {metric.name} summary")
+            scale = metric.scale
+            for q, value in zip(QUANTILES, metric.quantiles()):
+                lines.append(f'{metric.name}{{quantile="{q}"}} {value * scale:.9g}')
+            lines.append(f"{metric.name}_sum {metric.total * scale:.9g}")
+            lines.append(f"{metric.name}_count {metric.count}")
+            lines.append(f"# TYPE {metric.name}_max gauge")
+            lines.append(f"{metric.name}_max {metric.max * scale:.9g}")
+        return "\n".join(lines) + "\n"
+    
+    def format_summary(self) -> str:
+        """Human-readable table of every metric that saw any data"""
+        lines = [f"{'metric':<36} {'count':>9} {'p50':>10} {'p99':>10} {'max':>10}"]
+        for metric in self.metrics():
+            if isinstance(metric, Counter):
+                if metric.value:
+                    lines.append(f"{metric.name:<36} {metric.value:>9}")
+                continue
+            if not metric.count:
+                continue
+            p50, p99 = metric.quantiles((0.5, 0.99))
+            lines.append(f"{metric.name:<36} {metric.count:>9} "
+                         + " ".join(_format_value(value * metric.scale, metric.scale)
+                                    for value in (p50, p99, metric.max)))
+        return "\n".join(lines)
+
+
+def _format_value(value: float, scale: float) -> str:
+    if scale != NANOSECONDS:
+        return f"{value:>10.0f}"
+    if value < 1e-3:
+        return f"{value * 1e6:>8.1f}µs"
+    if value < 1:
+        return f"{value * 1e3:>8.1f}ms"
+    return f"{value:>9.2f}s"
+
+
+class Instruments:
+    """The multiplayer stack's metrics, looked up once per registry"""
+    
+    def __init__(self, registry: Registry):
+        self.registry = registry
+        histogram, counter = registry.histogram, registry.counter
+        
+        # Per message (framing.MessageStream)
+        self.encode = histogram("rps_message_encode_seconds",
+                                "Time to encode an outgoing message", NANOSECONDS)
+        self.decode = histogram("rps_message_decode_seconds",
+                                "Time to decode an incoming message", NANOSECONDS)
+        self.bytes_out = counter("rps_bytes_sent_total", "Bytes written to game connections")
+        self.bytes_in = counter("rps_bytes_received_total", "Bytes read from game connections")
+        self.receive_backlog = histogram("rps_receive_backlog_frames",
+                                         "Frames waiting to be decoded after each read")
+        self.rtt = histogram("rps_rtt_seconds", "Heartbeat round-trip time", NANOSECONDS)
+        
+        # Per round (RoundTimer)
+        self.move_time = histogram("rps_move_seconds",
+                                   "Time the local player took to choose a move", NANOSECONDS)
+        self.opponent_wait = histogram("rps_opponent_wait_seconds",
+                                       "Time from the local move to the round's result",
+                                       NANOSECONDS)
+        self.round_time = histogram("rps_round_seconds",
+                                    "Time from asking for a move to the round's result",
+                                    NANOSECONDS)
+        self.rounds = counter("rps_rounds_total", "Rounds finished")
+        
+        # Queue depths
+        self.in_flight = histogram("rps_rounds_in_flight",
+                                   "Committed rounds awaiting the opponent (concurrent mode)")
+        self.ui_events = histogram("rps_ui_events_per_wakeup",
+                                   "Network events handed to the UI thread per wakeup")
+
+
+class RoundTimer:
+    """
+    Times the phases of the local player's rounds
+    
+    start() when a move is asked for, moved() once it is sent and
+    finished() when the result is known. Rounds are keyed by number, so
+    overlapping rounds of concurrent mode are timed separately. Every call
+    returns at once while metrics are disabled.
+    """
+    
+    def __init__(self, instruments: Optional[Instruments]):
+        self.instruments = instruments
+        self._rounds: Dict[object, list] = {}
+    
+    def start(self, round_num=None):
+        if self.instruments is not None:
+            self._rounds[round_num] = [time.perf_counter_ns(), None]
+    
+    def moved(self, round_num=None):
+        if self.instruments is None:
+            return
+        times = self._rounds.get(round_num)
+        if times is not None:
+            times[1] = time.perf_counter_ns()
+            self.instruments.move_time.record(times[1] - times[0])
+    
+    def finished(self, round_num=None):
+        if self.instruments is None:
+            return
+        times = self._rounds.pop(round_num, None)
+        if times is None:
+            return
+        now = time.perf_counter_ns()
+        if times[1] is not None:
+            self.instruments.opponent_wait.record(now - times[1])
+        self.instruments.round_time.record(now - times[0])
+        self.instruments.rounds.add()
+
+
+_instruments: Optional[Instruments] = None
+
+
+def instruments() -> Optional[Instruments]:
+    """
+    The active instruments, or None while metrics are disabled
+    
+    Connections and game loops look this up when they are created, so
+    enable() must run before them to be measured.
+    """
+    return _instruments
+
+
+def round_timer() -> RoundTimer:
+    """A RoundTimer on the active instruments (a no-op while disabled)"""
+    return RoundTimer(_instruments)
+
+
+def enable(registry: Optional[Registry] = None) -> Instruments:
+    """
+    Turn metrics on
+    
+    Args:
+        registry: Registry to record into (default: a new one, or the
+            current one if metrics are already on)
+    
+    Returns:
+        The active instruments
+    """
+    global _instruments
+    if registry is None:
+        if _instruments is not None:
+            return _instruments
+        registry = Registry()
+    _instruments = Instruments(registry)
+    return _instruments
+
+
+def disable():
+    """Turn metrics off for everything created from now on"""
+    global _instruments
+    _instruments = None
+
+
+def serve(port: int = DEFAULT_PORT, host: str = "127.0.0.1",
+          registry: Optional[Registry] = None):
+    """
+    Serve the metrics over HTTP from a background thread
+    
+    GET /metrics returns the Prometheus text format, /metrics.json the
+    snapshot as JSON. Binds to localhost unless told otherwise.
+    
+    Args:
+        port: TCP port (0 picks a free one, see server.server_address)
+        host: Interface to bind to
+        registry: Registry to export (default: the active one)
+    
+    Returns:
+        The running http.server instance; call shutdown() to stop it
+    """
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    if registry is None:
+        registry = enable().registry
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body = registry.format_prometheus().encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json":
+                body = json.dumps(registry.snapshot()).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would flood the console
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="rps-metrics").start()
+    return server
+
+
+def start_endpoint(port: int = DEFAULT_PORT):
+    """
+    Turn metrics on and serve them, reporting where (for the programs' --metrics-port)
+    
+    Returns:
+        The HTTP server, or None if the port could not be bound
+    """
+    enable()
+    try:
+        server = serve(port)
+    except OSError as e:
+        print(f"⚠️ Metrics endpoint unavailable: {e}")
+        return None
+    print(f"📈 Metrics at http://127.0.0.1:{server.server_address[1]}/metrics")
+    return server
+
+
+def enable_from_env():
+    """
+    Turn metrics on and serve them if RPS_METRICS_PORT is set
+    
+    Returns:
+        The HTTP server, or None if the variable is unset or invalid
+    """
+    value = os.environ.get(PORT_ENV)
+    if not value:
+        return None
+    try:
+        port = int(value)
+    except ValueError:
+        print(f"⚠️ Ignoring {PORT_ENV}={value!r}: not a port number")
+        return None
+    return start_endpoint(port)
@@ -0,0 +1,154 @@
+"""
+Move providers for network players
+Decouple where a player's moves come from (keyboard, strategy, file, generator)
+from the WiFi server/client protocol loops
+"""
+
+import itertools
+from typing import Iterable, Optional
+
+from moves import MOVE_CODES, MOVE_NAMES, parse_move
+from strategies import Strategy, create_strategy
+
+
+class MoveProvider:
+    """Base class for sources of moves"""
+    
+    def next_move(self) -> Optional[str]:
+        """
+        Produce the move for the next round
+        
+        Returns:
+            Canonical move name, or None to leave the game
+        """
+        raise NotImplementedError
+    
+    def observe(self, own_move: str, opponent_move: str):
+        """
+        Learn the outcome of a finished round
+        
+        Args:
+            own_move: Move this provider played
+            opponent_move: Move the opponent played
+        """
+
+
+class ConsoleMoveProvider(MoveProvider):
+    """Asks the person at the keyboard, 'quit' leaves the game"""
+    
+    def __init__(self, prompt: str = "Your move (Rock/Paper/Scissors): "):
+        self.prompt = prompt
+    
+    def next_move(self) -> Optional[str]:
+        while True:
+            move_input = input(self.prompt).strip()
+            
+            if move_input.lower() == 'quit':
+                return None
+            
+            move = parse_move(move_input)
+            if move is not None:
+                return move
+            print("❌ Invalid move! Please choose Rock, Paper, or Scissors")
+
+
+class StrategyMoveProvider(MoveProvider):
+    """Plays a computer strategy (see strategies.py) for a number of rounds"""
+    
+    def __init__(self, strategy: Strategy, rounds: Optional[int] = None):
+        """
+        Args:
+            strategy: Strategy instance that picks the moves
+            rounds: Rounds to play before leaving (None plays forever)
+        """
+        self.strategy = strategy
+        self.rounds_left = rounds
+    
+    def next_move(self) -> Optional[str]:
+        if self.rounds_left is not None:
+            if self.rounds_left <= 0:
+                return None
+            self.rounds_left -= 1
+        return MOVE_NAMES[self.strategy.choose()]
+    
+    def observe(self, own_move: str, opponent_move: str):
+        own_code = MOVE_CODES.get(own_move)
+        opponent_code = MOVE_CODES.get(opponent_move)
+        if own_code is not None and opponent_code is not None:
+            self.strategy.observe(opponent_code, own_code)
+
+
+class IterableMoveProvider(MoveProvider):
+    """Plays moves from any iterable or generator, leaves when it runs out"""
+    
+    def __init__(self, moves: Iterable, rounds: Optional[int] = None):
+        """
+        Args:
+            moves: Move names (any case) or move codes 0-2
+            rounds: Stop after this many moves even if more are available
+        """
+        self._moves = iter(moves) if rounds is None else itertools.islice(moves, rounds)
+    
+    def next_move(self) -> Optional[str]:
+        for move in self._moves:
+            if isinstance(move, int):
+                return MOVE_NAMES[move]
+            canonical = parse_move(move)
+            if canonical is None:
+                raise ValueError(f"Invalid move in script: {move!r}")
+            return canonical
+        return None
+
+
+class FileMoveProvider(IterableMoveProvider):
+    """
+    Plays moves read from a text file, one per line
+    
+    Blank lines and lines starting with '#' are skipped. The file is read
+    lazily, so very long scripts are never loaded into memory at once.
+    """
+    
+    def __init__(self, path: str, rounds: Optional[int] = None, loop: bool = False):
+        """
+        Args:
+            path: Path to the move file
+            rounds: Stop after this many moves
+            loop: Start again from the top when the file ends
+        """
+        self.path = path
+        super().__init__(self._read(path, loop), rounds)
+    
+    @staticmethod
+    def _read(path: str, loop: bool):
+        while True:
+            found = False
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        found = True
+                        yield line
+            if not loop or not found:
+                return
+
+
+def create_move_provider(strategy: Optional[str] = None, moves_file: Optional[str] = None,
+                         rounds: Optional[int] = None) -> MoveProvider:
+    """
+    Build a move provider from command-line options
+    
+    Args:
+        strategy: Registered strategy name for bot play
+        moves_file: Path to a move file (looped if rounds is given)
+        rounds: Number of rounds for bot or file play
+    
+    Returns:
+        The matching provider, or a ConsoleMoveProvider if neither is set
+    """
+    if strategy and moves_file:
+        raise ValueError("Choose either a strategy or a moves file, not both")
+    if strategy:
+        return StrategyMoveProvider(create_strategy(strategy), rounds)
+    if moves_file:
+        return FileMoveProvider(moves_file, rounds, loop=rounds is not None)
+    return ConsoleMoveProvider()
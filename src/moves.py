@@ -0,0 +1,111 @@
+"""
+Shared move encoding for Rock-Paper-Scissors
+Integer move codes, precomputed outcome tables and fast move validation
+"""
+
+from enum import IntEnum
+from typing import Optional
+
+
+class MoveCode(IntEnum):
+    """Integer encoding of a move (the value indexes MOVE_NAMES)"""
+    
+    ROCK = 0
+    PAPER = 1
+    SCISSORS = 2
+    
+    @property
+    def label(self) -> str:
+        """Display name of the move ("Rock", "Paper" or "Scissors")"""
+        return MOVE_NAMES[self]
+
+
+class ResultCode(IntEnum):
+    """Integer encoding of a round result (the value indexes RESULT_NAMES)"""
+    
+    TIE = 0
+    PLAYER1 = 1
+    PLAYER2 = 2
+
+
+MOVE_NAMES = ("Rock", "Paper", "Scissors")
+RESULT_NAMES = ("tie", "player1", "player2")
+
+# Name -> code lookups
+MOVE_CODES = {name: code for code, name in enumerate(MOVE_NAMES)}
+RESULT_CODES = {name: code for code, name in enumerate(RESULT_NAMES)}
+
+# Valid move names, checked with a single hash lookup
+VALID_MOVES = frozenset(MOVE_NAMES)
+
+# OUTCOMES[player][opponent] -> result code, i.e. (player - opponent) % 3
+OUTCOMES = tuple(
+    tuple((player - opponent) % 3 for opponent in range(3))
+    for player in range(3)
+)
+
+# (player name, opponent name) -> result name, for string-based callers
+WINNERS = {
+    (MOVE_NAMES[player], MOVE_NAMES[opponent]): RESULT_NAMES[OUTCOMES[player][opponent]]
+    for player in range(3)
+    for opponent in range(3)
+}
+
+# COUNTERS[move] -> the move that beats it
+COUNTERS = tuple((move + 1) % 3 for move in range(3))
+
+# Lower-cased user input -> canonical move name
+_INPUT_ALIASES = {name.lower(): name for name in MOVE_NAMES}
+
+
+def encode_move(move: str) -> int:
+    """
+    Convert a move name to its integer code
+    
+    Args:
+        move: "Rock", "Paper" or "Scissors"
+    
+    Returns:
+        Move code (raises KeyError for unknown moves)
+    """
+    return MOVE_CODES[move]
+
+
+def decode_move(code: int) -> str:
+    """
+    Convert an integer move code to its name
+    
+    Args:
+        code: Move code 0-2
+    
+    Returns:
+        Move name
+    """
+    return MOVE_NAMES[code]
+
+
+def resolve(player_code: int, opponent_code: int) -> int:
+    """
+    Resolve a round between two move codes
+    
+    Args:
+        player_code: Player move code
+        opponent_code: Opponent move code
+    
+    Returns:
+        Result code (0=tie, 1=player1, 2=player2)
+    """
+    return OUTCOMES[player_code][opponent_code]
+
+
+def parse_move(text: str) -> Optional[str]:
+    """
+    Normalize typed input to a canonical move name
+    
+    Args:
+        text: Raw user input (case and surrounding whitespace are ignored)
+    
+    Returns:
+        Canonical move name, or None if the input is not a move
+    """
+    return _INPUT_ALIASES.get(text.strip().lower())
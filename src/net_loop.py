@@ -0,0 +1,357 @@
+"""
+Single network event loop for the Rock-Paper-Scissors GUI
+One background thread multiplexes every socket with selectors; results are
+handed to the Tk thread in batches through one coalesced root.after call
+"""
+
+import errno
+import heapq
+import itertools
+import os
+import selectors
+import socket
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Callable, Optional, Tuple
+
+import metrics
+
+# Seconds a connect() may take before on_error is called
+CONNECT_TIMEOUT = 10.0
+
+# connect_ex() results meaning "still connecting" (10035 is WSAEWOULDBLOCK)
+_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}
+
+
+class EventPump:
+    """
+    Hands callbacks to the UI thread in batches
+    
+    post() may be called from any thread. The first post after a drain
+    schedules one wakeup (e.g. root.after(0, ...)); everything posted
+    before that wakeup runs in the same drain, so a burst of network
+    events costs a single Tk callback.
+    """
+    
+    def __init__(self, schedule: Callable[[Callable], object]):
+        """
+        Args:
+            schedule: Runs a callable later on the UI thread
+        """
+        self._schedule = schedule
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self.wakeups = 0
+        self.metrics = metrics.instruments()
+    
+    def post(self, callback: Callable, *args):
+        """Queue callback(*args) for the UI thread"""
+        with self._lock:
+            self._events.append((callback, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+            self.wakeups += 1
+        self._schedule(self.drain)
+    
+    def drain(self):
+        """Run every queued callback (called on the UI thread)"""
+        with self._lock:
+            events, self._events = self._events, deque()
+            self._scheduled = False
+        if self.metrics is not None:
+            self.metrics.ui_events.record(len(events))
+        for callback, args in events:
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
+
+
+class Timer:
+    """Handle for a callback scheduled with NetworkLoop.call_later/call_every"""
+    
+    def __init__(self, deadline: float, interval: Optional[float], callback: Callable, args):
+        self.deadline = deadline
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+    
+    def cancel(self):
+        """Stop the timer (safe from any thread)"""
+        self.cancelled = True
+
+
+class NetworkLoop:
+    """
+    One selector thread shared by every socket the app opens
+    
+    Readers, timers and call_soon() callbacks run on the loop thread and
+    must not block. Callbacks meant for user code (on_accept, on_message,
+    ...) are handed to `post`, which for the GUI is EventPump.post so they
+    run on the Tk thread.
+    """
+    
+    def __init__(self, post: Optional[Callable] = None):
+        """
+        Args:
+            post: post(callback, *args) used to deliver events; by default
+                they run directly on the loop thread
+        """
+        self.post = post or (lambda callback, *args: callback(*args))
+        self.running = False
+        
+        self._selector = selectors.DefaultSelector()
+        self._calls = deque()
+        self._timers = []
+        self._sequence = itertools.count()
+        self._thread = None
+        
+        # Self-pipe so other threads can wake the selector
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, self._drain_wakeups)
+    
+    # ----- lifecycle -----
+    
+    def start(self):
+        """Start the loop thread (once)"""
+        if self._thread is None:
+            self.running = True
+            self._thread = threading.Thread(target=self._run, daemon=True, name="rps-network")
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the loop and close every socket it still watches"""
+        if not self.running:
+            return
+        self.running = False
+        self._wake()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        
+        for key in list(self._selector.get_map().values()):
+            try:
+                key.fileobj.close()
+            except OSError:
+                pass
+        self._selector.close()
+        self._wake_writer.close()
+    
+    # ----- scheduling (thread-safe) -----
+    
+    def call_soon(self, callback: Callable, *args):
+        """Run callback(*args) on the loop thread"""
+        self._calls.append((callback, args))
+        self._wake()
+    
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """Run callback(*args) on the loop thread after delay seconds"""
+        timer = Timer(time.monotonic() + delay, None, callback, args)
+        self.call_soon(self._push_timer, timer)
+        return timer
+    
+    def call_every(self, interval: float, callback: Callable, *args) -> Timer:
+        """Run callback(*args) on the loop thread now and then every interval seconds"""
+        timer = Timer(time.monotonic(), interval, callback, args)
+        self.call_soon(self._push_timer, timer)
+        return timer
+    
+    def add_reader(self, fileobj, callback: Callable):
+        """Run callback() on the loop thread whenever fileobj is readable"""
+        self.call_soon(self._register, fileobj, callback)
+    
+    def remove_reader(self, fileobj):
+        """Stop watching fileobj"""
+        self.call_soon(self._unregister, fileobj)
+    
+    def discard(self, fileobj):
+        """Stop watching fileobj and close it"""
+        self.call_soon(self._discard, fileobj)
+    
+    # ----- sockets -----
+    
+    def listen(self, server_socket, on_accept: Callable):
+        """
+        Accept connections on a bound, listening socket
+        
+        Args:
+            server_socket: Listening socket
+            on_accept: Posted as on_accept(connection, address) per client
+        """
+        def accept():
+            # Empty the whole backlog so bursts of clients are not turned away
+            while True:
+                try:
+                    connection, address = server_socket.accept()
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    # Listening socket closed
+                    return
+                connection.setblocking(True)
+                self.post(on_accept, connection, address)
+        
+        server_socket.setblocking(False)
+        self.add_reader(server_socket, accept)
+    
+    def connect(self, address: Tuple[str, int], on_connected: Callable, on_error: Callable,
+                timeout: float = CONNECT_TIMEOUT):
+        """
+        Open a TCP connection without blocking any thread
+        
+        Args:
+            address: (host, port); host must be an IP address or resolve quickly
+            on_connected: Posted as on_connected(sock) with a blocking socket
+            on_error: Posted as on_error(exception)
+            timeout: Seconds before giving up
+        """
+        self.call_soon(self._start_connect, address, on_connected, on_error, timeout)
+    
+    def watch_stream(self, stream, on_message: Callable, on_closed: Callable):
+        """
+        Deliver every message a framing.MessageStream receives
+        
+        Args:
+            stream: Stream over a connected socket
+            on_message: Posted as on_message(msg) for each message, in order
+            on_closed: Posted once when the peer closes or the socket fails
+        """
+        def readable():
+            try:
+                messages = stream.read_messages()
+            except Exception:
+                messages = None
+            if messages is None:
+                self._unregister(stream.sock)
+                self.post(on_closed)
+                return
+            for msg in messages:
+                self.post(on_message, msg)
+        
+        self.add_reader(stream.sock, readable)
+    
+    # ----- loop thread internals -----
+    
+    def _wake(self):
+        try:
+            self._wake_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            # Already has a pending wakeup, or the loop is shutting down
+            pass
+    
+    def _drain_wakeups(self):
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+    
+    def _push_timer(self, timer: Timer):
+        heapq.heappush(self._timers, (timer.deadline, next(self._sequence), timer))
+    
+    def _register(self, fileobj, callback):
+        try:
+            self._selector.register(fileobj, selectors.EVENT_READ, callback)
+        except KeyError:
+            self._selector.modify(fileobj, selectors.EVENT_READ, callback)
+        except (ValueError, OSError):
+            # Closed before the loop got to it
+            pass
+    
+    def _unregister(self, fileobj):
+        try:
+            self._selector.unregister(fileobj)
+        except (KeyError, ValueError):
+            pass
+    
+    def _discard(self, fileobj):
+        self._unregister(fileobj)
+        try:
+            fileobj.close()
+        except OSError:
+            pass
+    
+    def _start_connect(self, address, on_connected, on_error, timeout):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            error = sock.connect_ex(address)
+        except OSError as e:
+            # Unresolvable host name or bad address
+            error = e.errno or errno.EINVAL
+        if error not in _IN_PROGRESS:
+            sock.close()
+            self.post(on_error, OSError(error, os.strerror(error)))
+            return
+        
+        def finish(exc=None):
+            timer.cancel()
+            self._unregister(sock)
+            if exc is None:
+                error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if error:
+                    exc = OSError(error, os.strerror(error))
+            if exc is not None:
+                sock.close()
+                self.post(on_error, exc)
+                return
+            sock.setblocking(True)
+            self.post(on_connected, sock)
+        
+        timer = Timer(time.monotonic() + timeout, None, finish,
+                      (TimeoutError("Timed out connecting to %s:%d" % address),))
+        self._push_timer(timer)
+        self._selector.register(sock, selectors.EVENT_WRITE, finish)
+    
+    def _run_timers(self) -> Optional[float]:
+        """Run due timers and return seconds until the next one"""
+        now = time.monotonic()
+        while self._timers:
+            deadline, _, timer = self._timers[0]
+            if timer.cancelled:
+                heapq.heappop(self._timers)
+                continue
+            if deadline > now:
+                return deadline - now
+            heapq.heappop(self._timers)
+            self._call(timer.callback, *timer.args)
+            if timer.interval is not None and not timer.cancelled:
+                timer.deadline = max(deadline + timer.interval, now)
+                self._push_timer(timer)
+        return None
+    
+    def _call(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception:
+            traceback.print_exc()
+    
+    def _run(self):
+        while self.running:
+            while self._calls:
+                callback, args = self._calls.popleft()
+                self._call(callback, *args)
+            
+            timeout = self._run_timers()
+            if self._calls:
+                timeout = 0
+            
+            try:
+                events = self._selector.select(timeout)
+            except OSError:
+                # A watched socket was closed elsewhere; drop it and go on
+                self._prune_closed()
+                continue
+            for key, _ in events:
+                self._call(key.data)
+    
+    def _prune_closed(self):
+        for key in list(self._selector.get_map().values()):
+            if key.fileobj.fileno() == -1:
+                self._unregister(key.fileobj)
@@ -0,0 +1,199 @@
+"""
+Local network interface discovery for Rock-Paper-Scissors hosting
+Finds this machine's IPv4 addresses without contacting any outside host,
+caches them with a TTL and refreshes the cache in the background
+"""
+
+import ipaddress
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
+# Seconds before cached addresses are refreshed
+DEFAULT_TTL = 60.0
+
+# Seconds get_local_ip() may wait the very first time, before any cache exists
+DEFAULT_TIMEOUT = 1.0
+
+LOOPBACK = "127.0.0.1"
+
+# Private address used only for a route lookup. connect() on a UDP socket
+# sends nothing, it just asks the OS which interface it would use.
+_ROUTE_PROBE = ("10.255.255.255", 1)
+
+# Linux ioctl that reads an interface's IPv4 address
+_SIOCGIFADDR = 0x8915
+
+
+def _route_addresses() -> List[str]:
+    """Address of the interface holding the default route, if any"""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(_ROUTE_PROBE)
+            return [s.getsockname()[0]]
+    except OSError:
+        return []
+
+
+def _interface_addresses() -> List[str]:
+    """Addresses of every interface via ioctl (Linux only, empty elsewhere)"""
+    try:
+        import fcntl
+        import struct
+        names = [name for _, name in socket.if_nameindex()]
+    except (ImportError, AttributeError, OSError):
+        return []
+    
+    addresses = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        for name in names:
+            request = struct.pack('256s', name[:15].encode())
+            try:
+                reply = fcntl.ioctl(s.fileno(), _SIOCGIFADDR, request)
+            except OSError:
+                # Interface is down or has no IPv4 address
+                continue
+            addresses.append(socket.inet_ntoa(reply[20:24]))
+    return addresses
+
+
+def _hostname_addresses() -> List[str]:
+    """Addresses the local resolver lists for our host name (all interfaces on Windows)"""
+    try:
+        infos = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET)
+    except OSError:
+        return []
+    return [info[4][0] for info in infos]
+
+
+def _rank(address: str) -> int:
+    """Sort key: LAN addresses first, loopback (3) last"""
+    ip = ipaddress.IPv4Address(address)
+    if ip.is_loopback:
+        return 3
+    if ip.is_link_local:
+        return 2
+    if ip.is_private:
+        return 0
+    return 1
+
+
+def enumerate_addresses(include_hostname: bool = True) -> List[str]:
+    """
+    List this machine's IPv4 addresses, best candidate for hosting first
+    
+    Args:
+        include_hostname: Also ask the resolver about our host name (can be
+            slow on misconfigured machines, so callers may do it later)
+    
+    Returns:
+        Unique addresses ordered LAN, other, link-local; loopback only if
+        there is nothing else
+    """
+    found = _route_addresses() + _interface_addresses()
+    if include_hostname:
+        found += _hostname_addresses()
+    
+    unique = [address for address in dict.fromkeys(found) if address != "0.0.0.0"]
+    unique.sort(key=_rank)
+    reachable = [address for address in unique if _rank(address) < 3]
+    return reachable or [LOOPBACK]
+
+
+class InterfaceCache:
+    """
+    Cached view of the local addresses
+    
+    Reads never block on the network: they return the cached list and, if it
+    is older than the TTL, start a refresh in a background thread. Only the
+    very first read may wait (up to a timeout) for the initial scan.
+    """
+    
+    def __init__(self, ttl: float = DEFAULT_TTL,
+                 enumerate_func: Callable[..., List[str]] = enumerate_addresses):
+        self.ttl = ttl
+        self._enumerate = enumerate_func
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._addresses: List[str] = []
+        self._updated = None
+        self._refreshing = False
+    
+    def addresses(self, timeout: float = 0.0) -> List[str]:
+        """
+        Get the cached addresses, refreshing in the background when stale
+        
+        Args:
+            timeout: Seconds to wait if nothing has been discovered yet
+        
+        Returns:
+            Addresses, best first (["127.0.0.1"] until discovery finishes)
+        """
+        if self.is_stale():
+            self.refresh_async()
+        if timeout and not self._ready.is_set():
+            self._ready.wait(timeout)
+        with self._lock:
+            return list(self._addresses) or [LOOPBACK]
+    
+    def primary(self, timeout: float = 0.0) -> str:
+        """Best address to show for hosting"""
+        return self.addresses(timeout)[0]
+    
+    def is_stale(self) -> bool:
+        """True if the cache is empty or older than the TTL"""
+        with self._lock:
+            return self._updated is None or time.monotonic() - self._updated > self.ttl
+    
+    def refresh_async(self) -> bool:
+        """
+        Start a background refresh unless one is already running
+        
+        Returns:
+            True if a new refresh was started
+        """
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self.refresh, daemon=True, name="netinfo-refresh").start()
+        return True
+    
+    def refresh(self) -> List[str]:
+        """
+        Rescan the interfaces now (blocking)
+        
+        The quick sources are published first so readers are not held up
+        by a slow host name lookup.
+        
+        Returns:
+            The new address list
+        """
+        try:
+            self._store(self._enumerate(include_hostname=False))
+            addresses = self._enumerate(include_hostname=True)
+            self._store(addresses)
+            return addresses
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def _store(self, addresses: List[str]):
+        with self._lock:
+            self._addresses = list(addresses)
+            self._updated = time.monotonic()
+        self._ready.set()
+
+
+_default_cache: Optional[InterfaceCache] = None
+_default_lock = threading.Lock()
+
+
+def get_interface_cache() -> InterfaceCache:
+    """Shared cache used by utils.get_local_ip and the hosting screens"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = InterfaceCache()
+        return _default_cache
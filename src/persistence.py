@@ -0,0 +1,373 @@
+"""
+Persistent game storage for Rock-Paper-Scissors
+Rounds are appended to SQLite (WAL mode) in batched, packed blocks, while
+small aggregate tables keep lifetime stats ready to read without a replay
+"""
+
+import os
+import sqlite3
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from game_logic import RoundListener
+from history import OPPONENT_SHIFT, PLAYER_SHIFT, RoundHistory, pack_round
+from moves import MOVE_NAMES, OUTCOMES, ResultCode
+
+# Bumped when the schema changes (stored in PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+# Buffered rounds that trigger a commit
+BATCH_SIZE = 256
+
+# Seconds buffered rounds may wait before the next round or flush_if_due()
+# call commits them anyway
+FLUSH_INTERVAL = 2.0
+
+DB_FILENAME = "rps.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_by_player ON sessions (player, started);
+
+-- Append-only log: each flush adds one block of packed rounds per session
+CREATE TABLE IF NOT EXISTS round_blocks (
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    first_round INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (session_id, first_round)
+) WITHOUT ROWID;
+
+-- Lifetime aggregates: rounds per (player, player move, opponent move)
+CREATE TABLE IF NOT EXISTS move_counts (
+    player TEXT NOT NULL,
+    player_move INTEGER NOT NULL,
+    opponent_move INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (player, player_move, opponent_move)
+) WITHOUT ROWID;
+"""
+
+
+def default_path() -> str:
+    """
+    Location of the game database
+    
+    Uses $RPS_DATA_DIR if set, otherwise ~/.rps
+    """
+    data_dir = os.environ.get("RPS_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".rps")
+    return os.path.join(data_dir, DB_FILENAME)
+
+
+def summarize_counts(counts: Dict) -> Dict:
+    """
+    Turn (player move, opponent move) -> rounds counts into stats
+    
+    Args:
+        counts: Round counts keyed by (player_code, opponent_code)
+    
+    Returns:
+        Dictionary with rounds, wins, losses, ties, win_rate and the move
+        frequencies of both sides
+    """
+    stats = {"rounds": 0, "wins": 0, "losses": 0, "ties": 0,
+             "moves": dict.fromkeys(MOVE_NAMES, 0),
+             "opponent_moves": dict.fromkeys(MOVE_NAMES, 0)}
+    outcome_keys = {ResultCode.TIE: "ties", ResultCode.PLAYER1: "wins", ResultCode.PLAYER2: "losses"}
+    
+    for (player_code, opponent_code), count in counts.items():
+        stats["rounds"] += count
+        stats[outcome_keys[OUTCOMES[player_code][opponent_code]]] += count
+        stats["moves"][MOVE_NAMES[player_code]] += count
+        stats["opponent_moves"][MOVE_NAMES[opponent_code]] += count
+    
+    stats["win_rate"] = stats["wins"] / stats["rounds"] if stats["rounds"] else 0.0
+    return stats
+
+
+class GameStore:
+    """
+    SQLite-backed store of sessions, rounds and lifetime stats
+    
+    Rounds are buffered in memory and committed in one transaction per
+    batch, which also bumps the aggregate tables. Use from one thread (the
+    Tk thread in the GUI).
+    
+    A batch is committed once it holds batch_size rounds, or once its
+    oldest round has waited flush_interval seconds and either another
+    round arrives or flush_if_due() is called. Call flush_if_due() from a
+    periodic timer to bound how long rounds stay uncommitted while idle.
+    """
+    
+    def __init__(self, path: Optional[str] = None, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        """
+        Args:
+            path: Database file (default: default_path()); ":memory:" works for tests
+            batch_size: Buffered rounds that trigger a commit
+            flush_interval: Seconds after which buffered rounds are committed
+                anyway (checked on the next round or flush_if_due() call)
+        """
+        self.path = path or default_path()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.commits = 0
+        
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the file consistent; a crash loses at most the last batch
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        
+        self._pending: Dict[int, bytearray] = {}
+        self._pending_rounds = 0
+        self._next_round: Dict[int, int] = {}
+        self._players: Dict[int, str] = {}
+        self._pending_since: Optional[float] = None
+    
+    def _create_schema(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{self.path} was written by a newer version (schema {version})")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    
+    # ----- writing -----
+    
+    def start_session(self, player: str = "You", opponent: str = "Computer",
+                      mode: str = "single") -> int:
+        """
+        Create a new session
+        
+        Args:
+            player: Whose stats the rounds count towards
+            opponent: Opponent name (strategy, bot or remote player)
+            mode: "single", "wifi", "bluetooth", ...
+        
+        Returns:
+            Session id
+        """
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO sessions (player, opponent, mode, started) VALUES (?, ?, ?, ?)",
+                (player, opponent, mode, time.time()))
+        session_id = cursor.lastrowid
+        self._next_round[session_id] = 0
+        self._players[session_id] = player
+        return session_id
+    
+    def end_session(self, session_id: int):
+        """Commit a session's remaining rounds and mark it finished"""
+        self.flush()
+        with self._db:
+            self._db.execute("UPDATE sessions SET ended = ? WHERE id = ?", (time.time(), session_id))
+        self._next_round.pop(session_id, None)
+        self._players.pop(session_id, None)
+    
+    def record_round(self, session_id: int, player_code: int, opponent_code: int, result_code: int):
+        """Buffer one round"""
+        self._pending.setdefault(session_id, bytearray()).append(
+            pack_round(player_code, opponent_code, result_code))
+        self._pending_rounds += 1
+        self._maybe_flush()
+    
+    def record_rounds(self, session_id: int, packed: bytes):
+        """
+        Buffer rounds that are already packed one byte per round
+        
+        Args:
+            session_id: Session the rounds belong to
+            packed: Packed rounds in order (see history.pack_rounds)
+        """
+        self._pending.setdefault(session_id, bytearray()).extend(packed)
+        self._pending_rounds += len(packed)
+        self._maybe_flush()
+    
+    def _maybe_flush(self):
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        if self._pending_rounds >= self.batch_size or now - self._pending_since >= self.flush_interval:
+            self.flush()
+    
+    def flush_if_due(self, now: Optional[float] = None) -> bool:
+        """
+        Commit buffered rounds that have waited flush_interval
+        
+        Args:
+            now: Current time.monotonic() value (for tests)
+        
+        Returns:
+            True if rounds were committed
+        """
+        if self._pending_since is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if now - self._pending_since < self.flush_interval:
+            return False
+        self.flush()
+        return True
+    
+    def flush(self):
+        """Commit every buffered round in a single transaction"""
+        self._pending_since = None
+        if not self._pending_rounds:
+            return
+        pending, self._pending = self._pending, {}
+        self._pending_rounds = 0
+        
+        with self._db:
+            for session_id, data in pending.items():
+                if not data:
+                    continue
+                first_round = self._next_round.get(session_id)
+                if first_round is None:
+                    # Session opened by an earlier store: continue after its last block
+                    first_round = self._stored_rounds(session_id)
+                self._next_round[session_id] = first_round + len(data)
+                self._db.execute(
+                    "INSERT INTO round_blocks (session_id, first_round, data) VALUES (?, ?, ?)",
+                    (session_id, first_round, bytes(data)))
+                
+                # At most 9 distinct packed values, counted in C
+                counts = Counter()
+                for value, count in Counter(data).items():
+                    counts[((value >> PLAYER_SHIFT) & 3, (value >> OPPONENT_SHIFT) & 3)] += count
+                self._add_counts(session_id, counts)
+        self.commits += 1
+    
+    def _add_counts(self, session_id: int, counts: Counter):
+        player = self._players.get(session_id)
+        if player is None:
+            player = self._db.execute("SELECT player FROM sessions WHERE id = ?",
+                                      (session_id,)).fetchone()[0]
+            self._players[session_id] = player
+        
+        self._db.executemany(
+            "INSERT INTO move_counts (player, player_move, opponent_move, count) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (player, player_move, opponent_move) DO UPDATE SET count = count + excluded.count",
+            [(player, p, o, n) for (p, o), n in counts.items()])
+        
+        summary = summarize_counts(counts)
+        self._db.execute(
+            "UPDATE sessions SET rounds = rounds + ?, wins = wins + ?, losses = losses + ?,"
+            " ties = ties + ? WHERE id = ?",
+            (summary["rounds"], summary["wins"], summary["losses"], summary["ties"], session_id))
+    
+    def _stored_rounds(self, session_id: int) -> int:
+        row = self._db.execute("SELECT rounds FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else 0
+    
+    # ----- reading -----
+    
+    def lifetime_stats(self, player: str = "You") -> Dict:
+        """
+        Lifetime stats of a player, read from the aggregate table
+        
+        Costs one indexed query of at most 9 rows, however many rounds
+        have been played.
+        
+        Returns:
+            Dictionary as from summarize_counts()
+        """
+        self.flush()
+        rows = self._db.execute(
+            "SELECT player_move, opponent_move, count FROM move_counts WHERE player = ?", (player,))
+        return summarize_counts({(p, o): n for p, o, n in rows})
+    
+    def sessions(self, player: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        Most recent sessions, newest first
+        
+        Args:
+            player: Only sessions of this player
+            limit: Maximum number of sessions
+        
+        Returns:
+            Session dictionaries with the sessions table's columns
+        """
+        self.flush()
+        query = "SELECT * FROM sessions"
+        args = ()
+        if player is not None:
+            query += " WHERE player = ?"
+            args = (player,)
+        query += " ORDER BY started DESC, id DESC LIMIT ?"
+        cursor = self._db.execute(query, args + (limit,))
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+    
+    def load_rounds(self, session_id: int) -> bytes:
+        """All packed rounds of a session, in order"""
+        self.flush()
+        rows = self._db.execute(
+            "SELECT data FROM round_blocks WHERE session_id = ? ORDER BY first_round", (session_id,))
+        return b"".join(row[0] for row in rows)
+    
+    def load_history(self, session_id: int, max_rounds: Optional[int] = None) -> RoundHistory:
+        """
+        Rebuild a session's RoundHistory
+        
+        Args:
+            session_id: Session to load
+            max_rounds: Keep only the newest rounds, like GameLogic(history_limit=...)
+        """
+        history = RoundHistory(max_rounds=max_rounds)
+        history.extend_packed(self.load_rounds(session_id))
+        return history
+    
+    def close(self):
+        """Commit buffered rounds and close the database"""
+        self.flush()
+        self._db.close()
+
+
+class SessionRecorder(RoundListener):
+    """
+    Records a GameLogic's rounds into a GameStore
+    
+    Register with game.add_listener(). Resetting the scores ends the
+    session and starts a new one, so lifetime stats keep every round.
+    """
+    
+    def __init__(self, store: GameStore, player: str = "You", opponent: str = "Computer",
+                 mode: str = "single"):
+        self.store = store
+        self.player = player
+        self.opponent = opponent
+        self.mode = mode
+        self.session_id = None
+    
+    def on_round(self, player_code: int, opponent_code: int, result_code: int):
+        if self.session_id is None:
+            self.session_id = self.store.start_session(self.player, self.opponent, self.mode)
+        self.store.record_round(self.session_id, player_code, opponent_code, result_code)
+    
+    def on_rounds(self, packed: bytes):
+        if self.session_id is None:
+            self.session_id = self.store.start_session(self.player, self.opponent, self.mode)
+        self.store.record_rounds(self.session_id, packed)
+    
+    def on_reset(self):
+        self.close()
+    
+    def close(self):
+        """End the current session (a new one starts with the next round)"""
+        if self.session_id is not None:
+            self.store.end_session(self.session_id)
+            self.session_id = None
@@ -0,0 +1,257 @@
+"""
+Match replay files for Rock-Paper-Scissors
+A fixed header followed by one packed byte per round; the reader maps the
+file into memory and rescores it in chunks through GameLogic.play_packed
+"""
+
+import mmap
+import operator
+import os
+import struct
+import time
+from typing import Iterator, Optional
+
+from game_logic import GameLogic, RoundListener
+from history import INVALID_ROUND, RESCORE_TABLE, pack_round
+from utils import truncate_utf8
+
+REPLAY_MAGIC = b"RPSR"
+
+# Bumped whenever the layout changes incompatibly
+REPLAY_VERSION = 1
+
+# Set once the writer closed the file and the round count is final
+FLAG_COMPLETE = 0x01
+
+# magic, version, flags, rounds, created (unix time), player name length, opponent name length
+_HEADER = struct.Struct(">4sBBQdBB")
+
+# Flags and rounds, rewritten in place when the writer closes
+_TRAILER = struct.Struct(">BQ")
+_FLAGS_OFFSET = 5
+
+MAX_NAME_BYTES = 255
+
+# Rounds handed to play_packed at a time when rescoring
+CHUNK_ROUNDS = 1 << 20
+
+
+class ReplayError(Exception):
+    """Raised for files that are not readable replays"""
+    pass
+
+
+class ReplayWriter(RoundListener):
+    """
+    Appends rounds to a replay file
+    
+    Register with game.add_listener() to record everything a GameLogic
+    plays, or call write_round()/write_packed() directly. Writes go through
+    a buffered file, so a round costs a one-byte buffer append.
+    """
+    
+    def __init__(self, path: str, player: str = "player1", opponent: str = "player2"):
+        """
+        Args:
+            path: File to create (replaced if it exists)
+            player: Name of player 1 (the GameLogic "player")
+            opponent: Name of player 2
+        """
+        self.path = path
+        self.rounds = 0
+        player_bytes = truncate_utf8(player, MAX_NAME_BYTES)
+        opponent_bytes = truncate_utf8(opponent, MAX_NAME_BYTES)
+        
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, 0, 0, time.time(),
+                                      len(player_bytes), len(opponent_bytes)))
+        self._file.write(player_bytes + opponent_bytes)
+    
+    def write_round(self, player_code: int, opponent_code: int, result_code: int):
+        """Append one round"""
+        self._file.write(bytes((pack_round(player_code, opponent_code, result_code),)))
+        self.rounds += 1
+    
+    def write_packed(self, packed: bytes):
+        """Append rounds packed one byte per round (see history.pack_rounds)"""
+        self._file.write(packed)
+        self.rounds += len(packed)
+    
+    def on_round(self, player_code: int, opponent_code: int, result_code: int):
+        self.write_round(player_code, opponent_code, result_code)
+    
+    def on_rounds(self, packed: bytes):
+        self.write_packed(packed)
+    
+    def close(self):
+        """Write the final round count and close the file"""
+        if self._file.closed:
+            return
+        self._file.seek(_FLAGS_OFFSET)
+        self._file.write(_TRAILER.pack(FLAG_COMPLETE, self.rounds))
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayReader:
+    """
+    Memory-mapped view of a replay file
+    
+    Rounds are never turned into Python objects: slices are memoryviews of
+    the mapping and each chunk is scored by GameLogic.play_packed with
+    bytes.translate, so millions of rounds replay in constant memory.
+    
+    A replay whose writer never closed (crash, killed server) is still
+    readable; its length comes from the file size instead of the header.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Replay file
+        
+        Raises:
+            ReplayError: If the file is not a replay or is from a newer version
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ReplayError(f"{path} is too short to be a replay")
+            magic, self.version, self.flags, rounds, self.created, player_length, opponent_length = \
+                _HEADER.unpack(header)
+            if magic != REPLAY_MAGIC:
+                raise ReplayError(f"{path} is not a replay file")
+            if self.version > REPLAY_VERSION:
+                raise ReplayError(f"{path} uses replay version {self.version}, "
+                                  f"this build reads up to {REPLAY_VERSION}")
+            names = f.read(player_length + opponent_length)
+            self.player = names[:player_length].decode("utf-8", "replace")
+            self.opponent = names[player_length:].decode("utf-8", "replace")
+            
+            self.data_offset = _HEADER.size + player_length + opponent_length
+            available = os.fstat(f.fileno()).st_size - self.data_offset
+            self.complete = bool(self.flags & FLAG_COMPLETE)
+            self.rounds = min(rounds, available) if self.complete else max(available, 0)
+            
+            # mmap cannot map an empty file
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.rounds else None
+        self._view = memoryview(self._map)[self.data_offset:self.data_offset + self.rounds] \
+            if self._map is not None else memoryview(b"")
+    
+    def __len__(self) -> int:
+        return self.rounds
+    
+    def packed(self, start: int = 0, stop: Optional[int] = None) -> memoryview:
+        """Packed rounds start..stop as a zero-copy view"""
+        return self._view[start:stop]
+    
+    def chunks(self, size: int = CHUNK_ROUNDS) -> Iterator[memoryview]:
+        """Yield the packed rounds in consecutive views of at most size rounds"""
+        for start in range(0, self.rounds, size):
+            yield self._view[start:start + size]
+    
+    def rescore(self, game: Optional[GameLogic] = None, chunk_size: int = CHUNK_ROUNDS) -> GameLogic:
+        """
+        Replay every round through the batch engine
+        
+        Args:
+            game: GameLogic to play into (default: a new one keeping the
+                last 1000 rounds of history)
+            chunk_size: Rounds per play_packed call
+        
+        Returns:
+            The GameLogic, with the replay's scores added
+        """
+        if game is None:
+            game = GameLogic(history_limit=1000)
+        for chunk in self.chunks(chunk_size):
+            game.play_packed(chunk)
+        return game
+    
+    def verify(self, chunk_size: int = CHUNK_ROUNDS) -> int:
+        """
+        Check the stored results against a fresh rescore
+        
+        Unlike rescore(), corrupt rounds do not raise: a round whose move
+        bits are not a valid move counts as bad like a wrong result does.
+        
+        Returns:
+            Number of rounds that are invalid or whose stored result
+            disagrees with the rules
+        """
+        bad = 0
+        for chunk in self.chunks(chunk_size):
+            stored = bytes(chunk)
+            rescored = stored.translate(RESCORE_TABLE)
+            if stored != rescored:
+                bad += sum(map(operator.ne, stored, rescored))
+            # A stored INVALID_ROUND byte rescores to itself
+            bad += stored.count(INVALID_ROUND)
+        return bad
+    
+    def close(self):
+        """
+        Release the mapping
+        
+        Views from packed() and chunks() stay readable after close(); while
+        any are alive, the mapping and its file descriptor are closed when
+        the last of them is released instead.
+        """
+        self._view.release()
+        mapping, self._map = self._map, None
+        if mapping is not None:
+            try:
+                mapping.close()
+            except BufferError:
+                # Caller still holds slices; dropping our reference leaves
+                # the mapping to be freed along with them
+                pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Summarize and rescore a replay file"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors replay tool')
+    parser.add_argument('replay', help='Replay file to read')
+    parser.add_argument('--verify', action='store_true',
+                        help='Check every stored result against the rules')
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    with ReplayReader(args.replay) as replay:
+        print(f"🎬 {replay.player} vs {replay.opponent}, "
+              f"recorded {time.strftime('%Y-%m-%d %H:%M', time.localtime(replay.created))}")
+        if not replay.complete:
+            print("⚠️ Recording was not closed cleanly; replaying the rounds that were written")
+        
+        try:
+            game = replay.rescore()
+        except ValueError:
+            print("❌ Replay contains invalid rounds and cannot be rescored")
+        else:
+            elapsed = time.perf_counter() - start
+            player_wins, opponent_wins, rounds = game.get_scores()
+            print(f"📊 {rounds} rounds: {player_wins} - {opponent_wins} "
+                  f"({rounds - player_wins - opponent_wins} ties)")
+            print(f"⏱️ Rescored in {elapsed:.3f}s")
+        
+        if args.verify:
+            bad = replay.verify()
+            print("✅ All results check out" if not bad else f"❌ {bad} rounds are invalid or disagree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Random move generation for Rock-Paper-Scissors
+Seedable per-instance streams that draw moves in prefetched blocks and can
+spawn independent child streams for parallel simulations
+"""
+
+import os
+import random
+from typing import List, Optional
+
+# Raw random bytes drawn per refill
+BLOCK_SIZE = 4096
+
+# Byte -> move code. 255 = 3 * 85, so bytes 0..254 are uniform over the
+# three moves and byte 255 is dropped (translate's delete argument)
+MOD3_TABLE = bytes(b % 3 for b in range(256))
+_REJECT = b"\xff"
+
+
+def derive_seed(seed: int, *path: int) -> int:
+    """
+    Seed of a child stream, derived by hashing the parent seed and a path
+    
+    Children of one parent (and their children) get unrelated seeds, so
+    their streams do not overlap the way seed, seed + 1, ... can.
+    
+    Args:
+        seed: Parent seed
+        *path: Child indexes, e.g. (worker, match)
+    
+    Returns:
+        128-bit integer seed
+    """
+    import hashlib
+    
+    digest = hashlib.blake2b(repr((seed,) + path).encode(), digest_size=16,
+                             person=b"rps-rng").digest()
+    return int.from_bytes(digest, "big")
+
+
+class MoveSource:
+    """
+    A stream of uniform move codes (0=Rock, 1=Paper, 2=Scissors)
+    
+    Moves are cut from blocks of random bytes with one bytes.translate
+    call, so a move costs a buffer index instead of a random.randrange()
+    call. The stream only depends on the seed and the block size, not on
+    how it is consumed: next_move() and moves(n) read the same sequence.
+    
+    Not thread-safe; give every thread or worker its own source, e.g.
+    from spawn().
+    """
+    
+    def __init__(self, seed: Optional[int] = None, block_size: int = BLOCK_SIZE):
+        """
+        Args:
+            seed: Seed for a reproducible stream (random if None)
+            block_size: Random bytes drawn per refill
+        """
+        if block_size <= 0:
+            raise ValueError("block_size must be a positive integer")
+        if seed is None:
+            seed = int.from_bytes(os.urandom(16), "big")
+        self.seed = seed
+        self.block_size = block_size
+        self.refills = 0
+        
+        self._random = random.Random(seed)
+        self._block = b""
+        self._index = 0
+        self._children = 0
+    
+    def _refill(self):
+        # Same bytes as Random.randbytes (Python 3.9+), which 3.8 lacks
+        n = self.block_size
+        block = self._random.getrandbits(8 * n).to_bytes(n, "little")
+        self._block = block.translate(MOD3_TABLE, _REJECT)
+        self._index = 0
+        self.refills += 1
+    
+    def next_move(self) -> int:
+        """Next move code"""
+        if self._index >= len(self._block):
+            self._refill()
+            # Empty only if every byte drawn was rejected (tiny block sizes)
+            while not self._block:
+                self._refill()
+        move = self._block[self._index]
+        self._index += 1
+        return move
+    
+    def moves(self, count: int) -> bytes:
+        """
+        The next count move codes
+        
+        Returns:
+            One move code per byte, usable with GameLogic.play_rounds
+        """
+        parts = []
+        needed = count
+        while needed > 0:
+            if self._index >= len(self._block):
+                self._refill()
+            part = self._block[self._index:self._index + needed]
+            self._index += len(part)
+            needed -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+    
+    def spawn(self) -> "MoveSource":
+        """
+        Create an independent child stream
+        
+        The n-th child of a seeded source always gets the same seed, so
+        handing one child to each worker keeps parallel runs reproducible.
+        """
+        child = MoveSource(derive_seed(self.seed, self._children), self.block_size)
+        self._children += 1
+        return child
+    
+    def spawn_many(self, count: int) -> List["MoveSource"]:
+        """Create count independent child streams"""
+        return [self.spawn() for _ in range(count)]
@@ -0,0 +1,175 @@
+"""
+Streaming statistics for Rock-Paper-Scissors
+Running totals, move frequencies, move transitions, streaks and a sliding
+window, updated per round so reading them never walks the history
+"""
+
+from collections import Counter, deque
+from typing import Dict, Optional
+
+from game_logic import RoundListener
+from history import OPPONENT_TABLE, PLAYER_TABLE, RESULT_TABLE
+from moves import MOVE_NAMES, ResultCode
+
+# Rounds covered by the windowed rates
+DEFAULT_WINDOW = 20
+
+# Result code -> name used in snapshots (from player 1's point of view)
+STREAK_NAMES = {ResultCode.TIE: "tie", ResultCode.PLAYER1: "win", ResultCode.PLAYER2: "loss"}
+
+# RUN_TABLES[code] turns result bytes into 1 where the result is code, 0 elsewhere
+RUN_TABLES = tuple(bytes(int(b == code) for b in range(256)) for code in range(3))
+
+
+def _rate(part: int, whole: int) -> float:
+    return part / whole if whole else 0.0
+
+
+class RoundStats(RoundListener):
+    """
+    Incrementally maintained match statistics
+    
+    Register with game.add_listener(). Every update is O(1) per round
+    (batches from play_rounds are folded in with a few bytes passes) and
+    snapshot() costs the same however many rounds were played.
+    """
+    
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            window: Number of most recent rounds the windowed rates cover
+        """
+        if window <= 0:
+            raise ValueError("window must be a positive integer")
+        self.window = window
+        self.reset()
+    
+    def reset(self):
+        """Forget everything"""
+        self.rounds = 0
+        self.results = [0, 0, 0]
+        self.moves = [0, 0, 0]
+        self.opponent_moves = [0, 0, 0]
+        # transitions[previous][next]: the player's move following each move
+        self.transitions = [[0, 0, 0] for _ in range(3)]
+        self.last_move: Optional[int] = None
+        self.streak_result: Optional[int] = None
+        self.streak = 0
+        self.longest = [0, 0, 0]
+        self.recent = deque(maxlen=self.window)
+        self.recent_results = [0, 0, 0]
+    
+    # ----- RoundListener -----
+    
+    def on_round(self, player_code: int, opponent_code: int, result_code: int):
+        self.rounds += 1
+        self.results[result_code] += 1
+        self.moves[player_code] += 1
+        self.opponent_moves[opponent_code] += 1
+        
+        if self.last_move is not None:
+            self.transitions[self.last_move][player_code] += 1
+        self.last_move = player_code
+        
+        if result_code == self.streak_result:
+            self.streak += 1
+        else:
+            self.streak_result = result_code
+            self.streak = 1
+        if self.streak > self.longest[result_code]:
+            self.longest[result_code] = self.streak
+        
+        recent = self.recent
+        if len(recent) == self.window:
+            self.recent_results[recent[0]] -= 1
+        recent.append(result_code)
+        self.recent_results[result_code] += 1
+    
+    def on_rounds(self, packed: bytes):
+        if len(packed) < self.window:
+            # Not worth the column passes
+            super().on_rounds(packed)
+            return
+        
+        players = packed.translate(PLAYER_TABLE)
+        results = packed.translate(RESULT_TABLE)
+        opponents = packed.translate(OPPONENT_TABLE)
+        self.rounds += len(packed)
+        for code in range(3):
+            self.results[code] += results.count(code)
+            self.moves[code] += players.count(code)
+            self.opponent_moves[code] += opponents.count(code)
+        
+        if self.last_move is not None:
+            self.transitions[self.last_move][players[0]] += 1
+        for (previous, following), count in Counter(zip(players, players[1:])).items():
+            self.transitions[previous][following] += count
+        self.last_move = players[-1]
+        
+        # The batch's leading run continues the current streak
+        if self.streak_result is not None:
+            leading = len(results) - len(results.lstrip(bytes((self.streak_result,))))
+            self.longest[self.streak_result] = max(self.longest[self.streak_result],
+                                                   self.streak + leading)
+        for code in range(3):
+            runs = results.translate(RUN_TABLES[code]).split(b"\0")
+            self.longest[code] = max(self.longest[code], len(max(runs, key=len)))
+        
+        last = results[-1]
+        trailing = len(results) - len(results.rstrip(bytes((last,))))
+        if trailing == len(results) and last == self.streak_result:
+            self.streak += trailing
+        else:
+            self.streak_result = last
+            self.streak = trailing
+        
+        self.recent.extend(results[-self.window:])
+        self.recent_results = [self.recent.count(code) for code in range(3)]
+    
+    def on_reset(self):
+        self.reset()
+    
+    # ----- reading -----
+    
+    def snapshot(self) -> Dict:
+        """
+        Current statistics as plain, JSON-friendly data
+        
+        Results are from player 1's point of view (the single player, or
+        the host/server in a network match).
+        
+        Returns:
+            Dictionary with:
+                rounds, wins, losses, ties, win_rate
+                moves, opponent_moves      counts per move name
+                move_frequencies           share of each of player 1's moves
+                transitions                {previous move: {next move: count}}
+                streak                     {"result": "win"/"loss"/"tie"/None, "length": n}
+                longest_streaks            {"win": n, "loss": n, "tie": n}
+                window                     rates over the last `size` rounds
+        """
+        wins = self.results[ResultCode.PLAYER1]
+        recent = len(self.recent)
+        recent_wins = self.recent_results[ResultCode.PLAYER1]
+        return {
+            "rounds": self.rounds,
+            "wins": wins,
+            "losses": self.results[ResultCode.PLAYER2],
+            "ties": self.results[ResultCode.TIE],
+            "win_rate": _rate(wins, self.rounds),
+            "moves": dict(zip(MOVE_NAMES, self.moves)),
+            "opponent_moves": dict(zip(MOVE_NAMES, self.opponent_moves)),
+            "move_frequencies": {name: _rate(count, self.rounds)
+                                 for name, count in zip(MOVE_NAMES, self.moves)},
+            "transitions": {MOVE_NAMES[previous]: dict(zip(MOVE_NAMES, row))
+                            for previous, row in enumerate(self.transitions)},
+            "streak": {"result": STREAK_NAMES.get(self.streak_result), "length": self.streak},
+            "longest_streaks": {STREAK_NAMES[code]: self.longest[code] for code in range(3)},
+            "window": {
+                "size": recent,
+                "wins": recent_wins,
+                "losses": self.recent_results[ResultCode.PLAYER2],
+                "ties": self.recent_results[ResultCode.TIE],
+                "win_rate": _rate(recent_wins, recent),
+            },
+        }
@@ -0,0 +1,171 @@
+"""
+Computer opponent strategies for Rock-Paper-Scissors
+Every strategy works on integer move codes (see moves.py)
+"""
+
+from typing import Dict, Optional, Type
+
+from moves import COUNTERS
+from rng import MoveSource
+
+
+class Strategy:
+    """Base class for computer opponents"""
+    
+    name = "base"
+    
+    def choose(self) -> int:
+        """
+        Pick the next move
+        
+        Returns:
+            Move code (0=Rock, 1=Paper, 2=Scissors)
+        """
+        raise NotImplementedError
+    
+    def observe(self, opponent_code: int, own_code: int):
+        """
+        Learn from a finished round
+        
+        Args:
+            opponent_code: Move the opponent played
+            own_code: Move this strategy played
+        """
+    
+    def reset(self):
+        """Forget everything learned so far"""
+    
+    def use_rng(self, rng: MoveSource):
+        """
+        Draw any random moves from rng (for reproducible games)
+        
+        Strategies that never play randomly ignore it.
+        """
+        self.rng = rng
+
+
+class RandomStrategy(Strategy):
+    """Uniformly random moves (the classic computer opponent)"""
+    
+    name = "random"
+    
+    def __init__(self, rng: Optional[MoveSource] = None):
+        self.rng = rng if rng is not None else MoveSource()
+    
+    def choose(self) -> int:
+        return self.rng.next_move()
+
+
+class CycleStrategy(Strategy):
+    """Plays Rock, Paper, Scissors in a fixed cycle"""
+    
+    name = "cycle"
+    
+    def __init__(self):
+        self._next = 0
+    
+    def choose(self) -> int:
+        move = self._next
+        self._next = (move + 1) % 3
+        return move
+    
+    def reset(self):
+        self._next = 0
+
+
+class MarkovStrategy(Strategy):
+    """
+    Predicts the opponent with an order-k Markov model and plays the counter
+    
+    The last k opponent moves form a context encoded as a base-3 integer. Each
+    context owns three counters (how often Rock, Paper or Scissors followed it),
+    so memory is fixed at 3 ** (k + 1) counters and every update is O(1).
+    """
+    
+    name = "markov"
+    
+    def __init__(self, order: int = 2, rng: Optional[MoveSource] = None):
+        if order < 0:
+            raise ValueError("order must be zero or positive")
+        
+        self.rng = rng if rng is not None else MoveSource()
+        self.order = order
+        self._contexts = 3 ** order
+        self.reset()
+    
+    def reset(self):
+        self._counts = [0] * (self._contexts * 3)
+        self._context = 0
+        self._seen = 0
+    
+    def predict(self) -> int:
+        """
+        Predict the opponent's next move
+        
+        Returns:
+            Most likely move code, or -1 if the current context has no data yet
+        """
+        if self._seen < self.order:
+            return -1
+        
+        base = self._context * 3
+        rock, paper, scissors = self._counts[base:base + 3]
+        if rock == paper == scissors:
+            return -1
+        
+        if rock >= paper:
+            return 0 if rock >= scissors else 2
+        return 1 if paper >= scissors else 2
+    
+    def choose(self) -> int:
+        predicted = self.predict()
+        if predicted < 0:
+            return self.rng.next_move()
+        return COUNTERS[predicted]
+    
+    def observe(self, opponent_code: int, own_code: int):
+        # Count the move against the context it followed, then slide the window
+        if self._seen >= self.order:
+            self._counts[self._context * 3 + opponent_code] += 1
+        self._context = (self._context * 3 + opponent_code) % self._contexts
+        self._seen += 1
+
+
+class FrequencyStrategy(MarkovStrategy):
+    """Counters the opponent's overall most frequent move (order-0 Markov)"""
+    
+    name = "frequency"
+    
+    def __init__(self, rng: Optional[MoveSource] = None):
+        super().__init__(order=0, rng=rng)
+
+
+# Registered strategies by name
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    RandomStrategy.name: RandomStrategy,
+    CycleStrategy.name: CycleStrategy,
+    MarkovStrategy.name: MarkovStrategy,
+    FrequencyStrategy.name: FrequencyStrategy,
+}
+
+
+def create_strategy(name: str, rng: Optional[MoveSource] = None, **kwargs) -> Strategy:
+    """
+    Create a registered strategy by name
+    
+    Args:
+        name: Strategy name (see STRATEGIES)
+        rng: Move source for any random moves (see Strategy.use_rng)
+        **kwargs: Arguments passed to the strategy constructor
+    
+    Returns:
+        New strategy instance
+    """
+    try:
+        strategy_class = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}") from None
+    strategy = strategy_class(**kwargs)
+    if rng is not None:
+        strategy.use_rng(rng)
+    return strategy
@@ -0,0 +1,196 @@
+"""
+Headless tournament runner for Rock-Paper-Scissors strategies
+Plays round-robin matches across worker processes without the Tk UI
+"""
+
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from game_logic import GameLogic
+from rng import MoveSource, derive_seed
+from strategies import STRATEGIES, create_strategy
+
+# (strategy_a, strategy_b, a_wins, b_wins, ties)
+MatchResult = Tuple[str, str, int, int, int]
+
+
+def play_match(name_a: str, name_b: str, rounds: int, seed: Optional[int] = None) -> MatchResult:
+    """
+    Play one match between two registered strategies
+    
+    Moves are collected into integer arrays and scored in one call to
+    GameLogic.play_rounds, so only the totals leave this function. Each
+    strategy draws from its own stream spawned from the match seed, so a
+    seeded match plays the same in any worker process.
+    
+    Args:
+        name_a: First strategy name
+        name_b: Second strategy name
+        rounds: Number of rounds to play
+        seed: Optional seed for reproducible matches
+    
+    Returns:
+        Tuple of (name_a, name_b, a_wins, b_wins, ties)
+    """
+    source = MoveSource(seed)
+    strategy_a = create_strategy(name_a, rng=source.spawn())
+    strategy_b = create_strategy(name_b, rng=source.spawn())
+    moves_a = array('b', bytes(rounds))
+    moves_b = array('b', bytes(rounds))
+    
+    for i in range(rounds):
+        move_a = strategy_a.choose()
+        move_b = strategy_b.choose()
+        moves_a[i] = move_a
+        moves_b[i] = move_b
+        strategy_a.observe(move_b, move_a)
+        strategy_b.observe(move_a, move_b)
+    
+    # Only the scores are needed, so keep a single round of history
+    game = GameLogic(history_limit=1)
+    game.play_rounds(moves_a, moves_b)
+    ties = rounds - game.player_score - game.computer_score
+    
+    return name_a, name_b, game.player_score, game.computer_score, ties
+
+
+class Standings:
+    """Aggregated win/loss/tie tables for a tournament"""
+    
+    def __init__(self, names: Sequence[str]):
+        self.names = list(names)
+        self.totals: Dict[str, List[int]] = {name: [0, 0, 0] for name in self.names}
+        self.pairs: Dict[Tuple[str, str], List[int]] = {}
+        self.matches_played = 0
+    
+    def add(self, result: MatchResult):
+        """
+        Fold one match result into the tables
+        
+        Args:
+            result: Tuple returned by play_match
+        """
+        name_a, name_b, a_wins, b_wins, ties = result
+        
+        for name, wins, losses in ((name_a, a_wins, b_wins), (name_b, b_wins, a_wins)):
+            totals = self.totals[name]
+            totals[0] += wins
+            totals[1] += losses
+            totals[2] += ties
+        
+        pair = self.pairs.setdefault((name_a, name_b), [0, 0, 0])
+        pair[0] += a_wins
+        pair[1] += b_wins
+        pair[2] += ties
+        self.matches_played += 1
+    
+    def ranking(self) -> List[Tuple[str, int, int, int]]:
+        """
+        Get strategies ordered by win rate
+        
+        Returns:
+            List of (name, wins, losses, ties), best first
+        """
+        def win_rate(item):
+            wins, losses, ties = item[1]
+            played = wins + losses + ties
+            return wins / played if played else 0.0
+        
+        ordered = sorted(self.totals.items(), key=win_rate, reverse=True)
+        return [(name, wins, losses, ties) for name, (wins, losses, ties) in ordered]
+    
+    def format_table(self) -> str:
+        """Format the standings as a text table"""
+        lines = [f"{'Strategy':<12}{'Wins':>10}{'Losses':>10}{'Ties':>10}{'Win %':>8}"]
+        for name, wins, losses, ties in self.ranking():
+            played = wins + losses + ties
+            rate = 100 * wins / played if played else 0.0
+            lines.append(f"{name:<12}{wins:>10}{losses:>10}{ties:>10}{rate:>7.1f}%")
+        return "\n".join(lines)
+
+
+def schedule(names: Sequence[str], rounds: int, matches_per_pair: int = 1,
+             seed: Optional[int] = None) -> List[Tuple[str, str, int, Optional[int]]]:
+    """
+    Build the round-robin match list
+    
+    Args:
+        names: Strategy names taking part
+        rounds: Rounds per match
+        matches_per_pair: Independent matches per pairing (more tasks to spread across cores)
+        seed: Optional base seed; each match gets its own derived seed
+    
+    Returns:
+        List of play_match argument tuples
+    """
+    matches = []
+    for index, (name_a, name_b) in enumerate(
+            (pair for pair in itertools.combinations(names, 2) for _ in range(matches_per_pair))):
+        match_seed = None if seed is None else derive_seed(seed, index)
+        matches.append((name_a, name_b, rounds, match_seed))
+    return matches
+
+
+def run_tournament(names: Sequence[str], rounds: int = 10_000, matches_per_pair: int = 1,
+                   workers: Optional[int] = None, seed: Optional[int] = None) -> Iterator[Standings]:
+    """
+    Run a round-robin tournament across a process pool
+    
+    Standings are yielded after every finished match, so callers can show
+    progress while the remaining matches are still running.
+    
+    Args:
+        names: Strategy names taking part
+        rounds: Rounds per match
+        matches_per_pair: Independent matches per pairing
+        workers: Worker processes (defaults to the number of CPUs)
+        seed: Optional base seed for reproducible results
+    
+    Yields:
+        The updated Standings after each finished match
+    """
+    for name in names:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {name}")
+    
+    standings = Standings(names)
+    matches = schedule(names, rounds, matches_per_pair, seed)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_match, *match) for match in matches]
+        for future in as_completed(futures):
+            standings.add(future.result())
+            yield standings
+
+
+def main():
+    """Main function to run a headless tournament"""
+    import argparse
+    import time
+    
+    parser = argparse.ArgumentParser(description='Rock-Paper-Scissors strategy tournament')
+    parser.add_argument('strategies', nargs='*', default=list(STRATEGIES),
+                        help=f"Strategies to enter (default: all of {', '.join(STRATEGIES)})")
+    parser.add_argument('--rounds', type=int, default=100_000, help='Rounds per match')
+    parser.add_argument('--matches', type=int, default=4, help='Matches per pairing')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for reproducible results')
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    standings = None
+    for standings in run_tournament(args.strategies, args.rounds, args.matches,
+                                    args.workers, args.seed):
+        print(f"\rMatches finished: {standings.matches_played}", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    
+    print("\n")
+    if standings is not None:
+        print(standings.format_table())
+    print(f"\nCompleted in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
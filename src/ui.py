@@ -1,15 +1,28 @@
 """
 Modern UI for Rock-Paper-Scissors game with theme toggle and multiplayer
+
+Only what the main menu and single player need is imported up front. The
+networking stack (socket, framing, match_engine, utils, discovery,
+net_loop) is imported inside the multiplayer screens, so it is only loaded
+once the player opens them.
+
+All sockets share one NetworkLoop thread; its events reach Tk through a
+single coalesced root.after callback (see net_loop.py), and the labels
+they change are repainted once per frame by ui_dispatch.UIDispatcher.
+
+Each screen is built once into its own frame and afterwards only shown or
+hidden; theme changes recolor the registered widgets in place.
 """
 
+import math
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from typing import Callable, Optional
-import threading
-import socket
-import json
+from functools import lru_cache
+from tkinter import messagebox
 from game_logic import GameLogic
-from utils import get_local_ip, create_message, parse_message
+from ui_dispatch import UIDispatcher
+
+# Port the Wi-Fi host tries first; any free port is used if it is taken
+DEFAULT_PORT = 50007
 
 
 class Theme:
@@ -50,9 +63,128 @@ class Theme:
     }
 
 
+# Corner radius of ModernButton
+BUTTON_RADIUS = 10
+
+
+@lru_cache(maxsize=None)
+def rounded_rect_points(x1, y1, x2, y2, radius):
+    """
+    Control points of a smoothed rounded rectangle polygon
+    
+    Cached, so identical buttons share one tuple instead of rebuilding it.
+    
+    Returns:
+        Flat tuple of 40 coordinates for Canvas.create_polygon(smooth=True)
+    """
+    return (
+        x1+radius, y1,
+        x1+radius, y1,
+        x2-radius, y1,
+        x2-radius, y1,
+        x2, y1,
+        x2, y1+radius,
+        x2, y1+radius,
+        x2, y2-radius,
+        x2, y2-radius,
+        x2, y2,
+        x2-radius, y2,
+        x2-radius, y2,
+        x1+radius, y2,
+        x1+radius, y2,
+        x1, y2,
+        x1, y2-radius,
+        x1, y2-radius,
+        x1, y1+radius,
+        x1, y1+radius,
+        x1, y1
+    )
+
+
+@lru_cache(maxsize=64)
+def rounded_rect_pixels(width, height, radius, fill, background):
+    """
+    Pixel data of a filled rounded rectangle for PhotoImage.put
+    
+    Only the top and bottom `radius` rows differ from a plain row, so the
+    string is assembled from a handful of distinct rows.
+    
+    Args:
+        width, height: Image size in pixels
+        radius: Corner radius
+        fill: Rectangle color
+        background: Color of the pixels outside the corners
+    
+    Returns:
+        Image data ("{row} {row} ..." of space separated colors)
+    """
+    def row(inset):
+        return "{" + " ".join([background] * inset + [fill] * (width - 2 * inset)
+                              + [background] * inset) + "}"
+    
+    radius = min(radius, width // 2, height // 2)
+    corner_rows = []
+    for y in range(radius):
+        # Distance of the pixel centre above the corner circle's centre
+        dy = radius - y - 0.5
+        corner_rows.append(row(round(radius - math.sqrt(radius * radius - dy * dy))))
+    
+    middle = [row(0)] * (height - 2 * radius)
+    return " ".join(corner_rows + middle + corner_rows[::-1])
+
+
+class ShapeCache:
+    """
+    Pre-rendered button images shared by every ModernButton of a window
+    
+    Keyed by (width, height, radius, fill, background), so the three move
+    buttons, the menu buttons of one color, and so on each cost one image
+    that Tk only has to place, not a polygon it has to tessellate.
+    """
+    
+    def __init__(self, master):
+        self.master = master
+        self._images = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @classmethod
+    def for_widget(cls, widget):
+        """The cache belonging to a widget's top-level window"""
+        top = widget.winfo_toplevel()
+        cache = getattr(top, "_shape_cache", None)
+        if cache is None:
+            cache = top._shape_cache = cls(top)
+        return cache
+    
+    def image(self, width, height, radius, fill, background):
+        """
+        Get (or render once) a rounded rectangle image
+        
+        Returns:
+            A PhotoImage kept alive by the cache
+        """
+        key = (width, height, radius, fill, background)
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            image = tk.PhotoImage(master=self.master, width=width, height=height)
+            image.put(rounded_rect_pixels(*key), to=(0, 0))
+            self._images[key] = image
+        else:
+            self.hits += 1
+        return image
+    
+    def __len__(self):
+        return len(self._images)
+
+
 class ModernButton(tk.Canvas):
     """Custom modern button with hover effects"""
     
+    # Draw buttons from cached images; False falls back to canvas polygons
+    use_images = True
+    
     def __init__(self, parent, text, command, width=200, height=50, 
                  bg_color="#1A73E8", hover_color="#1557B0", text_color="white"):
         super().__init__(parent, width=width, height=height, 
@@ -66,7 +198,13 @@ class ModernButton(tk.Canvas):
         self.height = height
         
         # Create rounded rectangle
-        self.rect = self.create_rounded_rect(0, 0, width, height, 10, fill=bg_color)
+        if self.use_images:
+            self.shapes = ShapeCache.for_widget(self)
+            self.rect = self.create_image(0, 0, anchor="nw", image=self._shape(bg_color))
+        else:
+            self.shapes = None
+            self.rect = self.create_rounded_rect(0, 0, width, height, BUTTON_RADIUS,
+                                                 fill=bg_color)
         self.text_item = self.create_text(width/2, height/2, text=text, 
                                      fill=text_color, font=("Helvetica", 12, "bold"))
         
@@ -77,45 +215,43 @@ class ModernButton(tk.Canvas):
     
     def create_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
         """Create a rounded rectangle"""
-        points = [
-            x1+radius, y1,
-            x1+radius, y1,
-            x2-radius, y1,
-            x2-radius, y1,
-            x2, y1,
-            x2, y1+radius,
-            x2, y1+radius,
-            x2, y2-radius,
-            x2, y2-radius,
-            x2, y2,
-            x2-radius, y2,
-            x2-radius, y2,
-            x1+radius, y2,
-            x1+radius, y2,
-            x1, y2,
-            x1, y2-radius,
-            x1, y2-radius,
-            x1, y1+radius,
-            x1, y1+radius,
-            x1, y1
-        ]
-        return self.create_polygon(points, smooth=True, **kwargs)
+        return self.create_polygon(rounded_rect_points(x1, y1, x2, y2, radius),
+                                   smooth=True, **kwargs)
+    
+    def _shape(self, color):
+        """Cached image of this button's shape in a color"""
+        return self.shapes.image(self.width, self.height, BUTTON_RADIUS, color, self.cget('bg'))
+    
+    def _fill(self, color):
+        if self.shapes is not None:
+            self.itemconfig(self.rect, image=self._shape(color))
+        else:
+            self.itemconfig(self.rect, fill=color)
     
     def _on_click(self, event):
         if self.command:
             self.command()
     
     def _on_enter(self, event):
-        self.itemconfig(self.rect, fill=self.hover_color)
+        self._fill(self.hover_color)
     
     def _on_leave(self, event):
-        self.itemconfig(self.rect, fill=self.bg_color)
+        self._fill(self.bg_color)
     
-    def update_colors(self, bg_color, hover_color):
-        """Update button colors for theme changes"""
+    def update_colors(self, bg_color, hover_color, canvas_bg=None):
+        """
+        Update button colors for theme changes
+        
+        Args:
+            bg_color: Button color
+            hover_color: Button color under the mouse
+            canvas_bg: New background around the rounded corners, if it changed
+        """
         self.bg_color = bg_color
         self.hover_color = hover_color
-        self.itemconfig(self.rect, fill=bg_color)
+        if canvas_bg is not None:
+            self.configure(bg=canvas_bg)
+        self._fill(bg_color)
 
 
 class GameUI:
@@ -129,202 +265,354 @@ class GameUI:
         
         self.game_logic = GameLogic()
         self.current_screen = None
+        
+        # Single player rounds are saved here once the screen is first opened
+        self.store = None
+        self.recorder = None
+        self.lifetime_base = None
         self.is_dark_mode = False
         self.theme = Theme.LIGHT
         
+        # Multiplayer labels are repainted through this, at most once per frame
+        self.dispatcher = UIDispatcher(self.root.after)
+        
         # Multiplayer variables
         self.server_socket = None
         self.client_socket = None
         self.connection = None
-        self.multiplayer_thread = None
+        self.stream = None
+        self.network = None
+        self.heartbeat = None
         self.is_hosting = False
-        self.opponent_move = None
+        self.awaiting_handshake = False
+        self.match_engine = None
+        self.round_timer = None
         self.waiting_for_opponent = False
         self.multiplayer_running = False
         self.player_score = 0
         self.opponent_score = 0
         
+        # LAN discovery: beacon sent while hosting, listener on the join screen
+        self.beacon = None
+        self.beacon_timer = None
+        self.discovery_listener = None
+        self.discovery_timer = None
+        self.discovered_games = {}
+        self.discovered_keys = []
+        
+        # Screens are built once and then only hidden, shown and recolored
+        self.screens = {}
+        self.active_screen = None
+        self.themed_widgets = {}
+        self.root.configure(bg=self.theme["bg"])
+        self.theme_button = self.create_theme_toggle(self.root)
+        
         # Show main menu
         self.show_main_menu()
     
+    def get_network(self):
+        """Network loop shared by every connection, started on first use"""
+        if self.network is None:
+            from heartbeat import HeartbeatMonitor
+            import metrics
+            from net_loop import EventPump, NetworkLoop
+            
+            # Before any instrumented object is created
+            metrics.enable_from_env()
+            pump = EventPump(lambda drain: self.root.after(0, drain))
+            self.network = NetworkLoop(post=pump.post)
+            # One timer on the loop thread keeps every connection alive
+            self.heartbeat = HeartbeatMonitor()
+            self.network.call_every(self.heartbeat.interval, self.heartbeat.tick)
+            self.network.start()
+        return self.network
+    
+    def keep_alive(self, stream):
+        """Ping a new connection; call before its handshake is sent"""
+        self.get_network()
+        self.heartbeat.add(stream, listening=True,
+                           on_dead=lambda dead: self.network.post(self.on_peer_timeout, dead))
+    
+    def shutdown(self):
+        """Close any game and the network loop, then the window"""
+        if self.multiplayer_running:
+            self.close_session()
+        self.stop_discovery()
+        if self.network:
+            self.network.stop()
+        if self.store:
+            self.recorder.close()
+            self.store.close()
+        self.root.destroy()
+    
     def toggle_theme(self):
         """Toggle between light and dark mode"""
         self.is_dark_mode = not self.is_dark_mode
         self.theme = Theme.DARK if self.is_dark_mode else Theme.LIGHT
+        self.apply_theme()
+    
+    def apply_theme(self):
+        """Recolor every built screen in place (no widget is recreated)"""
+        # Paint queued label updates first so they cannot bring old colors back
+        self.dispatcher.flush()
         self.root.configure(bg=self.theme["bg"])
-        
-        # Refresh current screen
-        if self.current_screen == "main_menu":
-            self.show_main_menu()
-        elif self.current_screen == "single_player":
-            self.show_single_player()
-        elif self.current_screen == "wifi_menu":
-            self.show_wifi_menu()
-        elif self.current_screen == "wifi_host":
-            self.show_wifi_host()
-        elif self.current_screen == "wifi_join_input":
-            self.show_wifi_join_input()
-        elif self.current_screen == "bluetooth_menu":
-            self.show_bluetooth_menu()
-    
-    def clear_screen(self):
-        """Clear all widgets from the screen"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.theme_button.config(text="☀️" if self.is_dark_mode else "🌙")
+        
+        # Parents were registered before their children, so a button's
+        # frame already has its new background when the button reads it
+        for widget, roles in list(self.themed_widgets.items()):
+            if not widget.winfo_exists():
+                del self.themed_widgets[widget]
+                continue
+            if isinstance(widget, ModernButton):
+                role = roles["button"]
+                widget.update_colors(self.theme[role], self.theme[role + "_hover"],
+                                     canvas_bg=widget.master.cget("bg"))
+                continue
+            changes = {option: self.theme[role] for option, role in roles.items()
+                       if widget.cget(option) != self.theme[role]}
+            if changes:
+                widget.config(**changes)
+    
+    def themed(self, widget, **roles):
+        """
+        Color a widget from the theme and keep it in step with theme changes
+        
+        Args:
+            widget: Any Tk widget
+            **roles: Widget option -> theme key, e.g. fg="text", bg="bg"
+        
+        Returns:
+            The widget
+        """
+        widget.config(**self.theme_colors(widget, **roles))
+        return widget
+    
+    def theme_colors(self, widget, **roles):
+        """
+        Record new theme roles for a widget and return their current colors
+        
+        Args:
+            widget: A widget created with themed()
+            **roles: Widget option -> theme key
+        
+        Returns:
+            Options for widget.config()
+        """
+        self.themed_widgets.setdefault(widget, {}).update(roles)
+        return {option: self.theme[role] for option, role in roles.items()}
+    
+    def make_button(self, parent, text, command, role, **size):
+        """
+        Create a ModernButton in a theme color that follows theme changes
+        
+        Args:
+            parent: Parent widget
+            text: Button text
+            command: Click handler
+            role: Theme key of the button color ("<role>_hover" is used on hover)
+            **size: width/height for ModernButton
+        
+        Returns:
+            The button
+        """
+        button = ModernButton(parent, text, command, bg_color=self.theme[role],
+                              hover_color=self.theme[role + "_hover"], **size)
+        self.themed_widgets[button] = {"button": role}
+        return button
+    
+    def reset_label(self, label, text, role):
+        """Set a label's text and color now, dropping any queued update for it"""
+        self.dispatcher.drop(label)
+        label.config(text=text, **self.theme_colors(label, fg=role))
+    
+    def enter_screen(self, name, build):
+        """
+        Show a screen, creating its widgets only the first time
+        
+        Args:
+            name: Screen name, stored in current_screen
+            build: Called as build(frame) to fill a new screen's frame
+        
+        Returns:
+            The screen's frame
+        """
+        self.current_screen = name
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.themed(tk.Frame(self.root), bg="bg")
+            build(screen)
+            self.screens[name] = screen
+        
+        if screen is not self.active_screen:
+            if self.active_screen is not None:
+                self.active_screen.pack_forget()
+            screen.pack(fill=tk.BOTH, expand=True)
+            self.active_screen = screen
+        return screen
     
     def create_theme_toggle(self, parent):
-        """Create a theme toggle button"""
-        toggle_frame = tk.Frame(parent, bg=self.theme["bg"])
+        """Create the theme toggle button shared by every screen"""
+        toggle_frame = self.themed(tk.Frame(parent), bg="bg")
         toggle_frame.pack(anchor="ne", padx=20, pady=10)
         
         icon = "🌙" if not self.is_dark_mode else "☀️"
-        toggle_btn = tk.Button(toggle_frame, text=icon, 
-                              command=self.toggle_theme,
-                              font=("Helvetica", 16),
-                              bg=self.theme["secondary_bg"],
-                              fg=self.theme["text"],
-                              relief=tk.FLAT,
-                              cursor="hand2",
-                              padx=10, pady=5)
+        toggle_btn = self.themed(tk.Button(toggle_frame, text=icon, 
+                                          command=self.toggle_theme,
+                                          font=("Helvetica", 16),
+                                          relief=tk.FLAT,
+                                          cursor="hand2",
+                                          padx=10, pady=5), bg="secondary_bg", fg="text")
         toggle_btn.pack()
+        return toggle_btn
     
     def show_main_menu(self):
         """Display the main menu"""
-        self.clear_screen()
-        self.current_screen = "main_menu"
-        self.root.configure(bg=self.theme["bg"])
-        
-        # Theme toggle
-        self.create_theme_toggle(self.root)
-        
+        self.enter_screen("main_menu", self.build_main_menu)
+    
+    def build_main_menu(self, screen):
+        """Create the main menu widgets"""
         # Title
-        title_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        title_frame = self.themed(tk.Frame(screen), bg="bg")
         title_frame.pack(pady=20)
         
-        title = tk.Label(title_frame, text="Rock Paper Scissors", 
-                        font=("Helvetica", 28, "bold"), 
-                        fg=self.theme["primary"], bg=self.theme["bg"])
+        title = self.themed(tk.Label(title_frame, text="Rock Paper Scissors", 
+                                    font=("Helvetica", 28, "bold")), fg="primary", bg="bg")
         title.pack()
         
-        subtitle = tk.Label(title_frame, text="Choose Your Game Mode", 
-                           font=("Helvetica", 12), 
-                           fg=self.theme["text_secondary"], bg=self.theme["bg"])
+        subtitle = self.themed(tk.Label(title_frame, text="Choose Your Game Mode", 
+                                       font=("Helvetica", 12)), fg="text_secondary", bg="bg")
         subtitle.pack(pady=10)
         
         # Buttons frame
-        buttons_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        buttons_frame = self.themed(tk.Frame(screen), bg="bg")
         buttons_frame.pack(pady=20)
         
         # Single Player button
-        single_btn = ModernButton(buttons_frame, "🎮 Single Player vs AI", 
-                                  self.show_single_player, width=280, height=60,
-                                  bg_color=self.theme["primary"],
-                                  hover_color=self.theme["primary_hover"])
+        single_btn = self.make_button(buttons_frame, "🎮 Single Player vs AI", 
+                                      self.show_single_player, width=280, height=60,
+                                      role="primary")
         single_btn.pack(pady=10)
         
         # Multiplayer Wi-Fi button
-        wifi_btn = ModernButton(buttons_frame, "📡 Multiplayer (Wi-Fi)", 
-                               self.show_wifi_menu, width=280, height=60,
-                               bg_color=self.theme["success"],
-                               hover_color=self.theme["success_hover"])
+        wifi_btn = self.make_button(buttons_frame, "📡 Multiplayer (Wi-Fi)", 
+                                   self.show_wifi_menu, width=280, height=60,
+                                   role="success")
         wifi_btn.pack(pady=10)
         
         # Multiplayer Bluetooth button
-        bt_btn = ModernButton(buttons_frame, "📱 Multiplayer (Bluetooth)", 
-                             self.show_bluetooth_menu, width=280, height=60,
-                             bg_color=self.theme["warning"],
-                             hover_color=self.theme["warning_hover"])
+        bt_btn = self.make_button(buttons_frame, "📱 Multiplayer (Bluetooth)", 
+                                 self.show_bluetooth_menu, width=280, height=60,
+                                 role="warning")
         bt_btn.pack(pady=10)
         
         # Exit button
-        exit_btn = ModernButton(buttons_frame, "❌ Exit", 
-                               self.root.quit, width=280, height=60,
-                               bg_color=self.theme["danger"],
-                               hover_color=self.theme["danger_hover"])
+        exit_btn = self.make_button(buttons_frame, "❌ Exit", 
+                                   self.shutdown, width=280, height=60,
+                                   role="danger")
         exit_btn.pack(pady=10)
     
     def show_single_player(self):
-        """Display the single player game screen"""
-        self.clear_screen()
-        self.current_screen = "single_player"
-        self.game_logic.reset_scores()
-        self.root.configure(bg=self.theme["bg"])
-        
-        # Theme toggle
-        self.create_theme_toggle(self.root)
-        
+        """Display the single player game screen with fresh scores"""
+        self.enter_screen("single_player", self.build_single_player)
+        self.open_store()
+        self.reset_game()
+    
+    def open_store(self):
+        """Start saving single player rounds (once; the game works without it)"""
+        if self.store is not None:
+            return
+        try:
+            from persistence import GameStore, SessionRecorder
+            
+            self.store = GameStore()
+        except Exception as e:
+            # Read-only home directory, locked database, ...
+            print(f"⚠️ Game history will not be saved: {e}")
+            return
+        self.recorder = SessionRecorder(self.store, opponent=type(self.game_logic.strategy).__name__)
+        self.game_logic.add_listener(self.recorder)
+        self.flush_idle_store()
+    
+    def flush_idle_store(self):
+        """Commit rounds left buffered while nobody plays (on the Tk thread, like the store)"""
+        if self.store is None:
+            return
+        self.store.flush_if_due()
+        # Twice per interval, so no round waits much longer than flush_interval
+        self.root.after(int(self.store.flush_interval * 500), self.flush_idle_store)
+    
+    def build_single_player(self, screen):
+        """Create the single player widgets"""
         # Header
-        header_frame = tk.Frame(self.root, bg=self.theme["secondary_bg"], height=70)
+        header_frame = self.themed(tk.Frame(screen, height=70), bg="secondary_bg")
         header_frame.pack(fill=tk.X)
         header_frame.pack_propagate(False)
         
-        title = tk.Label(header_frame, text="Single Player Mode", 
-                        font=("Helvetica", 20, "bold"), 
-                        fg=self.theme["primary"], bg=self.theme["secondary_bg"])
+        title = self.themed(tk.Label(header_frame, text="Single Player Mode", 
+                                    font=("Helvetica", 20, "bold")),
+                            fg="primary", bg="secondary_bg")
         title.pack(pady=20)
         
         # Score frame
-        score_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        score_frame = self.themed(tk.Frame(screen), bg="bg")
         score_frame.pack(pady=20)
         
-        self.score_label = tk.Label(score_frame, text="Score: 0 - 0", 
-                                    font=("Helvetica", 16, "bold"), 
-                                    fg=self.theme["text"], bg=self.theme["bg"])
+        self.score_label = self.themed(tk.Label(score_frame, text="Score: 0 - 0", 
+                                                font=("Helvetica", 16, "bold")), fg="text", bg="bg")
         self.score_label.pack()
         
-        self.rounds_label = tk.Label(score_frame, text="Rounds Played: 0", 
-                                     font=("Helvetica", 12), 
-                                     fg=self.theme["text_secondary"], bg=self.theme["bg"])
+        self.rounds_label = self.themed(tk.Label(score_frame, text="Rounds Played: 0", 
+                                                 font=("Helvetica", 12)),
+                                        fg="text_secondary", bg="bg")
         self.rounds_label.pack(pady=5)
         
+        self.lifetime_label = self.themed(tk.Label(score_frame, text="", font=("Helvetica", 10)),
+                                          fg="text_secondary", bg="bg")
+        self.lifetime_label.pack()
+        
         # Result display
-        self.result_label = tk.Label(self.root, text="Choose your move!", 
-                                     font=("Helvetica", 14), 
-                                     fg=self.theme["text_secondary"], bg=self.theme["bg"],
-                                     wraplength=450)
+        self.result_label = self.themed(tk.Label(screen, text="Choose your move!", 
+                                                 font=("Helvetica", 14),
+                                                 wraplength=450), fg="text_secondary", bg="bg")
         self.result_label.pack(pady=20)
         
         # Move buttons
-        moves_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        moves_frame = self.themed(tk.Frame(screen), bg="bg")
         moves_frame.pack(pady=20)
         
-        rock_btn = ModernButton(moves_frame, "🪨 Rock", 
-                               lambda: self.play_move("Rock"),
-                               width=140, height=100,
-                               bg_color=self.theme["danger"], 
-                               hover_color=self.theme["danger_hover"])
+        rock_btn = self.make_button(moves_frame, "🪨 Rock", 
+                                   lambda: self.play_move("Rock"),
+                                   width=140, height=100,
+                                   role="danger")
         rock_btn.grid(row=0, column=0, padx=10)
         
-        paper_btn = ModernButton(moves_frame, "📄 Paper", 
-                                lambda: self.play_move("Paper"),
-                                width=140, height=100,
-                                bg_color=self.theme["primary"], 
-                                hover_color=self.theme["primary_hover"])
+        paper_btn = self.make_button(moves_frame, "📄 Paper", 
+                                    lambda: self.play_move("Paper"),
+                                    width=140, height=100,
+                                    role="primary")
         paper_btn.grid(row=0, column=1, padx=10)
         
-        scissors_btn = ModernButton(moves_frame, "✂️ Scissors", 
-                                   lambda: self.play_move("Scissors"),
-                                   width=140, height=100,
-                                   bg_color=self.theme["success"], 
-                                   hover_color=self.theme["success_hover"])
+        scissors_btn = self.make_button(moves_frame, "✂️ Scissors", 
+                                       lambda: self.play_move("Scissors"),
+                                       width=140, height=100,
+                                       role="success")
         scissors_btn.grid(row=0, column=2, padx=10)
         
         # Control buttons
-        control_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        control_frame = self.themed(tk.Frame(screen), bg="bg")
         control_frame.pack(pady=30)
         
-        reset_btn = ModernButton(control_frame, "Reset Scores", 
-                                self.reset_game,
-                                width=150, height=40,
-                                bg_color=self.theme["warning"], 
-                                hover_color=self.theme["warning_hover"])
+        reset_btn = self.make_button(control_frame, "Reset Scores", 
+                                    self.reset_game,
+                                    width=150, height=40,
+                                    role="warning")
         reset_btn.grid(row=0, column=0, padx=10)
         
-        back_btn = ModernButton(control_frame, "Back to Menu", 
-                               self.show_main_menu,
-                               width=150, height=40,
-                               bg_color=self.theme["gray"], 
-                               hover_color=self.theme["gray_hover"])
+        back_btn = self.make_button(control_frame, "Back to Menu", 
+                                   self.show_main_menu,
+                                   width=150, height=40,
+                                   role="gray")
         back_btn.grid(row=0, column=1, padx=10)
     
     def play_move(self, player_move):
@@ -333,237 +621,424 @@ class GameUI:
         
         # Update result label with color
         if result == "player1":
-            self.result_label.config(text=message, fg=self.theme["success"])
+            role = "success"
         elif result == "player2":
-            self.result_label.config(text=message, fg=self.theme["danger"])
+            role = "danger"
         else:
-            self.result_label.config(text=message, fg=self.theme["warning"])
+            role = "warning"
+        self.result_label.config(text=message, **self.theme_colors(self.result_label, fg=role))
         
         # Update scores
         player_score, computer_score, rounds = self.game_logic.get_scores()
         self.score_label.config(text=f"Score: {player_score} - {computer_score}")
         self.rounds_label.config(text=f"Rounds Played: {rounds}")
+        self.update_lifetime_label()
     
     def reset_game(self):
         """Reset the game scores"""
         self.game_logic.reset_scores()
+        if self.store:
+            # Read once per session; play_move adds the current scores on top
+            self.lifetime_base = self.store.lifetime_stats()
         player_score, computer_score, rounds = self.game_logic.get_scores()
         self.score_label.config(text=f"Score: {player_score} - {computer_score}")
         self.rounds_label.config(text=f"Rounds Played: {rounds}")
-        self.result_label.config(text="Choose your move!", fg=self.theme["text_secondary"])
+        self.update_lifetime_label()
+        self.result_label.config(text="Choose your move!",
+                                 **self.theme_colors(self.result_label, fg="text_secondary"))
+    
+    def update_lifetime_label(self):
+        """Show lifetime rounds and win rate, including the current session"""
+        if self.lifetime_base is None:
+            return
+        wins, _, rounds = self.game_logic.get_scores()
+        rounds += self.lifetime_base["rounds"]
+        wins += self.lifetime_base["wins"]
+        win_rate = wins / rounds if rounds else 0.0
+        self.lifetime_label.config(text=f"Lifetime: {rounds} rounds · {win_rate:.0%} wins")
     
     def show_wifi_menu(self):
         """Display Wi-Fi multiplayer menu"""
-        self.clear_screen()
-        self.current_screen = "wifi_menu"
-        self.root.configure(bg=self.theme["bg"])
-        
-        # Theme toggle
-        self.create_theme_toggle(self.root)
+        self.enter_screen("wifi_menu", self.build_wifi_menu)
         
+        # Start scanning interfaces now so the host screen shows them instantly
+        from netinfo import get_interface_cache
+        get_interface_cache().addresses()
+    
+    def build_wifi_menu(self, screen):
+        """Create the Wi-Fi menu widgets"""
         # Title
-        title_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        title_frame = self.themed(tk.Frame(screen), bg="bg")
         title_frame.pack(pady=30)
         
-        title = tk.Label(title_frame, text="📡 Wi-Fi Multiplayer", 
-                        font=("Helvetica", 24, "bold"), 
-                        fg=self.theme["success"], bg=self.theme["bg"])
+        title = self.themed(tk.Label(title_frame, text="📡 Wi-Fi Multiplayer", 
+                                    font=("Helvetica", 24, "bold")), fg="success", bg="bg")
         title.pack()
         
-        subtitle = tk.Label(title_frame, text="Connect via local network", 
-                           font=("Helvetica", 12), 
-                           fg=self.theme["text_secondary"], bg=self.theme["bg"])
+        subtitle = self.themed(tk.Label(title_frame, text="Connect via local network", 
+                                       font=("Helvetica", 12)), fg="text_secondary", bg="bg")
         subtitle.pack(pady=10)
         
         # Buttons
-        buttons_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        buttons_frame = self.themed(tk.Frame(screen), bg="bg")
         buttons_frame.pack(pady=30)
         
-        host_btn = ModernButton(buttons_frame, "🏠 Host Game", 
-                               self.show_wifi_host,
-                               width=280, height=70,
-                               bg_color=self.theme["success"], 
-                               hover_color=self.theme["success_hover"])
+        host_btn = self.make_button(buttons_frame, "🏠 Host Game", 
+                                   self.show_wifi_host,
+                                   width=280, height=70,
+                                   role="success")
         host_btn.pack(pady=15)
         
-        join_btn = ModernButton(buttons_frame, "🔗 Join Game", 
-                               self.show_wifi_join_input,
-                               width=280, height=70,
-                               bg_color=self.theme["primary"], 
-                               hover_color=self.theme["primary_hover"])
+        join_btn = self.make_button(buttons_frame, "🔗 Join Game", 
+                                   self.show_wifi_join_input,
+                                   width=280, height=70,
+                                   role="primary")
         join_btn.pack(pady=15)
         
-        back_btn = ModernButton(buttons_frame, "⬅️ Back", 
-                               self.show_main_menu,
-                               width=280, height=60,
-                               bg_color=self.theme["gray"], 
-                               hover_color=self.theme["gray_hover"])
+        back_btn = self.make_button(buttons_frame, "⬅️ Back", 
+                                   self.show_main_menu,
+                                   width=280, height=60,
+                                   role="gray")
         back_btn.pack(pady=15)
     
     def show_wifi_host(self):
         """Show Wi-Fi host screen and start server"""
-        self.clear_screen()
-        self.current_screen = "wifi_host"
-        self.root.configure(bg=self.theme["bg"])
         self.is_hosting = True
+        if self.server_socket is None and not self.start_server():
+            return
         
-        # Theme toggle
-        self.create_theme_toggle(self.root)
-        
+        self.enter_screen("wifi_host", self.build_wifi_host)
+        port = self.server_socket.getsockname()[1]
+        self.host_info_label.config(text=self.host_info_text(port))
+        self.reset_label(self.host_status_label, "⏳ Waiting for connection...", "warning")
+    
+    def build_wifi_host(self, screen):
+        """Create the host screen widgets"""
         # Title
-        title = tk.Label(self.root, text="🏠 Hosting Game", 
-                        font=("Helvetica", 22, "bold"), 
-                        fg=self.theme["success"], bg=self.theme["bg"])
+        title = self.themed(tk.Label(screen, text="🏠 Hosting Game", 
+                                    font=("Helvetica", 22, "bold")), fg="success", bg="bg")
         title.pack(pady=20)
         
         # Info frame
-        info_frame = tk.Frame(self.root, bg=self.theme["secondary_bg"], padx=20, pady=20)
+        info_frame = self.themed(tk.Frame(screen, padx=20, pady=20), bg="secondary_bg")
         info_frame.pack(pady=10, padx=30, fill=tk.X)
         
-        local_ip = get_local_ip()
-        port = 50007
-        
-        info_text = f"📍 Your IP Address: {local_ip}\n🔌 Port: {port}\n\n" \
-                   f"Share this information with your friend!\n" \
-                   f"Waiting for player to connect..."
-        
-        self.host_info_label = tk.Label(info_frame, text=info_text, 
-                                       font=("Helvetica", 11), 
-                                       fg=self.theme["text"], 
-                                       bg=self.theme["secondary_bg"],
-                                       justify=tk.LEFT)
+        self.host_info_label = self.themed(tk.Label(info_frame, text="", 
+                                                   font=("Helvetica", 11),
+                                                   justify=tk.LEFT), fg="text", bg="secondary_bg")
         self.host_info_label.pack()
         
         # Status label
-        self.host_status_label = tk.Label(self.root, text="⏳ Waiting for connection...", 
-                                         font=("Helvetica", 12, "bold"), 
-                                         fg=self.theme["warning"], bg=self.theme["bg"])
+        self.host_status_label = self.themed(tk.Label(screen, text="⏳ Waiting for connection...", 
+                                                     font=("Helvetica", 12, "bold")),
+                                             fg="warning", bg="bg")
         self.host_status_label.pack(pady=20)
         
         # Cancel button
-        cancel_btn = ModernButton(self.root, "Cancel", 
-                                 self.stop_hosting,
-                                 width=200, height=50,
-                                 bg_color=self.theme["danger"], 
-                                 hover_color=self.theme["danger_hover"])
+        cancel_btn = self.make_button(screen, "Cancel", 
+                                     self.stop_hosting,
+                                     width=200, height=50,
+                                     role="danger")
         cancel_btn.pack(pady=20)
+    
+    def host_info_text(self, port):
+        """Connection details shown on the host screen"""
+        from utils import get_local_ips
+        
+        local_ips = get_local_ips()
+        if len(local_ips) == 1:
+            ip_text = f"📍 Your IP Address: {local_ips[0]}"
+        else:
+            ip_text = "📍 Your IP Addresses:\n" + "\n".join(f"     {ip}" for ip in local_ips)
+        
+        return f"{ip_text}\n🔌 Port: {port}\n\n" \
+               f"Friends on your network will see this game in their list,\n" \
+               f"or share this information with them.\n" \
+               f"Waiting for player to connect..."
+    
+    def start_server(self):
+        """
+        Open the listening socket and accept the guest on the network loop
+        
+        Returns:
+            True if the server is listening
+        """
+        import socket
+        
+        try:
+            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                server_socket.bind(('0.0.0.0', DEFAULT_PORT))
+            except OSError:
+                # Another game owns the default port; guests find us via the beacon
+                server_socket.bind(('0.0.0.0', 0))
+            server_socket.listen(1)
+        except OSError as e:
+            messagebox.showerror("Server Error", str(e))
+            self.show_wifi_menu()
+            return False
         
-        # Start server in background
+        self.server_socket = server_socket
         self.multiplayer_running = True
-        self.multiplayer_thread = threading.Thread(target=self.run_server, daemon=True)
-        self.multiplayer_thread.start()
+        self.get_network().listen(server_socket, self.on_guest_connected)
+        self.start_advertising(server_socket.getsockname()[1])
+        return True
+    
+    def on_guest_connected(self, connection, address):
+        """Start the game with the guest that just connected"""
+        from framing import MessageStream
+        from match_engine import MatchEngine
+        
+        if not self.multiplayer_running or self.connection is not None:
+            # Hosting was cancelled, or the game already has its guest
+            connection.close()
+            return
+        
+        self.get_network().remove_reader(self.server_socket)
+        self.stop_advertising()
+        self.connection = connection
+        self.stream = MessageStream(connection)
+        self.keep_alive(self.stream)
+        self.match_engine = MatchEngine()
+        
+        # Update UI
+        if self.current_screen == "wifi_host":
+            self.dispatcher.configure(self.host_status_label,
+                                      text=f"✅ Connected to {address[0]}",
+                                      **self.theme_colors(self.host_status_label, fg="success"))
+        
+        # Send handshake and open the first round
+        self.stream.offer_codecs("host")
+        self.prompt_round()
+        self.watch_connection()
+        
+        # Wait a moment then show game screen
+        self.root.after(1000, self.show_multiplayer_game)
     
-    def run_server(self):
-        """Run the Wi-Fi server"""
+    def start_advertising(self, port):
+        """Broadcast LAN beacons for the hosted game from the network loop"""
+        from discovery import BEACON_INTERVAL, BeaconBroadcaster
+        
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.bind(('0.0.0.0', 50007))
-            self.server_socket.listen(1)
-            
-            self.connection, addr = self.server_socket.accept()
-            
-            # Update UI
-            self.root.after(0, lambda: self.host_status_label.config(
-                text=f"✅ Connected to {addr[0]}", fg=self.theme["success"]))
-            
-            # Send handshake
-            handshake = create_message("handshake", player="host", version="1.0")
-            self.connection.sendall((handshake + "\n").encode())
-            
-            # Wait a moment then show game screen
-            self.root.after(1000, self.show_multiplayer_game)
-            
-        except Exception as e:
-            if self.multiplayer_running:
-                self.root.after(0, lambda: messagebox.showerror("Server Error", str(e)))
-                self.root.after(0, self.show_wifi_menu)
+            beacon = BeaconBroadcaster(port, slots=1)
+        except OSError as e:
+            print(f"⚠️ LAN discovery unavailable: {e}")
+            return
+        self.beacon = beacon
+        self.beacon_timer = self.get_network().call_every(BEACON_INTERVAL, beacon.send)
     
-    def stop_hosting(self):
-        """Stop hosting the game"""
+    def stop_advertising(self):
+        """Stop broadcasting beacons (tells guests the game is gone)"""
+        beacon, self.beacon = self.beacon, None
+        if beacon:
+            self.beacon_timer.cancel()
+            # On the loop thread, so the goodbye beacon follows the last regular one
+            self.network.call_soon(beacon.stop)
+    
+    def close_session(self, notify=True):
+        """
+        Close the current game's sockets
+        
+        Args:
+            notify: Tell the opponent we are leaving
+        """
         self.multiplayer_running = False
-        if self.connection:
-            try:
-                disconnect_msg = create_message("disconnect")
-                self.connection.sendall((disconnect_msg + "\n").encode())
-                self.connection.close()
-            except:
-                pass
-        if self.server_socket:
+        self.awaiting_handshake = False
+        self.stop_advertising()
+        
+        if notify and self.stream and not self.stream.closed:
             try:
-                self.server_socket.close()
-            except:
+                self.stream.send_message("disconnect")
+            except OSError:
                 pass
+        
+        if self.stream is not None:
+            self.heartbeat.remove(self.stream)
+        for sock in (self.connection, self.server_socket):
+            if sock is not None:
+                self.network.discard(sock)
+        self.connection = self.client_socket = self.server_socket = self.stream = None
+    
+    def stop_hosting(self):
+        """Stop hosting the game"""
+        self.close_session()
         self.show_wifi_menu()
     
     def show_wifi_join_input(self):
         """Show input screen for joining a game"""
-        self.clear_screen()
-        self.current_screen = "wifi_join_input"
-        self.root.configure(bg=self.theme["bg"])
-        
-        # Theme toggle
-        self.create_theme_toggle(self.root)
-        
+        self.enter_screen("wifi_join_input", self.build_wifi_join_input)
+        self.reset_label(self.join_status_label, "", "text_secondary")
+        self.start_discovery()
+    
+    def build_wifi_join_input(self, screen):
+        """Create the join screen widgets"""
         # Title
-        title = tk.Label(self.root, text="🔗 Join Game", 
-                        font=("Helvetica", 22, "bold"), 
-                        fg=self.theme["primary"], bg=self.theme["bg"])
-        title.pack(pady=30)
+        title = self.themed(tk.Label(screen, text="🔗 Join Game", 
+                                    font=("Helvetica", 22, "bold")), fg="primary", bg="bg")
+        title.pack(pady=(10, 15))
+        
+        # Games found on the local network
+        games_frame = self.themed(tk.Frame(screen, padx=30, pady=15), bg="secondary_bg")
+        games_frame.pack(pady=(0, 10), padx=40, fill=tk.X)
+        
+        games_label = self.themed(tk.Label(games_frame, text="🔎 Games on your network:", 
+                                          font=("Helvetica", 12)), fg="text", bg="secondary_bg")
+        games_label.pack(anchor="w", pady=(0, 5))
+        
+        self.games_listbox = self.themed(tk.Listbox(games_frame, font=("Helvetica", 11), height=4,
+                                                    relief=tk.FLAT, highlightthickness=0,
+                                                    activestyle="none"),
+                                         bg="bg", fg="text", selectbackground="primary")
+        self.games_listbox.pack(fill=tk.X)
+        self.games_listbox.bind("<<ListboxSelect>>", self.select_discovered_game)
+        self.games_listbox.bind("<Double-Button-1>", lambda event: self.connect_to_host())
         
         # Input frame
-        input_frame = tk.Frame(self.root, bg=self.theme["secondary_bg"], padx=30, pady=30)
-        input_frame.pack(pady=20, padx=40, fill=tk.X)
+        input_frame = self.themed(tk.Frame(screen, padx=30, pady=20), bg="secondary_bg")
+        input_frame.pack(pady=10, padx=40, fill=tk.X)
         
         # IP input
-        ip_label = tk.Label(input_frame, text="Host IP Address:", 
-                           font=("Helvetica", 12), 
-                           fg=self.theme["text"], bg=self.theme["secondary_bg"])
+        ip_label = self.themed(tk.Label(input_frame, text="Host IP Address:", 
+                                       font=("Helvetica", 12)), fg="text", bg="secondary_bg")
         ip_label.pack(anchor="w", pady=(0, 5))
         
-        self.ip_entry = tk.Entry(input_frame, font=("Helvetica", 12), 
-                                width=30, bg=self.theme["bg"], 
-                                fg=self.theme["text"])
+        self.ip_entry = self.themed(tk.Entry(input_frame, font=("Helvetica", 12), 
+                                            width=30), bg="bg", fg="text")
         self.ip_entry.pack(pady=(0, 15))
         self.ip_entry.insert(0, "192.168.1.100")  # Placeholder
         
         # Port input
-        port_label = tk.Label(input_frame, text="Port (default: 50007):", 
-                             font=("Helvetica", 12), 
-                             fg=self.theme["text"], bg=self.theme["secondary_bg"])
+        port_label = self.themed(tk.Label(input_frame, text=f"Port (default: {DEFAULT_PORT}):", 
+                                         font=("Helvetica", 12)), fg="text", bg="secondary_bg")
         port_label.pack(anchor="w", pady=(0, 5))
         
-        self.port_entry = tk.Entry(input_frame, font=("Helvetica", 12), 
-                                  width=30, bg=self.theme["bg"], 
-                                  fg=self.theme["text"])
+        self.port_entry = self.themed(tk.Entry(input_frame, font=("Helvetica", 12), 
+                                              width=30), bg="bg", fg="text")
         self.port_entry.pack()
-        self.port_entry.insert(0, "50007")
+        self.port_entry.insert(0, str(DEFAULT_PORT))
         
         # Status label
-        self.join_status_label = tk.Label(self.root, text="", 
-                                         font=("Helvetica", 11), 
-                                         fg=self.theme["text_secondary"], 
-                                         bg=self.theme["bg"])
+        self.join_status_label = self.themed(tk.Label(screen, text="", 
+                                                     font=("Helvetica", 11)),
+                                             fg="text_secondary", bg="bg")
         self.join_status_label.pack(pady=10)
         
         # Buttons
-        button_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        button_frame = self.themed(tk.Frame(screen), bg="bg")
         button_frame.pack(pady=20)
         
-        connect_btn = ModernButton(button_frame, "Connect", 
-                                  self.connect_to_host,
-                                  width=150, height=50,
-                                  bg_color=self.theme["success"], 
-                                  hover_color=self.theme["success_hover"])
+        connect_btn = self.make_button(button_frame, "Connect", 
+                                      self.connect_to_host,
+                                      width=150, height=50,
+                                      role="success")
         connect_btn.grid(row=0, column=0, padx=10)
         
-        back_btn = ModernButton(button_frame, "Back", 
-                               self.show_wifi_menu,
-                               width=150, height=50,
-                               bg_color=self.theme["gray"], 
-                               hover_color=self.theme["gray_hover"])
+        back_btn = self.make_button(button_frame, "Back", 
+                                   self.show_wifi_menu,
+                                   width=150, height=50,
+                                   role="gray")
         back_btn.grid(row=0, column=1, padx=10)
     
+    def start_discovery(self):
+        """Listen for LAN beacons on the network loop and fill the games list"""
+        from discovery import BEACON_INTERVAL, BeaconListener
+        
+        # The list is kept between visits, so start it over from what is known
+        self.games_listbox.delete(0, tk.END)
+        self.discovered_keys = []
+        
+        if self.discovery_listener is None:
+            try:
+                # The GUI guest only speaks the lockstep protocol
+                listener = BeaconListener(modes=("lockstep",))
+            except OSError:
+                self.games_listbox.insert(tk.END, "Discovery unavailable, enter the IP below")
+                return
+            self.discovery_listener = listener
+            network = self.get_network()
+            
+            def poll(always=False):
+                changes = listener.poll()
+                if changes or always:
+                    network.post(self.apply_discovery_changes, listener, changes)
+            
+            network.add_reader(listener, poll)
+            # The timer expires silent hosts and notices when the screen is left
+            self.discovery_timer = network.call_every(BEACON_INTERVAL, poll, True)
+        
+        for game in list(self.discovered_games.values()):
+            self.show_discovered_game("added", game)
+    
+    def apply_discovery_changes(self, listener, changes):
+        """Apply beacon changes to the list; stops once the join screen is left"""
+        if listener is not self.discovery_listener:
+            return
+        if self.current_screen != "wifi_join_input":
+            self.stop_discovery()
+            return
+        
+        for change, game in changes:
+            self.show_discovered_game(change, game)
+    
+    def stop_discovery(self):
+        """Close the beacon listener"""
+        listener, self.discovery_listener = self.discovery_listener, None
+        if listener:
+            self.discovery_timer.cancel()
+            self.network.discard(listener)
+        self.discovery_timer = None
+        self.discovered_games = {}
+        self.discovered_keys = []
+    
+    def show_discovered_game(self, change, game):
+        """
+        Update one row of the games list in place
+        
+        Args:
+            change: "added", "updated" or "removed"
+            game: Game dictionary from the beacon listener
+        """
+        from discovery import PROTOCOL_VERSION
+        
+        key = (game["address"], game["port"])
+        if change == "removed":
+            self.discovered_games.pop(key, None)
+        else:
+            self.discovered_games[key] = game
+        
+        if key in self.discovered_keys:
+            index = self.discovered_keys.index(key)
+            self.games_listbox.delete(index)
+            if change == "removed":
+                self.discovered_keys.pop(index)
+                return
+        elif change == "removed":
+            return
+        else:
+            index = len(self.discovered_keys)
+            self.discovered_keys.append(key)
+        
+        text = f"🎮 {game['name']}  ({game['address']}:{game['port']})"
+        if game["version"] != PROTOCOL_VERSION:
+            text += f"  ⚠️ version {game['version']}"
+        elif not game["compatible"]:
+            text += f"  ⚠️ {game['mode']} mode"
+        elif game["slots"] == 0:
+            text += "  full"
+        self.games_listbox.insert(index, text)
+    
+    def select_discovered_game(self, event=None):
+        """Copy the selected game's address into the input fields"""
+        selection = self.games_listbox.curselection()
+        if not selection or selection[0] >= len(self.discovered_keys):
+            return
+        address, port = self.discovered_keys[selection[0]]
+        self.ip_entry.delete(0, tk.END)
+        self.ip_entry.insert(0, address)
+        self.port_entry.delete(0, tk.END)
+        self.port_entry.insert(0, str(port))
+    
     def connect_to_host(self):
         """Connect to the host"""
         host_ip = self.ip_entry.get().strip()
@@ -573,115 +1048,130 @@ class GameUI:
             messagebox.showerror("Invalid Port", "Please enter a valid port number")
             return
         
-        self.join_status_label.config(text=f"⏳ Connecting to {host_ip}:{port}...", 
-                                     fg=self.theme["warning"])
-        self.root.update()
+        self.dispatcher.configure(self.join_status_label,
+                                  text=f"⏳ Connecting to {host_ip}:{port}...",
+                                  **self.theme_colors(self.join_status_label, fg="warning"))
         
-        # Connect in background
-        threading.Thread(target=self.run_client, args=(host_ip, port), daemon=True).start()
+        self.is_hosting = False
+        self.get_network().connect((host_ip, port), self.on_host_connected,
+                                   self.on_connect_failed)
     
-    def run_client(self, host, port):
-        """Run the Wi-Fi client"""
-        try:
-            self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.client_socket.connect((host, port))
-            self.connection = self.client_socket
-            self.multiplayer_running = True
-            
-            # Receive handshake
-            data = self.client_socket.recv(1024).decode().strip()
-            msg = parse_message(data)
-            
-            if msg and msg.get("type") == "handshake":
-                self.root.after(0, lambda: self.join_status_label.config(
-                    text="✅ Connected successfully!", fg=self.theme["success"]))
-                self.root.after(1000, self.show_multiplayer_game)
-            else:
-                raise Exception("Invalid handshake")
-                
-        except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Connection Error", 
-                                                            f"Failed to connect: {str(e)}"))
-            self.root.after(0, lambda: self.join_status_label.config(
-                text="❌ Connection failed", fg=self.theme["danger"]))
+    def on_host_connected(self, sock):
+        """Wait for the host's handshake on a new connection"""
+        from framing import MessageStream
+        
+        if self.current_screen != "wifi_join_input":
+            # The player left the join screen while connecting
+            sock.close()
+            return
+        
+        from heartbeat import HANDSHAKE_TIMEOUT
+        
+        self.client_socket = self.connection = sock
+        self.stream = MessageStream(sock)
+        self.keep_alive(self.stream)
+        self.multiplayer_running = True
+        self.awaiting_handshake = True
+        self.watch_connection()
+        
+        stream = self.stream
+        self.root.after(int(HANDSHAKE_TIMEOUT * 1000), lambda: self.check_handshake(stream))
+    
+    def check_handshake(self, stream):
+        """Give up on a host that accepted the connection but never sent its handshake"""
+        if stream is self.stream and self.awaiting_handshake:
+            self.close_session(notify=False)
+            self.on_connect_failed(TimeoutError("No handshake from host"))
+    
+    def on_connect_failed(self, error):
+        """Report a connection that could not be set up"""
+        messagebox.showerror("Connection Error", f"Failed to connect: {str(error)}")
+        if self.current_screen == "wifi_join_input":
+            self.dispatcher.configure(self.join_status_label, text="❌ Connection failed",
+                                      **self.theme_colors(self.join_status_label, fg="danger"))
+    
+    def watch_connection(self):
+        """Deliver the current stream's messages through the network loop"""
+        stream = self.stream
+        self.get_network().watch_stream(
+            stream,
+            lambda msg: self.handle_network_message(stream, msg),
+            lambda: self.on_connection_closed(stream))
     
     def show_multiplayer_game(self):
-        """Show the multiplayer game screen"""
-        self.clear_screen()
-        self.current_screen = "multiplayer_game"
-        self.root.configure(bg=self.theme["bg"])
+        """Show the multiplayer game screen for a new match"""
+        self.enter_screen("multiplayer_game", self.build_multiplayer_game)
+        import metrics
+        
         self.player_score = 0
         self.opponent_score = 0
+        self.waiting_for_opponent = False
+        self.round_timer = metrics.round_timer()
+        self.round_timer.start()
         
-        # Theme toggle
-        self.create_theme_toggle(self.root)
-        
+        role = "Host" if self.is_hosting else "Guest"
+        self.mp_title_label.config(text=f"Multiplayer Mode ({role})")
+        self.reset_label(self.mp_score_label, "Score: 0 - 0", "text")
+        self.reset_label(self.mp_result_label, "Choose your move!", "text_secondary")
+    
+    def build_multiplayer_game(self, screen):
+        """Create the multiplayer game widgets"""
         # Header
-        header_frame = tk.Frame(self.root, bg=self.theme["secondary_bg"], height=70)
+        header_frame = self.themed(tk.Frame(screen, height=70), bg="secondary_bg")
         header_frame.pack(fill=tk.X)
         header_frame.pack_propagate(False)
         
-        role = "Host" if self.is_hosting else "Guest"
-        title = tk.Label(header_frame, text=f"Multiplayer Mode ({role})", 
-                        font=("Helvetica", 18, "bold"), 
-                        fg=self.theme["success"], bg=self.theme["secondary_bg"])
-        title.pack(pady=20)
+        self.mp_title_label = self.themed(tk.Label(header_frame, text="Multiplayer Mode", 
+                                                   font=("Helvetica", 18, "bold")),
+                                          fg="success", bg="secondary_bg")
+        self.mp_title_label.pack(pady=20)
         
         # Score frame
-        score_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        score_frame = self.themed(tk.Frame(screen), bg="bg")
         score_frame.pack(pady=15)
         
-        self.mp_score_label = tk.Label(score_frame, text="Score: 0 - 0", 
-                                       font=("Helvetica", 16, "bold"), 
-                                       fg=self.theme["text"], bg=self.theme["bg"])
+        self.mp_score_label = self.themed(tk.Label(score_frame, text="Score: 0 - 0", 
+                                                   font=("Helvetica", 16, "bold")),
+                                          fg="text", bg="bg")
         self.mp_score_label.pack()
         
         # Result display
-        self.mp_result_label = tk.Label(self.root, text="Choose your move!", 
-                                       font=("Helvetica", 13), 
-                                       fg=self.theme["text_secondary"], 
-                                       bg=self.theme["bg"],
-                                       wraplength=450)
+        self.mp_result_label = self.themed(tk.Label(screen, text="Choose your move!", 
+                                                   font=("Helvetica", 13),
+                                                   wraplength=450), fg="text_secondary", bg="bg")
         self.mp_result_label.pack(pady=15)
         
         # Move buttons
-        moves_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        moves_frame = self.themed(tk.Frame(screen), bg="bg")
         moves_frame.pack(pady=15)
         
-        self.mp_rock_btn = ModernButton(moves_frame, "🪨 Rock", 
-                                        lambda: self.play_multiplayer_move("Rock"),
-                                        width=140, height=100,
-                                        bg_color=self.theme["danger"], 
-                                        hover_color=self.theme["danger_hover"])
+        self.mp_rock_btn = self.make_button(moves_frame, "🪨 Rock", 
+                                            lambda: self.play_multiplayer_move("Rock"),
+                                            width=140, height=100,
+                                            role="danger")
         self.mp_rock_btn.grid(row=0, column=0, padx=10)
         
-        self.mp_paper_btn = ModernButton(moves_frame, "📄 Paper", 
-                                         lambda: self.play_multiplayer_move("Paper"),
-                                         width=140, height=100,
-                                         bg_color=self.theme["primary"], 
-                                         hover_color=self.theme["primary_hover"])
+        self.mp_paper_btn = self.make_button(moves_frame, "📄 Paper", 
+                                             lambda: self.play_multiplayer_move("Paper"),
+                                             width=140, height=100,
+                                             role="primary")
         self.mp_paper_btn.grid(row=0, column=1, padx=10)
         
-        self.mp_scissors_btn = ModernButton(moves_frame, "✂️ Scissors", 
-                                            lambda: self.play_multiplayer_move("Scissors"),
-                                            width=140, height=100,
-                                            bg_color=self.theme["success"], 
-                                            hover_color=self.theme["success_hover"])
+        self.mp_scissors_btn = self.make_button(moves_frame, "✂️ Scissors", 
+                                                lambda: self.play_multiplayer_move("Scissors"),
+                                                width=140, height=100,
+                                                role="success")
         self.mp_scissors_btn.grid(row=0, column=2, padx=10)
         
         # Control buttons
-        control_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        control_frame = self.themed(tk.Frame(screen), bg="bg")
         control_frame.pack(pady=20)
         
-        disconnect_btn = ModernButton(control_frame, "Disconnect", 
-                                     self.disconnect_multiplayer,
-                                     width=200, height=45,
-                                     bg_color=self.theme["danger"], 
-                                     hover_color=self.theme["danger_hover"])
+        disconnect_btn = self.make_button(control_frame, "Disconnect", 
+                                         self.disconnect_multiplayer,
+                                         width=200, height=45,
+                                         role="danger")
         disconnect_btn.pack()
-        
-        # Start listening for opponent moves
-        threading.Thread(target=self.listen_for_moves, daemon=True).start()
     
     def play_multiplayer_move(self, move):
         """Handle multiplayer move"""
@@ -690,111 +1180,184 @@ class GameUI:
             return
         
         self.waiting_for_opponent = True
-        self.mp_result_label.config(text=f"You chose {move}! Waiting for opponent...", 
-                                   fg=self.theme["warning"])
+        self.round_timer.moved()
+        self.dispatcher.configure(self.mp_result_label,
+                                  text=f"You chose {move}! Waiting for opponent...",
+                                  **self.theme_colors(self.mp_result_label, fg="warning"))
+        
+        # Send move (the host resolves rounds itself, the guest only gets results)
+        from match_engine import GUEST, HOST
         
-        # Send move
         try:
-            move_msg = create_message("move", player="player", move=move)
-            self.connection.sendall((move_msg + "\n").encode())
+            if self.is_hosting:
+                result = self.match_engine.submit(HOST, move)
+                if result is not None:
+                    self.publish_result(result)
+            else:
+                self.stream.send_message("move", player=GUEST, move=move)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to send move: {str(e)}")
             self.waiting_for_opponent = False
     
-    def listen_for_moves(self):
-        """Listen for opponent moves"""
-        while self.multiplayer_running:
+    def handle_network_message(self, stream, msg):
+        """
+        Handle one message from the opponent (runs on the Tk thread)
+        
+        Args:
+            stream: Stream the message came from
+            msg: Parsed message
+        """
+        from match_engine import GUEST
+        
+        if stream is not self.stream:
+            # Left over from a session that has been closed
+            return
+        
+        msg_type = msg.get("type")
+        
+        if msg_type == "handshake":
+            mode = msg.get("mode", "lockstep")
+            if self.awaiting_handshake and mode != "lockstep":
+                # Concurrent hosts expect round numbers and commitments we don't send
+                self.close_session()
+                self.on_connect_failed(Exception(f"The host plays in {mode} mode, "
+                                                 f"which this app cannot join"))
+            elif self.awaiting_handshake:
+                self.awaiting_handshake = False
+                self.stream.answer_handshake(msg, "guest")
+                if self.current_screen == "wifi_join_input":
+                    label = self.join_status_label
+                    self.dispatcher.configure(label, text="✅ Connected successfully!",
+                                              **self.theme_colors(label, fg="success"))
+                self.root.after(1000, self.show_multiplayer_game)
+            else:
+                self.stream.accept_codec(msg)
+        
+        elif self.awaiting_handshake:
+            self.close_session(notify=False)
+            self.on_connect_failed(Exception("Invalid handshake"))
+        
+        elif msg_type == "move" and self.is_hosting:
             try:
-                data = self.connection.recv(1024).decode().strip()
-                if not data:
-                    break
-                
-                msg = parse_message(data)
-                if not msg:
-                    continue
-                
-                if msg.get("type") == "move":
-                    opponent_move = msg.get("move")
-                    # Process the round (simplified - in real implementation, host should validate)
-                    self.root.after(0, lambda: self.process_multiplayer_round(opponent_move))
-                
-                elif msg.get("type") == "disconnect":
-                    self.root.after(0, lambda: messagebox.showinfo("Disconnected", 
-                                                                   "Opponent disconnected"))
-                    self.root.after(0, self.show_wifi_menu)
-                    break
-                    
-            except Exception as e:
-                if self.multiplayer_running:
-                    self.root.after(0, lambda: messagebox.showerror("Connection Error", str(e)))
-                break
-    
-    def process_multiplayer_round(self, opponent_move):
-        """Process a multiplayer round"""
-        # This is a simplified version - you'd want the host to be authoritative
-        if not self.waiting_for_opponent:
+                result = self.match_engine.submit(GUEST, msg.get("move"))
+            except ValueError:
+                # Invalid or repeated move from the guest
+                return
+            if result is not None:
+                self.publish_result(result)
+        
+        elif msg_type == "result" and not self.is_hosting:
+            self.show_multiplayer_result(msg)
+        
+        elif msg_type == "stats" and self.is_hosting and self.match_engine:
+            # Answered from running totals, never by walking the history
+            self.stream.send_message("stats", stats=self.match_engine.snapshot_stats())
+        
+        elif msg_type == "disconnect":
+            self.close_session(notify=False)
+            messagebox.showinfo("Disconnected", "Opponent disconnected")
+            self.show_wifi_menu()
+    
+    def on_connection_closed(self, stream):
+        """Handle the opponent's socket closing without a disconnect message"""
+        if stream is not self.stream:
+            return
+        
+        connecting = self.awaiting_handshake
+        self.close_session(notify=False)
+        if connecting:
+            self.on_connect_failed(Exception("Connection closed by host"))
+        else:
+            messagebox.showinfo("Disconnected", "Connection to opponent lost")
+            self.show_wifi_menu()
+    
+    def on_peer_timeout(self, stream):
+        """Handle an opponent that stopped answering pings"""
+        if stream is not self.stream:
+            return
+        
+        self.close_session(notify=False)
+        messagebox.showinfo("Disconnected", "Opponent stopped responding")
+        self.show_wifi_menu()
+    
+    def publish_result(self, result):
+        """
+        Send a resolved round to the guest and show it on the host
+        
+        Args:
+            result: Result message fields from MatchEngine.submit
+        """
+        self.stream.send_message("result", **result)
+        self.prompt_round()
+        self.show_multiplayer_result(result)
+    
+    def prompt_round(self):
+        """Open the next round for the guest (command-line guests wait for this)"""
+        self.stream.send_message("move", **self.match_engine.prompt())
+    
+    def show_multiplayer_result(self, result):
+        """
+        Display a round resolved by the host
+        
+        Args:
+            result: Result message fields (see match_engine.MatchEngine)
+        """
+        if self.current_screen != "multiplayer_game":
             return
         
-        # Get player's last move (stored when they clicked)
-        # For simplicity, we'll show the result
+        from match_engine import GUEST, HOST, RESULT_NAMES
+        
         self.waiting_for_opponent = False
+        self.round_timer.finished()
+        self.round_timer.start()
         
-        # Update result
-        result_text = f"Opponent chose {opponent_move}!"
-        self.mp_result_label.config(text=result_text, fg=self.theme["primary"])
+        if self.is_hosting:
+            side, my_move, their_move = HOST, result["server_move"], result["client_move"]
+            self.player_score, self.opponent_score = result["server_score"], result["client_score"]
+        else:
+            side, my_move, their_move = GUEST, result["client_move"], result["server_move"]
+            self.player_score, self.opponent_score = result["client_score"], result["server_score"]
         
-        # In a full implementation, you'd calculate winner and update scores here
+        # Update result label with color
+        if result["winner"] == RESULT_NAMES[side]:
+            message, role = f"You Win! {my_move} beats {their_move}", "success"
+        elif result["winner"] == "tie":
+            message, role = f"It's a Tie! Both chose {my_move}", "warning"
+        else:
+            message, role = f"You Lose! {their_move} beats {my_move}", "danger"
+        
+        # Only the newest round is painted when results arrive faster than frames
+        self.dispatcher.configure(self.mp_result_label,
+                                  text=f"Round {result['round']}: {message}",
+                                  **self.theme_colors(self.mp_result_label, fg=role))
+        self.dispatcher.configure(self.mp_score_label,
+                                  text=f"Score: {self.player_score} - {self.opponent_score}")
     
     def disconnect_multiplayer(self):
         """Disconnect from multiplayer game"""
-        self.multiplayer_running = False
-        try:
-            if self.connection:
-                disconnect_msg = create_message("disconnect")
-                self.connection.sendall((disconnect_msg + "\n").encode())
-                self.connection.close()
-        except:
-            pass
-        
-        if self.server_socket:
-            try:
-                self.server_socket.close()
-            except:
-                pass
-        
-        if self.client_socket:
-            try:
-                self.client_socket.close()
-            except:
-                pass
-        
+        self.close_session()
         self.show_wifi_menu()
     
     def show_bluetooth_menu(self):
         """Display Bluetooth multiplayer menu"""
-        self.clear_screen()
-        self.current_screen = "bluetooth_menu"
-        self.root.configure(bg=self.theme["bg"])
-        
-        # Theme toggle
-        self.create_theme_toggle(self.root)
-        
+        self.enter_screen("bluetooth_menu", self.build_bluetooth_menu)
+    
+    def build_bluetooth_menu(self, screen):
+        """Create the Bluetooth menu widgets"""
         # Title
-        title_frame = tk.Frame(self.root, bg=self.theme["bg"])
+        title_frame = self.themed(tk.Frame(screen), bg="bg")
         title_frame.pack(pady=30)
         
-        title = tk.Label(title_frame, text="📱 Bluetooth Multiplayer", 
-                        font=("Helvetica", 24, "bold"), 
-                        fg=self.theme["warning"], bg=self.theme["bg"])
+        title = self.themed(tk.Label(title_frame, text="📱 Bluetooth Multiplayer", 
+                                    font=("Helvetica", 24, "bold")), fg="warning", bg="bg")
         title.pack()
         
-        subtitle = tk.Label(title_frame, text="Connect via Bluetooth", 
-                           font=("Helvetica", 12), 
-                           fg=self.theme["text_secondary"], bg=self.theme["bg"])
+        subtitle = self.themed(tk.Label(title_frame, text="Connect via Bluetooth", 
+                                       font=("Helvetica", 12)), fg="text_secondary", bg="bg")
         subtitle.pack(pady=10)
         
         # Info message
-        info_frame = tk.Frame(self.root, bg=self.theme["secondary_bg"], padx=25, pady=25)
+        info_frame = self.themed(tk.Frame(screen, padx=25, pady=25), bg="secondary_bg")
         info_frame.pack(pady=20, padx=40, fill=tk.BOTH, expand=True)
         
         info_text = ("📋 Bluetooth Multiplayer Requirements:\n\n"
@@ -810,19 +1373,16 @@ class GameUI:
                     "For now, please use Wi-Fi multiplayer\n"
                     "for the best experience!")
         
-        info_label = tk.Label(info_frame, text=info_text, 
-                             font=("Helvetica", 11), 
-                             fg=self.theme["text"], 
-                             bg=self.theme["secondary_bg"],
-                             justify=tk.LEFT)
+        info_label = self.themed(tk.Label(info_frame, text=info_text, 
+                                         font=("Helvetica", 11),
+                                         justify=tk.LEFT), fg="text", bg="secondary_bg")
         info_label.pack()
         
         # Back button
-        back_btn = ModernButton(self.root, "⬅️ Back to Menu", 
-                               self.show_main_menu,
-                               width=250, height=60,
-                               bg_color=self.theme["gray"], 
-                               hover_color=self.theme["gray_hover"])
+        back_btn = self.make_button(screen, "⬅️ Back to Menu", 
+                                   self.show_main_menu,
+                                   width=250, height=60,
+                                   role="gray")
         back_btn.pack(pady=20)
 
 
@@ -830,6 +1390,7 @@ def create_app():
     """Create and return the main application"""
     root = tk.Tk()
     app = GameUI(root)
+    root.protocol("WM_DELETE_WINDOW", app.shutdown)
     return root
 
 
@@ -0,0 +1,80 @@
+"""
+Coalesced widget updates for the Rock-Paper-Scissors GUI
+State changes are recorded per widget and painted at most once per frame,
+so a burst of network messages costs one redraw instead of one per message
+"""
+
+import tkinter as tk
+from typing import Callable, Dict
+
+# Milliseconds between redraws while updates are pending (about 30 fps)
+FRAME_INTERVAL_MS = 33
+
+
+class UIDispatcher:
+    """
+    Batches widget configuration and applies only the latest state
+    
+    configure() only records the options; the first pending update
+    schedules a flush one frame later, and the flush calls config() once
+    per widget with the newest value of every option. Nothing is scheduled
+    while there is nothing to paint.
+    
+    Must be used from the Tk thread: network threads hand their events
+    over through net_loop.EventPump first.
+    """
+    
+    def __init__(self, schedule: Callable[[int, Callable], object],
+                 interval_ms: int = FRAME_INTERVAL_MS):
+        """
+        Args:
+            schedule: root.after-style function, schedule(ms, callback)
+            interval_ms: Minimum time between flushes
+        """
+        self._schedule = schedule
+        self.interval_ms = interval_ms
+        self._pending: Dict[object, dict] = {}
+        self._frame_scheduled = False
+        self.frames = 0
+    
+    def configure(self, widget, **options):
+        """
+        Record new options for a widget, painted on the next frame
+        
+        Args:
+            widget: Any Tk widget (or object with config())
+            **options: Options for widget.config(), later values win
+        """
+        self._pending.setdefault(widget, {}).update(options)
+        if not self._frame_scheduled:
+            self._frame_scheduled = True
+            self._schedule(self.interval_ms, self.flush)
+    
+    def pending(self) -> int:
+        """Number of widgets waiting to be repainted"""
+        return len(self._pending)
+    
+    def flush(self):
+        """Apply every pending update now"""
+        pending, self._pending = self._pending, {}
+        self._frame_scheduled = False
+        if not pending:
+            return
+        self.frames += 1
+        
+        for widget, options in pending.items():
+            try:
+                # Widgets of a screen that has been left are already gone
+                if widget.winfo_exists():
+                    widget.config(**options)
+            except tk.TclError:
+                # Destroyed while the flush was running
+                continue
+    
+    def drop(self, widget):
+        """Forget queued updates for one widget (its state is being reset)"""
+        self._pending.pop(widget, None)
+    
+    def discard(self):
+        """Drop pending updates (the scheduled flush then does nothing)"""
+        self._pending.clear()
@@ -2,28 +2,41 @@
 Utility functions for the Rock-Paper-Scissors game
 """
 
-import socket
 import json
-from typing import Optional
+from typing import List, Optional
 
+from moves import VALID_MOVES
+from netinfo import DEFAULT_TIMEOUT, get_interface_cache
 
-def get_local_ip() -> str:
+
+def get_local_ip(timeout: float = DEFAULT_TIMEOUT) -> str:
     """
     Get the local IP address of the machine
     
+    Served from a cache that is refreshed in the background, so only the
+    first call can wait (at most `timeout` seconds). No outside host is
+    contacted.
+    
+    Args:
+        timeout: Seconds to wait if the first interface scan is still running
+    
     Returns:
-        Local IP address as string
+        Local IP address as string ("127.0.0.1" if none was found)
     """
-    try:
-        # Create a socket to determine local IP
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        # Connect to a public DNS (doesn't actually send data)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
-    except Exception:
-        return "127.0.0.1"
+    return get_interface_cache().primary(timeout)
+
+
+def get_local_ips(timeout: float = DEFAULT_TIMEOUT) -> List[str]:
+    """
+    Get every local IPv4 address, best candidate for hosting first
+    
+    Args:
+        timeout: Seconds to wait if the first interface scan is still running
+    
+    Returns:
+        List of IP addresses as strings
+    """
+    return get_interface_cache().addresses(timeout)
 
 
 def validate_move(move: str) -> bool:
@@ -34,9 +47,9 @@ def validate_move(move: str) -> bool:
         move: The move to validate
         
     Returns:
-        True if valid, False otherwise
+        True if valid, False otherwise (including non-strings from the network)
     """
-    return move in ["Rock", "Paper", "Scissors"]
+    return isinstance(move, str) and move in VALID_MOVES
 
 
 def create_message(msg_type: str, **kwargs) -> str:
@@ -62,12 +75,28 @@ def parse_message(data: str) -> Optional[dict]:
         data: JSON string to parse
         
     Returns:
-        Parsed dictionary or None if invalid
+        Parsed dictionary or None if invalid (including valid JSON that is
+        not an object, such as a list or a number)
     """
     try:
-        return json.loads(data)
+        msg = json.loads(data)
     except json.JSONDecodeError:
         return None
+    return msg if isinstance(msg, dict) else None
+
+
+def truncate_utf8(text: str, limit: int) -> bytes:
+    """
+    Encode text as UTF-8, cut to a byte limit
+    
+    Args:
+        text: Text to encode
+        limit: Maximum number of bytes
+    
+    Returns:
+        At most limit bytes, never ending in a partial multi-byte character
+    """
+    return text.encode("utf-8")[:limit].decode("utf-8", "ignore").encode("utf-8")
 
 
 def format_score(player_score: int, opponent_score: int) -> str:
@@ -0,0 +1,148 @@
+"""
+Unit tests for the asyncio match server
+"""
+
+import asyncio
+import socket
+import unittest
+import sys
+import os
+
+# Add multiplayer and src directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'multiplayer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from async_server import AsyncGameServer
+from utils import create_message, parse_message
+
+
+class TestAsyncGameServer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncGameServer"""
+    
+    async def asyncSetUp(self):
+        self.server = AsyncGameServer('127.0.0.1', 0, verbose=False)
+        await self.server.start()
+    
+    async def asyncTearDown(self):
+        await self.server.stop()
+    
+    async def connect(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        handshake = parse_message((await reader.readline()).decode())
+        self.assertEqual(handshake["type"], "handshake")
+        return reader, writer
+    
+    async def receive(self, reader):
+        line = await asyncio.wait_for(reader.readline(), timeout=5)
+        return parse_message(line.decode()) if line else None
+    
+    @staticmethod
+    def send_move(writer, move):
+        writer.write((create_message("move", player="client", move=move) + "\n").encode())
+    
+    async def test_pairs_clients_and_resolves_round(self):
+        """Test that two clients are paired and both see the result from their side"""
+        reader_a, writer_a = await self.connect()
+        reader_b, writer_b = await self.connect()
+        
+        self.assertEqual((await self.receive(reader_a))["type"], "move")
+        self.assertEqual((await self.receive(reader_b))["type"], "move")
+        
+        self.send_move(writer_a, "Rock")
+        self.send_move(writer_b, "Scissors")
+        
+        result_a = await self.receive(reader_a)
+        result_b = await self.receive(reader_b)
+        self.assertEqual(result_a["winner"], "client")
+        self.assertEqual(result_a["client_score"], 1)
+        self.assertEqual(result_b["winner"], "server")
+        self.assertEqual(result_b["server_move"], "Rock")
+        self.assertEqual(self.server.stats()["rounds"], 1)
+        
+        writer_a.close()
+        writer_b.close()
+    
+    async def test_malformed_move_keeps_match(self):
+        """Test that garbage from one client does not end the match for both"""
+        reader_a, writer_a = await self.connect()
+        reader_b, writer_b = await self.connect()
+        await self.receive(reader_a)
+        await self.receive(reader_b)
+        
+        writer_a.write(b'{"type": "move", "move": []}\n')
+        writer_a.write(b'{"type": "move", "move": {"a": 1}}\n')
+        writer_a.write(b'[1, 2, 3]\n\xff\xfe\n')
+        self.send_move(writer_a, "Paper")
+        self.send_move(writer_b, "Rock")
+        
+        result_a = await self.receive(reader_a)
+        result_b = await self.receive(reader_b)
+        self.assertEqual(result_a["winner"], "client")
+        self.assertEqual(result_b["winner"], "server")
+        self.assertEqual(self.server.stats()["matches"], 1)
+        
+        writer_a.close()
+        writer_b.close()
+    
+    async def test_oversized_line_drops_client(self):
+        """Test that a line over the stream limit closes that client only"""
+        reader_a, writer_a = await self.connect()
+        reader_b, writer_b = await self.connect()
+        await self.receive(reader_b)
+        
+        writer_a.write(b"x" * (128 * 1024) + b"\n")
+        
+        self.assertEqual((await self.receive(reader_b))["type"], "disconnect")
+        self.assertEqual(self.server.stats()["matches"], 0)
+        writer_a.close()
+        writer_b.close()
+    
+    async def test_stalled_client_is_dropped(self):
+        """Test that a client that never reads cannot make the server buffer forever"""
+        reader_a, writer_a = await self.connect()
+        reader_b, writer_b = await self.connect()
+        await self.receive(reader_b)
+        session = self.server.clients[min(self.server.clients)]
+        
+        # Client A never reads, so once the small socket buffer fills up
+        # everything else queues in the transport
+        session.writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        for _ in range(4000):
+            session.send(create_message("move", player="server", round=1, padding="x" * 200))
+            if session.writer.is_closing():
+                break
+        self.assertTrue(session.writer.is_closing())
+        
+        self.assertEqual((await self.receive(reader_b))["type"], "disconnect")
+        writer_a.close()
+        writer_b.close()
+    
+    async def test_opponent_leaving_ends_match(self):
+        """Test that a client is told when its opponent disconnects"""
+        reader_a, writer_a = await self.connect()
+        reader_b, writer_b = await self.connect()
+        await self.receive(reader_b)
+        
+        writer_a.close()
+        
+        self.assertEqual((await self.receive(reader_b))["type"], "disconnect")
+        writer_b.close()
+    
+    async def test_many_concurrent_matches(self):
+        """Test that several matches run independently"""
+        clients = [await self.connect() for _ in range(20)]
+        for reader, _ in clients:
+            await self.receive(reader)
+        
+        for reader, writer in clients:
+            self.send_move(writer, "Paper")
+        results = [await self.receive(reader) for reader, _ in clients]
+        
+        self.assertTrue(all(result["winner"] == "tie" for result in results))
+        self.assertEqual(self.server.stats()["matches"], 10)
+        for _, writer in clients:
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
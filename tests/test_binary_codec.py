@@ -0,0 +1,122 @@
+"""
+Unit tests for the binary message codec
+"""
+
+import socket
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from binary_codec import (CODEC_BINARY, CODEC_JSON, FRAME_SIZES, MOVE,
+                          choose_codec, decode_binary, encode_binary)
+from framing import MessageFramer, MessageStream, UnknownFrame
+from utils import create_message
+
+
+class TestBinaryCodec(unittest.TestCase):
+    """Test cases for encode_binary / decode_binary"""
+    
+    def round_trip(self, msg_type, **fields):
+        frame = encode_binary(msg_type, fields)
+        self.assertIsNotNone(frame)
+        self.assertEqual(len(frame), FRAME_SIZES[frame[0]])
+        self.assertEqual(decode_binary(frame), dict(type=msg_type, **fields))
+    
+    def test_move_round_trip(self):
+        """Test move frames with and without the optional fields"""
+        self.round_trip("move", player="client", move="Scissors", round=7)
+        self.round_trip("move", player="server", move="Rock")
+        self.round_trip("move", player="server", round=3)
+    
+    def test_result_round_trip(self):
+        """Test that a result frame decodes to the JSON-equivalent dict"""
+        self.round_trip("result", winner="tie", server_move="Paper",
+                        client_move="Paper", server_score=4, client_score=5, round=10)
+    
+    def test_control_round_trip(self):
+        """Test disconnect, ping and pong frames"""
+        self.round_trip("disconnect")
+        self.round_trip("ping", ts=12.5)
+        self.round_trip("pong", ts=0.25)
+    
+    def test_fallback_to_json(self):
+        """Test that messages the struct layout cannot hold are rejected"""
+        self.assertIsNone(encode_binary("handshake", {"player": "server"}))
+        self.assertIsNone(encode_binary("move", {"player": "server", "chat": "hi"}))
+        self.assertIsNone(encode_binary("move", {"player": "alice", "move": "Rock"}))
+        self.assertIsNone(encode_binary("move", {"player": "server", "move": "Lizard"}))
+        self.assertIsNone(encode_binary("move", {"player": "server", "round": -1}))
+    
+    def test_choose_codec(self):
+        """Test codec negotiation preferences"""
+        self.assertEqual(choose_codec(["json", "binary"]), CODEC_BINARY)
+        self.assertEqual(choose_codec(["json"]), CODEC_JSON)
+        self.assertEqual(choose_codec(None), CODEC_JSON)
+
+
+class TestMixedFraming(unittest.TestCase):
+    """Test cases for binary frames inside the stream framer"""
+    
+    def test_mixed_json_and_binary(self):
+        """Test that JSON lines and binary frames can be interleaved"""
+        frame = encode_binary("move", {"player": "client", "move": "Rock"})
+        framer = MessageFramer()
+        
+        frames = framer.feed(b'{"type": "handshake"}\n' + frame + b'{"type": "disconnect"}\n')
+        self.assertEqual(frames, [b'{"type": "handshake"}', frame, b'{"type": "disconnect"}'])
+    
+    def test_binary_frame_split_across_segments(self):
+        """Test that a partial binary frame waits for the rest"""
+        frame = encode_binary("result", {"winner": "server", "server_move": "Rock",
+                                         "client_move": "Scissors", "server_score": 1,
+                                         "client_score": 0, "round": 1})
+        framer = MessageFramer()
+        
+        self.assertEqual(framer.feed(frame[:5]), [])
+        self.assertEqual(framer.feed(frame[5:]), [frame])
+        self.assertEqual(framer.pending(), 0)
+    
+    def test_unknown_frame_type(self):
+        """Test that an unknown high-bit type byte is refused"""
+        with self.assertRaises(UnknownFrame):
+            MessageFramer().feed(bytes([0xFF, 0, 0]))
+        self.assertIn(MOVE, FRAME_SIZES)
+
+
+class TestCodecNegotiation(unittest.TestCase):
+    """Test cases for the handshake over a socket pair"""
+    
+    def setUp(self):
+        left, right = socket.socketpair()
+        self.host = MessageStream(left)
+        self.guest = MessageStream(right)
+    
+    def tearDown(self):
+        self.host.close()
+        self.guest.close()
+    
+    def test_both_sides_switch_to_binary(self):
+        """Test that a codec-aware peer upgrades both directions"""
+        self.host.offer_codecs("server")
+        self.assertEqual(self.guest.answer_handshake(self.guest.receive(), "client"), CODEC_BINARY)
+        self.host.accept_codec(self.host.receive())
+        self.assertEqual(self.host.codec, CODEC_BINARY)
+        
+        self.guest.send_message("move", player="client", move="Paper")
+        self.assertEqual(self.host.receive(), {"type": "move", "player": "client", "move": "Paper"})
+    
+    def test_legacy_peer_keeps_json(self):
+        """Test that a peer without a codec list is answered in JSON only"""
+        self.host.send(create_message("handshake", player="server", version="1.0"))
+        self.assertEqual(self.guest.answer_handshake(self.guest.receive(), "client"), CODEC_JSON)
+        
+        self.guest.send_message("move", player="client", move="Rock")
+        self.assertEqual(self.host.receive()["move"], "Rock")
+        self.assertFalse(self.host.has_pending())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for commit/reveal round bookkeeping
+"""
+
+import threading
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from commit_reveal import RoundBook, make_commitment, verify_commitment
+
+
+class TestCommitments(unittest.TestCase):
+    """Test cases for make_commitment / verify_commitment"""
+    
+    def test_reveal_matches(self):
+        """Test that the committed move verifies"""
+        digest, nonce = make_commitment("Rock", 3)
+        self.assertTrue(verify_commitment(digest, "Rock", 3, nonce))
+    
+    def test_tampered_reveal_fails(self):
+        """Test that a different move, round or nonce is rejected"""
+        digest, nonce = make_commitment("Rock", 3)
+        self.assertFalse(verify_commitment(digest, "Paper", 3, nonce))
+        self.assertFalse(verify_commitment(digest, "Rock", 4, nonce))
+        self.assertFalse(verify_commitment(digest, "Rock", 3, "00" * 16))
+        self.assertFalse(verify_commitment(digest, "Rock", 3, None))
+    
+    def test_nonces_hide_the_move(self):
+        """Test that committing to the same move twice gives different digests"""
+        self.assertNotEqual(make_commitment("Rock", 1)[0], make_commitment("Rock", 1)[0])
+
+
+class TestRoundBook(unittest.TestCase):
+    """Test cases for RoundBook"""
+    
+    def setUp(self):
+        self.server = RoundBook(max_in_flight=3)
+        self.client = RoundBook()
+    
+    def test_pipelined_rounds_resolve_in_order(self):
+        """Test that several committed rounds are resolved oldest first"""
+        for round_num, move in enumerate(["Rock", "Paper", "Scissors"], start=1):
+            self.client.record_commit(round_num, self.server.commit(round_num, move))
+        
+        self.assertTrue(self.server.submit(2, "Rock"))
+        self.assertEqual(self.server.pop_ready(), [])
+        self.assertTrue(self.server.submit(1, "Paper"))
+        
+        ready = self.server.pop_ready()
+        self.assertEqual([(r, own, peer) for r, own, peer, _ in ready],
+                         [(1, "Rock", "Paper"), (2, "Paper", "Rock")])
+        self.assertEqual(self.server.in_flight(), 1)
+        
+        for round_num, own, _, nonce in ready:
+            self.assertTrue(self.client.verify_reveal(round_num, own, nonce))
+    
+    def test_submit_rejects_unknown_and_duplicate_rounds(self):
+        """Test that moves for uncommitted or finished rounds are refused"""
+        self.assertFalse(self.server.submit(1, "Rock"))
+        self.server.commit(1, "Rock")
+        self.assertTrue(self.server.submit(1, "Rock"))
+        self.assertFalse(self.server.submit(1, "Paper"))
+    
+    def test_in_flight_limit(self):
+        """Test that the server cannot run more than max_in_flight rounds ahead"""
+        for round_num in range(1, 4):
+            self.server.commit(round_num, "Rock")
+        self.assertFalse(self.server.wait_for_slot(timeout=0))
+        
+        self.server.submit(1, "Rock")
+        self.server.pop_ready()
+        self.assertTrue(self.server.wait_for_slot(timeout=0))
+    
+    def test_wait_for_commit_wakes_up(self):
+        """Test that a waiting client is released when the commitment arrives"""
+        threading.Timer(0.05, self.client.record_commit, args=(1, "digest")).start()
+        self.assertTrue(self.client.wait_for_commit(1, timeout=5))
+        self.assertFalse(self.client.wait_for_commit(2, timeout=0))
+    
+    def test_reveal_without_commit_fails(self):
+        """Test that a reveal for a round we never saw committed is rejected"""
+        _, nonce = make_commitment("Rock", 1)
+        self.assertFalse(self.client.verify_reveal(1, "Rock", nonce))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Unit tests for LAN discovery beacons (all traffic stays on loopback)
+"""
+
+import select
+import time
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from discovery import (MAX_BEACON_SIZE, PROTOCOL_VERSION, BeaconBroadcaster, BeaconListener,
+                       decode_beacon, encode_beacon)
+
+
+class TestBeaconFormat(unittest.TestCase):
+    """Test cases for encoding and decoding beacons"""
+    
+    def test_round_trip(self):
+        """Test that every field survives encoding"""
+        game = decode_beacon(encode_beacon("192.168.1.20", 50007, 1, "Alice's PC"), "10.0.0.1")
+        self.assertEqual(game["address"], "192.168.1.20")
+        self.assertEqual(game["port"], 50007)
+        self.assertEqual(game["slots"], 1)
+        self.assertEqual(game["name"], "Alice's PC")
+        self.assertEqual(game["version"], PROTOCOL_VERSION)
+        self.assertTrue(game["compatible"])
+        self.assertFalse(game["closing"])
+    
+    def test_unspecified_address_uses_source(self):
+        """Test that hosts may let guests use the datagram's source address"""
+        game = decode_beacon(encode_beacon("0.0.0.0", 50007, 1), "192.168.1.30")
+        self.assertEqual(game["address"], "192.168.1.30")
+        self.assertEqual(game["name"], "192.168.1.30")
+    
+    def test_beacons_are_compact(self):
+        """Test that long names are truncated on a character boundary"""
+        beacon = encode_beacon("0.0.0.0", 50007, 1, "é" * 40)
+        self.assertLessEqual(len(beacon), MAX_BEACON_SIZE)
+        self.assertEqual(decode_beacon(beacon, "10.0.0.1")["name"], "é" * 16)
+    
+    def test_game_mode(self):
+        """Test that guests can rule out hosts playing a mode they don't speak"""
+        lockstep = encode_beacon("0.0.0.0", 50007, 1)
+        concurrent = encode_beacon("0.0.0.0", 50007, 1, mode="concurrent")
+        self.assertEqual(decode_beacon(lockstep, "10.0.0.1")["mode"], "lockstep")
+        game = decode_beacon(concurrent, "10.0.0.1")
+        self.assertEqual(game["mode"], "concurrent")
+        self.assertTrue(game["compatible"])
+        
+        self.assertFalse(decode_beacon(concurrent, "10.0.0.1", ("lockstep",))["compatible"])
+        self.assertTrue(decode_beacon(lockstep, "10.0.0.1", ("lockstep",))["compatible"])
+        with self.assertRaises(ValueError):
+            encode_beacon("0.0.0.0", 50007, 1, mode="turbo")
+    
+    def test_rejects_foreign_datagrams(self):
+        """Test that other UDP traffic on the port is ignored"""
+        self.assertIsNone(decode_beacon(b"", "10.0.0.1"))
+        self.assertIsNone(decode_beacon(b"hello world, not a beacon", "10.0.0.1"))
+        self.assertIsNone(decode_beacon(encode_beacon("0.0.0.0", 50007, 1, "name")[:-1], "10.0.0.1"))
+
+
+class TestBeaconListener(unittest.TestCase):
+    """Test cases for the listener and broadcaster over loopback"""
+    
+    def setUp(self):
+        self.listener = BeaconListener(port=0, host="127.0.0.1", ttl=3)
+        self.addCleanup(self.listener.close)
+    
+    def broadcaster(self, port=50007, **kwargs):
+        beacon = BeaconBroadcaster(port, target=self.listener.address, **kwargs)
+        self.addCleanup(beacon.stop)
+        return beacon
+    
+    def poll(self, now=None):
+        """Wait until datagrams are readable, then poll"""
+        select.select([self.listener], [], [], 1.0)
+        return self.listener.poll(now)
+    
+    def test_duplicates_refresh_one_entry(self):
+        """Test that repeated beacons from one host are listed once"""
+        beacon = self.broadcaster(name="host")
+        for _ in range(5):
+            beacon.send()
+        changes = self.poll()
+        
+        self.assertEqual([change for change, _ in changes], ["added"])
+        self.assertEqual(len(self.listener.list_games()), 1)
+        self.assertEqual(self.listener.list_games()[0]["address"], "127.0.0.1")
+        
+        beacon.send()
+        self.assertEqual(self.poll(), [])
+    
+    def test_games_are_keyed_by_port(self):
+        """Test that two hosts on one machine are separate games"""
+        self.broadcaster(50007).send()
+        self.broadcaster(50010).send()
+        time.sleep(0.05)
+        self.listener.poll()
+        self.assertEqual(sorted(g["port"] for g in self.listener.list_games()), [50007, 50010])
+    
+    def test_slot_change_is_an_update(self):
+        """Test that a full game is reported as updated"""
+        beacon = self.broadcaster()
+        beacon.send()
+        self.poll()
+        beacon.set_slots(0)
+        changes = self.poll()
+        self.assertEqual([(change, game["slots"]) for change, game in changes], [("updated", 0)])
+    
+    def test_incompatible_mode_listed_last(self):
+        """Test that a listener marks and sorts hosts of other modes"""
+        listener = BeaconListener(port=0, host="127.0.0.1", modes=("lockstep",))
+        self.addCleanup(listener.close)
+        for port, name, mode in ((50007, "a", "concurrent"), (50010, "b", "lockstep")):
+            beacon = BeaconBroadcaster(port, name=name, target=listener.address, mode=mode)
+            self.addCleanup(beacon.stop)
+            beacon.send()
+        time.sleep(0.05)
+        listener.poll()
+        
+        games = listener.list_games()
+        self.assertEqual([(g["name"], g["compatible"]) for g in games],
+                         [("b", True), ("a", False)])
+    
+    def test_silent_hosts_expire(self):
+        """Test that a game vanishes after the TTL without beacons"""
+        self.broadcaster().send()
+        start = time.monotonic()
+        self.poll(start)
+        
+        self.assertEqual(self.listener.poll(start + 2), [])
+        changes = self.listener.poll(start + 4)
+        self.assertEqual([change for change, _ in changes], ["removed"])
+        self.assertEqual(self.listener.list_games(), [])
+    
+    def test_stop_removes_game(self):
+        """Test that a stopping host is removed without waiting for expiry"""
+        beacon = self.broadcaster(interval=0.05)
+        beacon.start()
+        self.poll()
+        beacon.stop()
+        time.sleep(0.05)
+        changes = self.listener.poll()
+        self.assertEqual([change for change, _ in changes][-1:], ["removed"])
+        self.assertEqual(self.listener.list_games(), [])
+    
+    def test_poll_never_blocks(self):
+        """Test that polling an idle socket returns immediately"""
+        start = time.perf_counter()
+        self.assertEqual(self.listener.poll(), [])
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
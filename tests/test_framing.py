@@ -0,0 +1,86 @@
+"""
+Unit tests for network message framing
+"""
+
+import socket
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from framing import FrameTooLarge, MessageFramer, MessageStream
+from utils import create_message
+
+
+class TestMessageFramer(unittest.TestCase):
+    """Test cases for MessageFramer"""
+    
+    def setUp(self):
+        self.framer = MessageFramer(max_message_size=64)
+    
+    def test_two_messages_in_one_segment(self):
+        """Test that coalesced messages are split apart"""
+        frames = self.framer.feed(b'{"type": "move"}\n{"type": "result"}\n')
+        self.assertEqual(frames, [b'{"type": "move"}', b'{"type": "result"}'])
+        self.assertEqual(self.framer.pending(), 0)
+    
+    def test_message_split_across_segments(self):
+        """Test that a message is only returned once it is complete"""
+        self.assertEqual(self.framer.feed(b'{"type": '), [])
+        self.assertEqual(self.framer.feed(memoryview(b'"move"')), [])
+        self.assertEqual(self.framer.feed(b'}\n{"ty'), [b'{"type": "move"}'])
+        self.assertEqual(self.framer.pending(), 4)
+    
+    def test_oversized_message(self):
+        """Test that a peer cannot grow the buffer without bound"""
+        with self.assertRaises(FrameTooLarge):
+            self.framer.feed(b"x" * 100)
+
+
+class TestMessageStream(unittest.TestCase):
+    """Test cases for MessageStream over a socket pair"""
+    
+    def setUp(self):
+        left, right = socket.socketpair()
+        self.left = MessageStream(left)
+        self.right = MessageStream(right)
+    
+    def tearDown(self):
+        self.left.close()
+        self.right.close()
+    
+    def test_pipelined_messages(self):
+        """Test that several messages sent back to back arrive in order"""
+        for round_num in range(1, 4):
+            self.left.send(create_message("move", move="Rock", round=round_num))
+        
+        rounds = [self.right.receive()["round"] for _ in range(3)]
+        self.assertEqual(rounds, [1, 2, 3])
+    
+    def test_invalid_frames_are_skipped(self):
+        """Test that garbage lines do not end the stream"""
+        self.left.sock.sendall(b"not json\n")
+        self.left.send(create_message("disconnect"))
+        
+        self.assertEqual(self.right.receive(), {"type": "disconnect"})
+    
+    def test_non_object_json_is_skipped(self):
+        """Test that valid JSON which is not a message object is ignored"""
+        self.left.sock.sendall(b'[1,2]\n3\n"move"\nnull\n')
+        self.left.send(create_message("disconnect"))
+        self.assertEqual(self.right.receive(), {"type": "disconnect"})
+        
+        self.left.sock.sendall(b"[1,2]\n")
+        self.left.send(create_message("disconnect"))
+        self.assertEqual(self.right.read_messages(), [{"type": "disconnect"}])
+    
+    def test_receive_returns_none_on_close(self):
+        """Test that a closed peer ends the stream"""
+        self.left.close()
+        self.assertIsNone(self.right.receive())
+
+
+if __name__ == '__main__':
+    unittest.main()
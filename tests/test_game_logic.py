@@ -5,12 +5,19 @@ Unit tests for game logic
 import unittest
 import sys
 import os
+import itertools
+from array import array
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from game_logic import GameLogic
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TestGameLogic(unittest.TestCase):
     """Test cases for GameLogic class"""
@@ -115,6 +122,59 @@ class TestGameLogic(unittest.TestCase):
         self.assertEqual(self.game.history[1]["player_move"], "Paper")
         self.assertEqual(self.game.history[1]["computer_move"], "Rock")
 
+    
+    def test_play_rounds_matches_decide_winner(self):
+        """Test that batch outcomes match decide_winner for every pairing"""
+        pairs = list(itertools.product(range(3), repeat=2))
+        player = array('b', [p for p, _ in pairs])
+        opponent = array('b', [o for _, o in pairs])
+        
+        outcomes = self.game.play_rounds(player, opponent)
+        
+        for (p, o), outcome in zip(pairs, outcomes):
+            expected = self.game.decide_winner(GameLogic.MOVES[p], GameLogic.MOVES[o])
+            self.assertEqual(GameLogic.RESULTS[outcome], expected)
+    
+    def test_play_rounds_scores_match_play_round(self):
+        """Test that batch scoring matches playing rounds one at a time"""
+        player = array('b', [0, 1, 2, 0, 2, 1, 1])
+        opponent = array('b', [2, 2, 2, 1, 0, 0, 1])
+        
+        single = GameLogic()
+        for p, o in zip(player, opponent):
+            single.play_round(GameLogic.MOVES[p], GameLogic.MOVES[o])
+        
+        self.game.play_rounds(player, opponent)
+        self.assertEqual(self.game.get_scores(), single.get_scores())
+    
+    def test_play_rounds_rejects_bad_input(self):
+        """Test that play_rounds validates lengths and move codes"""
+        with self.assertRaises(ValueError):
+            self.game.play_rounds(array('b', [0, 1]), array('b', [0]))
+        with self.assertRaises(ValueError):
+            self.game.play_rounds(array('b', [0, 3]), array('b', [0, 1]))
+        self.assertEqual(self.game.play_rounds([], []), array('b'))
+        self.assertEqual(self.game.rounds_played, 0)
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_play_rounds_rejects_bad_numpy_input(self):
+        """Test that wide NumPy codes are checked before narrowing to int8"""
+        valid = np.array([0, 1], dtype=np.int64)
+        for bad in (np.array([0, 256]), np.array([0, -256]), np.array([0.0, 1.5])):
+            with self.assertRaises(ValueError):
+                self.game.play_rounds(bad, valid)
+            with self.assertRaises(ValueError):
+                self.game.play_rounds(valid, bad)
+        self.assertEqual(self.game.rounds_played, 0)
+        
+        outcomes = self.game.play_rounds(np.array([1, 2], dtype=np.int64), valid)
+        self.assertEqual(outcomes.dtype, np.int8)
+        self.assertEqual(outcomes.tolist(), [1, 1])
+        
+        empty = self.game.play_rounds(np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        self.assertIsInstance(empty, np.ndarray)
+        self.assertEqual((empty.dtype, len(empty)), (np.int8, 0))
+
 
 if __name__ == '__main__':
     unittest.main()
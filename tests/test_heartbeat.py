@@ -0,0 +1,156 @@
+"""
+Unit tests for connection keepalive
+"""
+
+import socket
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from framing import MessageStream
+from heartbeat import Heartbeat, HeartbeatMonitor
+
+
+class FakeClock:
+    """Clock that only moves when told to"""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestHeartbeat(unittest.TestCase):
+    """Test cases for the per-connection state"""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.heartbeat = Heartbeat(self.clock)
+    
+    def test_silence_needs_an_active_listening_peer(self):
+        """Test that silence only counts while listening to a peer that pings"""
+        self.clock.now += 50
+        self.assertEqual(self.heartbeat.silent_for(), 0.0)
+        
+        self.heartbeat.listen()
+        self.clock.now += 5
+        self.assertEqual(self.heartbeat.silent_for(), 0.0)
+        
+        self.heartbeat.beat()
+        self.assertEqual(self.heartbeat.silent_for(), 5.0)
+        self.heartbeat.data_received()
+        self.clock.now += 2
+        self.assertEqual(self.heartbeat.silent_for(), 2.0)
+        
+        self.heartbeat.stop_listening()
+        self.assertEqual(self.heartbeat.silent_for(), 0.0)
+    
+    def test_rtt_smoothing(self):
+        """Test that pongs update the smoothed and minimum RTT"""
+        self.heartbeat.pong_received(99.9)
+        self.assertAlmostEqual(self.heartbeat.rtt, 0.1)
+        self.heartbeat.pong_received(99.5)
+        self.assertAlmostEqual(self.heartbeat.rtt, 0.1 + 0.125 * 0.4)
+        self.assertAlmostEqual(self.heartbeat.rtt_min, 0.1)
+        self.assertEqual(self.heartbeat.rtt_samples, 2)
+    
+    def test_foreign_timestamps_ignored(self):
+        """Test that pongs with bogus timestamps are not counted"""
+        for timestamp in ("soon", None, 200.0, -1e9):
+            self.heartbeat.pong_received(timestamp)
+        self.assertIsNone(self.heartbeat.rtt)
+        self.assertEqual(self.heartbeat.rtt_samples, 0)
+
+
+class TestHeartbeatMonitor(unittest.TestCase):
+    """Test cases for pinging over real sockets"""
+    
+    def setUp(self):
+        left, right = socket.socketpair()
+        self.local = MessageStream(left)
+        self.remote = MessageStream(right)
+        self.monitor = HeartbeatMonitor(interval=1.0, timeout=3.0)
+        self.dead = []
+    
+    def tearDown(self):
+        self.local.close()
+        self.remote.close()
+    
+    def handshake(self):
+        self.monitor.add(self.local, on_dead=self.dead.append)
+        self.remote.heartbeat_interval = 1.0
+        self.local.offer_codecs("host")
+        handshake = self.remote.receive()
+        self.assertEqual(handshake["heartbeat"], 1.0)
+        self.remote.answer_handshake(handshake, "guest")
+        self.local.accept_codec(self.local.receive())
+    
+    def test_invalid_settings(self):
+        """Test that the timeout must leave room for a ping"""
+        with self.assertRaises(ValueError):
+            HeartbeatMonitor(interval=2.0, timeout=2.0)
+    
+    def test_no_pings_before_handshake(self):
+        """Test that peers that did not announce heartbeats are never pinged"""
+        self.monitor.add(self.local, on_dead=self.dead.append)
+        self.assertEqual(self.monitor.tick(), [])
+        self.assertEqual(self.local.heartbeat.pings_sent, 0)
+    
+    def test_ping_pong_is_invisible(self):
+        """Test that pings are answered inside receive() and measure the RTT"""
+        self.handshake()
+        self.monitor.tick()
+        self.assertEqual(self.local.heartbeat.pings_sent, 1)
+        
+        # The remote answers the ping while waiting for its next message
+        self.local.send_message("move", move="Rock")
+        self.assertEqual(self.remote.receive()["type"], "move")
+        self.remote.send_message("result", result="tie")
+        self.assertEqual(self.local.receive()["type"], "result")
+        
+        self.assertEqual(self.local.heartbeat.rtt_samples, 1)
+        self.assertTrue(self.remote.heartbeat.peer_active)
+        
+        # Not due again until an interval has passed
+        self.monitor.tick()
+        self.assertEqual(self.local.heartbeat.pings_sent, 1)
+    
+    def test_silent_peer_declared_dead(self):
+        """Test that a listening stream gives up on a peer that stops answering"""
+        self.handshake()
+        heartbeat = self.local.heartbeat
+        heartbeat.beat()
+        heartbeat.listen()
+        now = heartbeat.last_received
+        
+        self.assertEqual(self.monitor.tick(now + 1.0), [])
+        self.assertEqual(self.monitor.tick(now + 3.5), [self.local])
+        self.assertEqual(self.dead, [self.local])
+        self.assertEqual(len(self.monitor), 0)
+    
+    def test_default_on_dead_unblocks_reader(self):
+        """Test that a dead peer makes receive() return None"""
+        self.monitor.add(self.local)
+        heartbeat = self.local.heartbeat
+        heartbeat.peer_interval = 1.0
+        heartbeat.beat()
+        heartbeat.listen()
+        
+        self.monitor.tick(heartbeat.last_received + 10)
+        self.assertIsNone(self.local.receive())
+    
+    def test_closed_streams_dropped(self):
+        """Test that closed streams leave the monitor"""
+        self.handshake()
+        self.local.closed = True
+        self.assertEqual(self.monitor.tick(), [])
+        self.assertEqual(len(self.monitor), 0)
+        self.assertEqual(self.dead, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
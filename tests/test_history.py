@@ -0,0 +1,80 @@
+"""
+Unit tests for the packed round history
+"""
+
+import unittest
+import sys
+import os
+from array import array
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from history import RoundHistory
+
+
+class TestRoundHistory(unittest.TestCase):
+    """Test cases for RoundHistory class"""
+    
+    def test_round_view_matches_legacy_dict(self):
+        """Test that stored rounds read back like the old history dicts"""
+        game = GameLogic()
+        game.play_round("Rock", "Scissors")
+        game.play_round("Paper", "Scissors")
+        
+        self.assertEqual(game.history[0], {
+            "round": 1,
+            "player_move": "Rock",
+            "computer_move": "Scissors",
+            "result": "player1"
+        })
+        self.assertEqual(game.history[-1]["result"], "player2")
+        self.assertEqual(game.history[-1]["round"], 2)
+    
+    def test_history_is_read_only(self):
+        """Test that round views cannot be modified"""
+        game = GameLogic()
+        game.play_round("Rock", "Rock")
+        
+        with self.assertRaises(TypeError):
+            game.history[0]["result"] = "player1"
+    
+    def test_ring_buffer_evicts_oldest(self):
+        """Test that a capped history keeps only the newest rounds"""
+        history = RoundHistory(max_rounds=3)
+        for player in [0, 1, 2, 0, 1]:
+            history.append(player, 0, 0)
+        
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.total_rounds, 5)
+        self.assertEqual([r["round"] for r in history], [3, 4, 5])
+        self.assertEqual(history.player_moves(), bytes([2, 0, 1]))
+    
+    def test_bulk_extend_wraps_ring(self):
+        """Test that bulk appends match single appends on a capped history"""
+        single = RoundHistory(max_rounds=4)
+        bulk = RoundHistory(max_rounds=4)
+        moves = [0, 1, 2, 2, 1, 0, 1]
+        
+        single.append(2, 2, 0)
+        bulk.append(2, 2, 0)
+        for move in moves:
+            single.append(move, 1, 2)
+        bulk.extend(moves, [1] * len(moves), [2] * len(moves))
+        
+        self.assertEqual(bulk.packed(), single.packed())
+        self.assertEqual(list(bulk), list(single))
+    
+    def test_play_rounds_records_history(self):
+        """Test that batch rounds land in the same history as single rounds"""
+        game = GameLogic(history_limit=2)
+        game.play_rounds(array('b', [0, 1, 2]), array('b', [2, 2, 2]))
+        
+        self.assertEqual(len(game.history), 2)
+        self.assertEqual(game.history[0]["player_move"], "Paper")
+        self.assertEqual(game.history.results(), bytes([2, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Unit tests for the host-side match engine
+"""
+
+import socket
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add multiplayer and src directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'multiplayer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from binary_codec import decode_binary, encode_binary
+from framing import MessageStream
+from match_engine import GUEST, HOST, RESULT_NAMES, MatchEngine
+from move_providers import IterableMoveProvider
+from wifi_client import WiFiClient
+
+
+class TestMatchEngine(unittest.TestCase):
+    """Test cases for MatchEngine"""
+    
+    def setUp(self):
+        self.engine = MatchEngine()
+    
+    def test_round_resolves_once_both_moves_are_in(self):
+        """Test that only the second move produces a result"""
+        self.assertIsNone(self.engine.submit(GUEST, "rock"))
+        result = self.engine.submit(HOST, "Paper")
+        
+        self.assertEqual(result, {"winner": "server", "server_move": "Paper",
+                                  "client_move": "Rock", "server_score": 1,
+                                  "client_score": 0, "round": 1})
+        self.assertEqual(self.engine.round, 2)
+    
+    def test_scores_accumulate(self):
+        """Test that scores carry over between rounds"""
+        self.engine.submit(HOST, "Rock")
+        self.engine.submit(GUEST, "Paper")
+        self.engine.submit(HOST, "Rock")
+        result = self.engine.submit(GUEST, "Rock")
+        
+        self.assertEqual(result["winner"], "tie")
+        self.assertEqual((result["server_score"], result["client_score"]), (0, 1))
+        self.assertEqual(self.engine.game_logic.rounds_played, 2)
+    
+    def test_winner_names_match_command_line_server(self):
+        """Test that winners use the "server"/"client" names every endpoint shares"""
+        self.engine.submit(HOST, "Rock")
+        self.assertEqual(self.engine.submit(GUEST, "Paper")["winner"], "client")
+        self.engine.submit(HOST, "Scissors")
+        self.assertEqual(self.engine.submit(GUEST, "Paper")["winner"], "server")
+        self.assertEqual(RESULT_NAMES, {HOST: "server", GUEST: "client"})
+    
+    def test_stats_follow_the_match(self):
+        """Test that the match statistics are kept per round and cleared on reset"""
+        for host, guest in (("Rock", "Scissors"), ("Rock", "Scissors"), ("Paper", "Scissors")):
+            self.engine.submit(HOST, host)
+            self.engine.submit(GUEST, guest)
+        
+        stats = self.engine.snapshot_stats()
+        self.assertEqual((stats["wins"], stats["losses"]), (2, 1))
+        self.assertEqual(stats["streak"], {"result": "loss", "length": 1})
+        self.assertEqual(stats["transitions"]["Rock"], {"Rock": 1, "Paper": 1, "Scissors": 0})
+        
+        self.engine.reset()
+        self.assertEqual(self.engine.snapshot_stats()["rounds"], 0)
+    
+    def test_invalid_submissions(self):
+        """Test that bad sides, bad moves and double moves are rejected"""
+        with self.assertRaises(ValueError):
+            self.engine.submit("spectator", "Rock")
+        with self.assertRaises(ValueError):
+            self.engine.submit(GUEST, "Lizard")
+        
+        self.engine.submit(GUEST, "Rock")
+        self.assertTrue(self.engine.has_moved(GUEST))
+        with self.assertRaises(ValueError):
+            self.engine.submit(GUEST, "Paper")
+    
+    def test_concurrent_submissions_resolve_each_round_once(self):
+        """Test that racing host and guest threads never lose or double a round"""
+        results = []
+        
+        def play(side):
+            for _ in range(100):
+                while self.engine.has_moved(side):
+                    time.sleep(0)
+                result = self.engine.submit(side, "Rock")
+                if result is not None:
+                    results.append(result["round"])
+        
+        threads = [threading.Thread(target=play, args=(side,)) for side in (HOST, GUEST)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(sorted(results), list(range(1, 101)))
+    
+    def test_result_fits_binary_codec(self):
+        """Test that results travel as compact binary frames"""
+        self.engine.submit(HOST, "Scissors")
+        result = self.engine.submit(GUEST, "Paper")
+        frame = encode_binary("result", result)
+        
+        self.assertIsNotNone(frame)
+        self.assertEqual(decode_binary(frame), dict(type="result", **result))
+    
+    def test_reset(self):
+        """Test that reset starts a fresh match"""
+        self.engine.submit(HOST, "Rock")
+        self.engine.reset()
+        self.assertFalse(self.engine.has_moved(HOST))
+        self.assertEqual(self.engine.round, 1)
+    
+    def test_prompt_follows_rounds(self):
+        """Test that the round prompt carries the current round and no move"""
+        self.assertEqual(self.engine.prompt(), {"player": HOST, "round": 1})
+        self.engine.submit(HOST, "Rock")
+        self.engine.submit(GUEST, "Rock")
+        self.assertEqual(self.engine.prompt(), {"player": HOST, "round": 2})
+
+
+class TestCommandLineGuest(unittest.TestCase):
+    """Test a command-line client joining a GUI-style host"""
+    
+    def host(self, server_socket, host_moves):
+        """Play the host side the way GameUI does: prompt, resolve, publish, prompt"""
+        connection, _ = server_socket.accept()
+        connection.settimeout(10)
+        stream = MessageStream(connection)
+        engine = MatchEngine()
+        stream.offer_codecs("host")
+        stream.send_message("move", **engine.prompt())
+        try:
+            while (msg := stream.receive()) is not None:
+                if msg["type"] == "handshake":
+                    stream.accept_codec(msg)
+                elif msg["type"] == "move":
+                    engine.submit(GUEST, msg["move"])
+                    result = engine.submit(HOST, next(host_moves))
+                    stream.send_message("result", **result)
+                    stream.send_message("move", **engine.prompt())
+                elif msg["type"] == "disconnect":
+                    break
+        finally:
+            stream.close()
+        return engine
+    
+    def test_client_plays_every_round(self):
+        """Test that a WiFiClient is prompted for each round and sees each result"""
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(server_socket.close)
+        server_socket.bind(("127.0.0.1", 0))
+        server_socket.listen(1)
+        
+        engines = []
+        host_thread = threading.Thread(
+            target=lambda: engines.append(self.host(server_socket, iter(["Rock"] * 20))),
+            daemon=True)
+        host_thread.start()
+        
+        client = WiFiClient("127.0.0.1", server_socket.getsockname()[1],
+                            move_provider=IterableMoveProvider(["Paper"] * 20),
+                            verbose=False, heartbeat=None)
+        client.connect()
+        host_thread.join(timeout=10)
+        
+        self.assertEqual(client.client_score, 20)
+        self.assertEqual(engines[0].game_logic.get_scores(), (0, 20, 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
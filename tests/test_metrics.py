@@ -0,0 +1,184 @@
+"""
+Unit tests for latency and throughput metrics
+"""
+
+import json
+import random
+import socket
+import unittest
+import urllib.request
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import metrics
+from framing import MessageStream
+from metrics import (BUCKET_COUNT, MAX_VALUE, NANOSECONDS, Histogram, Registry, RoundTimer,
+                     bucket_bounds, bucket_index)
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for the fixed-bucket histogram"""
+    
+    def test_buckets_cover_every_value_once(self):
+        """Test that consecutive buckets are contiguous up to MAX_VALUE"""
+        previous = -1
+        for index in range(BUCKET_COUNT):
+            low, high = bucket_bounds(index)
+            self.assertEqual(low, previous + 1)
+            self.assertEqual(bucket_index(low), index)
+            self.assertEqual(bucket_index(high), index)
+            previous = high
+        self.assertEqual(previous, MAX_VALUE)
+    
+    def test_quantiles_within_bucket_error(self):
+        """Test that quantiles are within 1/16 of the exact value"""
+        rng = random.Random(7)
+        values = [rng.randrange(10 ** 9) for _ in range(10000)]
+        histogram = Histogram("test")
+        for value in values:
+            histogram.record(value)
+        values.sort()
+        
+        for q, estimate in zip((0.5, 0.9, 0.99), histogram.quantiles((0.5, 0.9, 0.99))):
+            exact = values[int(q * len(values) + 0.5) - 1]
+            self.assertGreaterEqual(estimate, exact)
+            self.assertLessEqual(estimate, exact * (1 + 1 / 16))
+            self.assertEqual(estimate, histogram.quantile(q))
+    
+    def test_small_values_exact(self):
+        """Test that values below the sub-bucket count are kept exactly"""
+        histogram = Histogram("depth")
+        for value in (0, 1, 1, 3, 7):
+            histogram.record(value)
+        self.assertEqual(histogram.quantiles((0.2, 0.6, 1.0)), [0, 1, 7])
+        self.assertEqual(histogram.total, 12)
+    
+    def test_out_of_range_values(self):
+        """Test that huge and negative values are clamped but counted"""
+        histogram = Histogram("test")
+        histogram.record(-5)
+        histogram.record(MAX_VALUE * 4)
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.max, MAX_VALUE * 4)
+        self.assertEqual(histogram.quantile(1.0), MAX_VALUE * 4)
+        self.assertEqual(histogram.quantile(0.5), 0)
+    
+    def test_empty_snapshot(self):
+        """Test that an empty histogram exports zeros"""
+        snapshot = Histogram("test").snapshot()
+        self.assertEqual(snapshot["count"], 0)
+        self.assertEqual(snapshot["mean"], 0.0)
+        self.assertEqual(set(snapshot["quantiles"].values()), {0})
+
+
+class TestRegistry(unittest.TestCase):
+    """Test cases for exporting"""
+    
+    def setUp(self):
+        self.registry = Registry()
+    
+    def test_get_or_create(self):
+        """Test that a name always returns the same metric"""
+        self.assertIs(self.registry.histogram("a"), self.registry.histogram("a"))
+        self.assertIs(self.registry.counter("b"), self.registry.counter("b"))
+    
+    def test_prometheus_format(self):
+        """Test the text exposition of a counter and a duration histogram"""
+        self.registry.counter("rps_bytes_total", "Bytes").add(42)
+        histogram = self.registry.histogram("rps_rtt_seconds", "RTT", NANOSECONDS)
+        histogram.record(2_000_000)
+        
+        text = self.registry.format_prometheus()
+        self.assertIn("# TYPE rps_bytes_total counter\nrps_bytes_total 42\n", text)
+        self.assertIn('rps_rtt_seconds{quantile="0.5"} 0.002', text)
+        self.assertIn("rps_rtt_seconds_count 1\n", text)
+        self.assertIn("rps_rtt_seconds_max 0.002\n", text)
+        self.assertTrue(text.endswith("\n"))
+    
+    def test_summary_skips_empty_metrics(self):
+        """Test that the text summary only lists metrics with data"""
+        self.registry.histogram("unused")
+        self.registry.histogram("rps_move_seconds", scale=NANOSECONDS).record(1_500_000)
+        summary = self.registry.format_summary()
+        self.assertNotIn("unused", summary)
+        self.assertIn("1.5ms", summary)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for the instrumented multiplayer code"""
+    
+    def setUp(self):
+        self.instruments = metrics.enable(Registry())
+    
+    def tearDown(self):
+        metrics.disable()
+    
+    def test_disabled_by_default(self):
+        """Test that nothing is instrumented once metrics are off"""
+        metrics.disable()
+        self.assertIsNone(metrics.instruments())
+        timer = metrics.round_timer()
+        timer.start()
+        timer.moved()
+        timer.finished()
+        self.assertEqual(self.instruments.rounds.value, 0)
+        
+        left, right = socket.socketpair()
+        stream = MessageStream(left)
+        self.assertIsNone(stream.metrics)
+        stream.close()
+        right.close()
+    
+    def test_stream_traffic(self):
+        """Test that streams count bytes and time encoding and decoding"""
+        left, right = socket.socketpair()
+        sender, receiver = MessageStream(left), MessageStream(right)
+        try:
+            sender.send_message("move", move="Rock", round=1)
+            self.assertEqual(receiver.receive()["move"], "Rock")
+        finally:
+            sender.close()
+            receiver.close()
+        
+        instruments = self.instruments
+        self.assertEqual(instruments.encode.count, 1)
+        self.assertEqual(instruments.decode.count, 1)
+        self.assertGreater(instruments.bytes_out.value, 0)
+        self.assertEqual(instruments.bytes_in.value, instruments.bytes_out.value)
+        self.assertEqual(instruments.receive_backlog.count, 1)
+    
+    def test_round_timer(self):
+        """Test that overlapping rounds are timed separately"""
+        timer = RoundTimer(self.instruments)
+        timer.start(1)
+        timer.start(2)
+        timer.moved(1)
+        timer.finished(2)
+        timer.finished(1)
+        timer.finished(3)
+        
+        self.assertEqual(self.instruments.rounds.value, 2)
+        self.assertEqual(self.instruments.round_time.count, 2)
+        self.assertEqual(self.instruments.move_time.count, 1)
+        self.assertEqual(self.instruments.opponent_wait.count, 1)
+    
+    def test_http_endpoint(self):
+        """Test that the endpoint serves both formats"""
+        self.instruments.rounds.add(3)
+        server = metrics.serve(0, registry=self.instruments.registry)
+        try:
+            base = "http://127.0.0.1:%d" % server.server_address[1]
+            with urllib.request.urlopen(base + "/metrics", timeout=5) as response:
+                self.assertIn("rps_rounds_total 3", response.read().decode())
+            with urllib.request.urlopen(base + "/metrics.json", timeout=5) as response:
+                self.assertEqual(json.loads(response.read())["rps_rounds_total"], 3)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Unit tests for move providers and headless network play
+"""
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add multiplayer and src directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'multiplayer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from framing import MessageStream
+from replay import ReplayReader
+from move_providers import (ConsoleMoveProvider, FileMoveProvider, IterableMoveProvider,
+                            StrategyMoveProvider, create_move_provider)
+from strategies import CycleStrategy, MarkovStrategy
+from wifi_client import WiFiClient
+from wifi_server import WiFiServer
+
+
+class TestMoveProviders(unittest.TestCase):
+    """Test cases for the individual providers"""
+    
+    def drain(self, provider):
+        moves = []
+        while (move := provider.next_move()) is not None:
+            moves.append(move)
+        return moves
+    
+    def test_iterable_accepts_names_and_codes(self):
+        """Test that scripts may mix names in any case with move codes"""
+        provider = IterableMoveProvider(["rock", 1, " SCISSORS "])
+        self.assertEqual(self.drain(provider), ["Rock", "Paper", "Scissors"])
+    
+    def test_iterable_rejects_bad_moves(self):
+        """Test that a typo in a script is reported"""
+        with self.assertRaises(ValueError):
+            IterableMoveProvider(["Lizard"]).next_move()
+    
+    def test_generator_with_round_limit(self):
+        """Test that an endless generator is cut off after the given rounds"""
+        def forever():
+            while True:
+                yield "Paper"
+        
+        self.assertEqual(self.drain(IterableMoveProvider(forever(), rounds=3)), ["Paper"] * 3)
+    
+    def test_strategy_provider(self):
+        """Test that a strategy plays the requested number of rounds"""
+        provider = StrategyMoveProvider(CycleStrategy(), rounds=4)
+        self.assertEqual(self.drain(provider), ["Rock", "Paper", "Scissors", "Rock"])
+    
+    def test_strategy_provider_learns(self):
+        """Test that observed rounds reach the strategy"""
+        provider = StrategyMoveProvider(MarkovStrategy(order=0))
+        for _ in range(20):
+            provider.observe(provider.next_move(), "Rock")
+        self.assertEqual(provider.next_move(), "Paper")
+    
+    def test_file_provider_skips_comments_and_loops(self):
+        """Test that move files skip blank/comment lines and can repeat"""
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# opening\nrock\n\npaper\n")
+        self.addCleanup(os.remove, f.name)
+        
+        self.assertEqual(self.drain(FileMoveProvider(f.name)), ["Rock", "Paper"])
+        self.assertEqual(self.drain(FileMoveProvider(f.name, rounds=5, loop=True)),
+                         ["Rock", "Paper", "Rock", "Paper", "Rock"])
+    
+    def test_create_move_provider(self):
+        """Test command-line option handling"""
+        self.assertIsInstance(create_move_provider(), ConsoleMoveProvider)
+        self.assertIsInstance(create_move_provider("markov", rounds=3), StrategyMoveProvider)
+        with self.assertRaises(ValueError):
+            create_move_provider("markov", "moves.txt")
+
+
+class TestHeadlessPlay(unittest.TestCase):
+    """Test a full bot-vs-bot game over loopback"""
+    
+    def play(self, rounds, concurrent, record=None):
+        server = WiFiServer(host='127.0.0.1', port=0, concurrent=concurrent,
+                            move_provider=StrategyMoveProvider(CycleStrategy(), rounds),
+                            verbose=False, record=record)
+        server_thread = threading.Thread(target=server.start, daemon=True)
+        server_thread.start()
+        self.assertTrue(server.started.wait(10))
+        
+        # Paper, Scissors, Rock... beats the server's Rock, Paper, Scissors...
+        client = WiFiClient('127.0.0.1', server.server_socket.getsockname()[1],
+                            move_provider=IterableMoveProvider((i + 1) % 3 for i in range(rounds)),
+                            verbose=False)
+        client.connect()
+        server_thread.join(timeout=10)
+        return server, client
+    
+    def test_lockstep_bots(self):
+        """Test that scripted players finish every round without console I/O"""
+        server, client = self.play(200, concurrent=False)
+        self.assertEqual(client.client_score, 200)
+        self.assertEqual(server.game_logic.computer_score, 200)
+    
+    def test_concurrent_bots(self):
+        """Test that scripted players also work with commit/reveal"""
+        server, client = self.play(50, concurrent=True)
+        self.assertEqual(server.game_logic.computer_score, 50)
+    
+    def test_invalid_client_move_is_skipped(self):
+        """Test that a lockstep server waits past a bad move instead of ending the match"""
+        server = WiFiServer(host='127.0.0.1', port=0,
+                            move_provider=StrategyMoveProvider(CycleStrategy(), 1), verbose=False)
+        server_thread = threading.Thread(target=server.start, daemon=True)
+        server_thread.start()
+        self.assertTrue(server.started.wait(10))
+        
+        connection = socket.create_connection(server.server_socket.getsockname(), timeout=5)
+        stream = MessageStream(connection)
+        self.addCleanup(stream.close)
+        stream.answer_handshake(stream.receive(), "client")
+        self.assertEqual(stream.receive()["round"], 1)
+        
+        for move in ("lizard", None, ["Rock"], "paper"):
+            stream.send_message("move", player="client", move=move, round=1)
+        result = stream.receive()
+        self.assertEqual(result["type"], "result")
+        self.assertEqual(result["client_move"], "Paper")
+        self.assertEqual(result["winner"], "client")
+        server_thread.join(timeout=10)
+        self.assertEqual(server.game_logic.get_scores(), (0, 1, 1))
+    
+    def test_recorded_match_replays(self):
+        """Test that --record saves a replay that rescores to the same result"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "match.rpr")
+        
+        server, client = self.play(30, concurrent=False, record=path)
+        with ReplayReader(path) as replay:
+            self.assertTrue(replay.complete)
+            self.assertEqual(len(replay), 30)
+            self.assertEqual(replay.rescore().get_scores(), (0, 30, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Unit tests for the shared move encoding
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from moves import MOVE_NAMES, MoveCode, OUTCOMES, RESULT_NAMES, COUNTERS, parse_move, resolve
+from utils import validate_move
+
+
+class TestMoves(unittest.TestCase):
+    """Test cases for move codes and outcome tables"""
+    
+    def test_outcome_table_matches_rules(self):
+        """Test that the lookup table agrees with the WINS rules"""
+        for player in MoveCode:
+            for opponent in MoveCode:
+                if player == opponent:
+                    expected = "tie"
+                elif GameLogic.WINS[player.label] == opponent.label:
+                    expected = "player1"
+                else:
+                    expected = "player2"
+                self.assertEqual(RESULT_NAMES[OUTCOMES[player][opponent]], expected)
+                self.assertEqual(RESULT_NAMES[resolve(player, opponent)], expected)
+    
+    def test_counters_beat_move(self):
+        """Test that COUNTERS always picks the winning reply"""
+        for move in MoveCode:
+            self.assertEqual(resolve(COUNTERS[move], move), 1)
+    
+    def test_parse_move(self):
+        """Test that typed input is normalized to move names"""
+        self.assertEqual(parse_move("  rock "), "Rock")
+        self.assertEqual(parse_move("SCISSORS"), "Scissors")
+        self.assertIsNone(parse_move("lizard"))
+    
+    def test_validate_move(self):
+        """Test that only canonical move names are valid"""
+        for name in MOVE_NAMES:
+            self.assertTrue(validate_move(name))
+        self.assertFalse(validate_move("rock"))
+        self.assertFalse(validate_move(""))
+    
+    def test_validate_move_rejects_other_types(self):
+        """Test that non-string and unhashable moves are invalid, not errors"""
+        for move in (None, 0, 1.5, [], ["Rock"], {}, {"move": "Rock"}, {"Rock"}):
+            self.assertFalse(validate_move(move))
+
+
+if __name__ == '__main__':
+    unittest.main()
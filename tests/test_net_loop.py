@@ -0,0 +1,155 @@
+"""
+Unit tests for the shared network event loop
+"""
+
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from framing import MessageStream
+from net_loop import EventPump, NetworkLoop
+
+
+class Events:
+    """Collects posted callbacks and lets a test wait for them"""
+    
+    def __init__(self):
+        self.items = []
+        self.changed = threading.Condition()
+    
+    def post(self, callback, *args):
+        with self.changed:
+            callback(*args)
+            self.changed.notify_all()
+    
+    def record(self, *item):
+        self.items.append(item)
+    
+    def wait_for(self, count, timeout=5):
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.items) >= count, timeout)
+        return self.items
+
+
+class TestEventPump(unittest.TestCase):
+    """Test cases for EventPump"""
+    
+    def test_bursts_share_one_wakeup(self):
+        """Test that many events before a drain schedule the UI only once"""
+        scheduled = []
+        pump = EventPump(scheduled.append)
+        seen = []
+        for i in range(100):
+            pump.post(seen.append, i)
+        self.assertEqual(len(scheduled), 1)
+        
+        scheduled[0]()
+        self.assertEqual(seen, list(range(100)))
+        
+        pump.post(seen.append, 100)
+        self.assertEqual(len(scheduled), 2)
+    
+    def test_failing_callback_does_not_drop_the_rest(self):
+        """Test that one broken handler does not lose later events"""
+        scheduled = []
+        pump = EventPump(scheduled.append)
+        seen = []
+        pump.post(lambda: 1 / 0)
+        pump.post(seen.append, "after")
+        with mock.patch("traceback.print_exc"):
+            scheduled[0]()
+        self.assertEqual(seen, ["after"])
+
+
+class TestNetworkLoop(unittest.TestCase):
+    """Test cases for NetworkLoop over loopback"""
+    
+    def setUp(self):
+        self.events = Events()
+        self.loop = NetworkLoop(post=self.events.post)
+        self.loop.start()
+        self.addCleanup(self.loop.stop)
+    
+    def listening_socket(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(32)
+        return server
+    
+    def test_accept_connect_and_messages(self):
+        """Test a full connection: accept, connect, then framed messages"""
+        server = self.listening_socket()
+        self.loop.listen(server, lambda conn, addr: self.events.record("accepted", conn))
+        self.loop.connect(server.getsockname(),
+                          lambda sock: self.events.record("connected", sock),
+                          lambda error: self.events.record("error", error))
+        items = self.events.wait_for(2)
+        by_kind = dict(items)
+        self.assertEqual(sorted(by_kind), ["accepted", "connected"])
+        
+        host = MessageStream(by_kind["accepted"])
+        guest = MessageStream(by_kind["connected"])
+        self.loop.watch_stream(guest, lambda msg: self.events.record("msg", msg["round"]),
+                               lambda: self.events.record("closed"))
+        for round_num in range(1, 6):
+            host.send_message("move", player="host", round=round_num)
+        host.close()
+        
+        items = self.events.wait_for(8)
+        self.assertEqual(items[2:], [("msg", 1), ("msg", 2), ("msg", 3), ("msg", 4), ("msg", 5),
+                                     ("closed",)])
+        guest.close()
+    
+    def test_connect_refused(self):
+        """Test that a refused connection reports an error instead of blocking"""
+        server = self.listening_socket()
+        address = server.getsockname()
+        server.close()
+        
+        self.loop.connect(address, lambda sock: self.events.record("connected"),
+                          lambda error: self.events.record("error", type(error)))
+        self.assertEqual(self.events.wait_for(1), [("error", ConnectionRefusedError)])
+    
+    def test_timers(self):
+        """Test one-shot and repeating timers and cancellation"""
+        post = self.loop.post
+        self.loop.call_later(0.02, post, self.events.record, "later")
+        repeating = self.loop.call_every(0.01, post, self.events.record, "tick")
+        self.events.wait_for(4)
+        repeating.cancel()
+        time.sleep(0.05)
+        count = len(self.events.items)
+        time.sleep(0.05)
+        
+        self.assertIn(("later",), self.events.items)
+        self.assertEqual(len(self.events.items), count)
+    
+    def test_thread_count_is_constant(self):
+        """Test that many sessions reuse the loop thread"""
+        server = self.listening_socket()
+        self.loop.listen(server, lambda conn, addr: self.events.record("accepted", conn))
+        threads = threading.active_count()
+        
+        clients = []
+        for _ in range(20):
+            client = socket.create_connection(server.getsockname())
+            clients.append(client)
+        accepted = [conn for _, conn in self.events.wait_for(20)]
+        for conn in accepted:
+            self.loop.watch_stream(MessageStream(conn), lambda msg: None, lambda: None)
+        
+        self.assertEqual(threading.active_count(), threads)
+        for sock in clients + accepted:
+            sock.close()
+        server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for cached local address discovery
+"""
+
+import ipaddress
+import socket
+import time
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import netinfo
+from netinfo import LOOPBACK, InterfaceCache, enumerate_addresses
+
+
+class FakeScanner:
+    """Stands in for enumerate_addresses and counts the scans"""
+    
+    def __init__(self, addresses, delay=0.0):
+        self.addresses = addresses
+        self.delay = delay
+        self.calls = 0
+    
+    def __call__(self, include_hostname=True):
+        self.calls += 1
+        time.sleep(self.delay)
+        return list(self.addresses)
+
+
+class TestEnumerateAddresses(unittest.TestCase):
+    """Test cases for enumerate_addresses"""
+    
+    def test_real_scan_returns_ipv4_addresses(self):
+        """Test that the scan of this machine gives usable addresses"""
+        addresses = enumerate_addresses()
+        self.assertTrue(addresses)
+        for address in addresses:
+            ipaddress.IPv4Address(address)
+    
+    def test_never_contacts_public_hosts(self):
+        """Test that discovery only ever connects to private addresses"""
+        targets = []
+        real_socket = socket.socket
+        
+        class RecordingSocket(real_socket):
+            def connect(self, address):
+                targets.append(address[0])
+                return super().connect(address)
+        
+        with mock.patch.object(netinfo.socket, "socket", RecordingSocket):
+            enumerate_addresses()
+        
+        self.assertTrue(all(ipaddress.IPv4Address(t).is_private for t in targets))
+    
+    def test_ordering_and_loopback_fallback(self):
+        """Test that LAN addresses come first and loopback is only a fallback"""
+        with mock.patch.object(netinfo, "_route_addresses", return_value=["169.254.1.1"]), \
+             mock.patch.object(netinfo, "_interface_addresses",
+                               return_value=["127.0.0.1", "8.8.4.4", "192.168.1.20"]), \
+             mock.patch.object(netinfo, "_hostname_addresses", return_value=["192.168.1.20"]):
+            self.assertEqual(enumerate_addresses(),
+                             ["192.168.1.20", "8.8.4.4", "169.254.1.1"])
+        
+        with mock.patch.object(netinfo, "_route_addresses", return_value=[]), \
+             mock.patch.object(netinfo, "_interface_addresses", return_value=["127.0.0.1"]), \
+             mock.patch.object(netinfo, "_hostname_addresses", return_value=[]):
+            self.assertEqual(enumerate_addresses(), [LOOPBACK])
+
+
+class TestInterfaceCache(unittest.TestCase):
+    """Test cases for InterfaceCache"""
+    
+    def test_first_read_waits_for_scan(self):
+        """Test that the first read with a timeout sees the scan result"""
+        cache = InterfaceCache(enumerate_func=FakeScanner(["10.0.0.5"]))
+        self.assertEqual(cache.addresses(timeout=5), ["10.0.0.5"])
+    
+    def test_reads_are_cached(self):
+        """Test that fresh data is served without rescanning"""
+        scanner = FakeScanner(["10.0.0.5"])
+        cache = InterfaceCache(ttl=60, enumerate_func=scanner)
+        cache.refresh()
+        calls = scanner.calls
+        
+        for _ in range(100):
+            cache.addresses()
+        self.assertEqual(scanner.calls, calls)
+    
+    def test_stale_read_does_not_block(self):
+        """Test that a slow rescan happens in the background"""
+        scanner = FakeScanner(["10.0.0.5"])
+        cache = InterfaceCache(ttl=0, enumerate_func=scanner)
+        cache.refresh()
+        
+        scanner.delay = 0.5
+        scanner.addresses = ["10.0.0.6"]
+        start = time.perf_counter()
+        self.assertEqual(cache.addresses(), ["10.0.0.5"])
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.assertFalse(cache.refresh_async())
+    
+    def test_loopback_until_discovered(self):
+        """Test that readers get loopback rather than waiting forever"""
+        cache = InterfaceCache(enumerate_func=FakeScanner(["10.0.0.5"], delay=0.5))
+        self.assertEqual(cache.addresses(), [LOOPBACK])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Unit tests for the SQLite game store
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import sys
+from array import array
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic, RoundListener
+from persistence import GameStore, SessionRecorder, summarize_counts
+
+
+class RecordingListener(RoundListener):
+    """Keeps every round it is told about"""
+    
+    def __init__(self):
+        self.rounds = []
+        self.resets = 0
+    
+    def on_round(self, player_code, opponent_code, result_code):
+        self.rounds.append((player_code, opponent_code, result_code))
+    
+    def on_reset(self):
+        self.resets += 1
+
+
+class TestRoundListener(unittest.TestCase):
+    """Test cases for GameLogic round listeners"""
+    
+    def test_single_and_batch_rounds_reach_listener(self):
+        """Test that play_round and play_rounds both notify listeners"""
+        game = GameLogic()
+        listener = RecordingListener()
+        game.add_listener(listener)
+        
+        game.play_round("Rock", "Scissors")
+        game.play_rounds(array('b', [1, 2]), array('b', [1, 0]))
+        game.reset_scores()
+        
+        self.assertEqual(listener.rounds, [(0, 2, 1), (1, 1, 0), (2, 0, 2)])
+        self.assertEqual(listener.resets, 1)
+        
+        game.remove_listener(listener)
+        game.play_round("Rock", "Rock")
+        self.assertEqual(len(listener.rounds), 3)
+
+
+class TestGameStore(unittest.TestCase):
+    """Test cases for GameStore"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "rps.db")
+        self.store = GameStore(self.path, batch_size=100, flush_interval=3600)
+        self.addCleanup(self.store.close)
+    
+    def play(self, game, moves):
+        for player, opponent in moves:
+            game.play_round(player, opponent)
+    
+    def test_wal_mode(self):
+        """Test that the database uses write-ahead logging"""
+        mode = self.store._db.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+    
+    def test_rounds_are_batched(self):
+        """Test that rounds are committed per batch, not per round"""
+        game = GameLogic()
+        game.add_listener(SessionRecorder(self.store))
+        
+        game.play_rounds(array('b', [0] * 99), array('b', [2] * 99))
+        self.assertEqual(self.store.commits, 0)
+        game.play_round("Rock", "Rock")
+        self.assertEqual(self.store.commits, 1)
+    
+    def test_idle_rounds_flushed_by_timer(self):
+        """Test that flush_if_due() commits a partial batch once it is old enough"""
+        game = GameLogic()
+        game.add_listener(SessionRecorder(self.store))
+        self.assertFalse(self.store.flush_if_due())
+        
+        game.play_round("Rock", "Scissors")
+        start = time.monotonic()
+        self.assertFalse(self.store.flush_if_due(start + 1))
+        self.assertEqual(self.store.commits, 0)
+        self.assertTrue(self.store.flush_if_due(start + 3600))
+        self.assertEqual(self.store.commits, 1)
+        self.assertFalse(self.store.flush_if_due(start + 7200))
+    
+    def test_lifetime_stats_survive_reset_and_reopen(self):
+        """Test that aggregates cover every session and outlive the store"""
+        game = GameLogic()
+        recorder = SessionRecorder(self.store)
+        game.add_listener(recorder)
+        
+        self.play(game, [("Rock", "Scissors"), ("Paper", "Scissors"), ("Rock", "Rock")])
+        game.reset_scores()
+        game.play_rounds(array('b', [2, 2]), array('b', [1, 1]))
+        recorder.close()
+        self.store.close()
+        
+        store = GameStore(self.path)
+        self.addCleanup(store.close)
+        stats = store.lifetime_stats()
+        self.assertEqual((stats["rounds"], stats["wins"], stats["losses"], stats["ties"]), (5, 3, 1, 1))
+        self.assertEqual(stats["moves"], {"Rock": 2, "Paper": 1, "Scissors": 2})
+        self.assertEqual(stats["opponent_moves"]["Scissors"], 2)
+        self.assertAlmostEqual(stats["win_rate"], 0.6)
+        
+        sessions = store.sessions(player="You")
+        self.assertEqual([s["rounds"] for s in sessions], [2, 3])
+        self.assertTrue(all(s["ended"] for s in sessions))
+    
+    def test_history_round_trip(self):
+        """Test that a session loads back into the same packed history"""
+        game = GameLogic()
+        recorder = SessionRecorder(self.store)
+        game.add_listener(recorder)
+        
+        self.play(game, [("Rock", "Paper"), ("Scissors", "Paper")])
+        game.play_rounds(array('b', [0, 1, 2] * 100), array('b', [1, 1, 1] * 100))
+        self.play(game, [("Paper", "Rock")])
+        
+        history = self.store.load_history(recorder.session_id)
+        self.assertEqual(history.packed(), game.history.packed())
+        self.assertEqual(self.store.load_history(recorder.session_id, max_rounds=1)[0]["result"],
+                         "player1")
+    
+    def test_aggregates_are_per_player(self):
+        """Test that each player's stats only count their own rounds"""
+        alice = self.store.start_session("Alice")
+        bob = self.store.start_session("Bob", mode="wifi")
+        self.store.record_round(alice, 0, 2, 1)
+        self.store.record_round(bob, 0, 1, 2)
+        self.store.record_round(bob, 1, 1, 0)
+        
+        self.assertEqual(self.store.lifetime_stats("Alice")["wins"], 1)
+        self.assertEqual(self.store.lifetime_stats("Bob")["rounds"], 2)
+        self.assertEqual(self.store.lifetime_stats("Carol")["rounds"], 0)
+    
+    def test_summarize_counts(self):
+        """Test that counts by move pair give the right outcomes"""
+        stats = summarize_counts({(0, 2): 4, (2, 0): 1, (1, 1): 5})
+        self.assertEqual((stats["wins"], stats["losses"], stats["ties"]), (4, 1, 5))
+        self.assertEqual(summarize_counts({})["win_rate"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Unit tests for replay files and packed rescoring
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import sys
+import weakref
+from array import array
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from history import pack_rounds
+from replay import ReplayError, ReplayReader, ReplayWriter
+
+
+class TestPlayPacked(unittest.TestCase):
+    """Test cases for GameLogic.play_packed"""
+    
+    def test_matches_play_rounds(self):
+        """Test that packed rescoring gives the same scores and history"""
+        player = array('b', [0, 1, 2, 0, 2, 1, 1])
+        opponent = array('b', [2, 2, 2, 0, 1, 0, 1])
+        expected = GameLogic()
+        outcomes = expected.play_rounds(player, opponent)
+        
+        # Stored results are ignored and recomputed
+        game = GameLogic()
+        rounds = game.play_packed(pack_rounds(player, opponent, [0] * len(player)))
+        
+        self.assertEqual(game.get_scores(), expected.get_scores())
+        self.assertEqual(game.history.packed(), expected.history.packed())
+        self.assertEqual(rounds, pack_rounds(player, opponent, outcomes))
+    
+    def test_rejects_invalid_moves(self):
+        """Test that move bits of 3 are refused before scoring"""
+        game = GameLogic()
+        with self.assertRaises(ValueError):
+            game.play_packed(bytes([0x00, 0x03]))
+        self.assertEqual(game.get_scores(), (0, 0, 0))
+
+
+class TestReplayFiles(unittest.TestCase):
+    """Test cases for ReplayWriter and ReplayReader"""
+    
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "match.rpr")
+    
+    def record(self, close=True):
+        game = GameLogic()
+        writer = ReplayWriter(self.path, "Alice", "Bøb")
+        game.add_listener(writer)
+        game.play_round("Rock", "Scissors")
+        game.play_rounds(array('b', [1, 2, 0] * 1000), array('b', [1, 1, 1] * 1000))
+        game.play_round("Paper", "Scissors")
+        if close:
+            writer.close()
+        else:
+            writer._file.flush()
+            self.addCleanup(writer._file.close)
+        return game
+    
+    def test_round_trip(self):
+        """Test that a recorded match reads back and rescores identically"""
+        game = self.record()
+        with ReplayReader(self.path) as replay:
+            self.assertEqual((replay.player, replay.opponent), ("Alice", "Bøb"))
+            self.assertTrue(replay.complete)
+            self.assertEqual(len(replay), 3002)
+            self.assertEqual(bytes(replay.packed()), game.history.packed())
+            self.assertEqual(replay.rescore(chunk_size=1000).get_scores(), game.get_scores())
+            self.assertEqual(replay.verify(), 0)
+    
+    def test_long_names_truncated(self):
+        """Test that names are cut to 255 bytes on a character boundary"""
+        ReplayWriter(self.path, "é" * 200, "x" * 300).close()
+        with ReplayReader(self.path) as replay:
+            self.assertEqual(replay.player, "é" * 127)
+            self.assertEqual(replay.opponent, "x" * 255)
+    
+    def test_unclosed_recording_is_readable(self):
+        """Test that a replay whose writer died still replays what was written"""
+        game = self.record(close=False)
+        with ReplayReader(self.path) as replay:
+            self.assertFalse(replay.complete)
+            self.assertEqual(replay.rescore().get_scores(), game.get_scores())
+    
+    def test_verify_finds_tampered_results(self):
+        """Test that edited results are caught"""
+        self.record()
+        with ReplayReader(self.path) as replay:
+            offset = replay.data_offset
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            f.write(bytes([0x08]))  # Rock vs Scissors, result changed to a tie
+        with ReplayReader(self.path) as replay:
+            self.assertEqual(replay.verify(), 1)
+    
+    def test_verify_counts_corrupt_rounds(self):
+        """Test that invalid move bits mid-file are counted instead of raised"""
+        self.record()
+        with ReplayReader(self.path) as replay:
+            offset = replay.data_offset + len(replay) // 2
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            f.write(bytes([0x03, 0xFF, 0x80]))  # invalid player move, all bits set, stray high bit
+        with ReplayReader(self.path) as replay:
+            self.assertEqual(replay.verify(chunk_size=1000), 3)
+            with self.assertRaises(ValueError):
+                replay.rescore()
+    
+    def test_close_with_views_alive(self):
+        """Test that close() tolerates held slices and frees the mapping after them"""
+        self.record()
+        replay = ReplayReader(self.path)
+        mapping = weakref.ref(replay._map)
+        head = replay.packed(0, 10)
+        chunk = next(replay.chunks(100))
+        expected = bytes(head)
+        
+        replay.close()
+        replay.close()
+        self.assertEqual(bytes(head), expected)
+        self.assertIsNotNone(mapping())
+        
+        head.release()
+        chunk.release()
+        self.assertIsNone(mapping())
+    
+    def test_empty_and_foreign_files(self):
+        """Test that empty replays work and other files are rejected"""
+        ReplayWriter(self.path).close()
+        with ReplayReader(self.path) as replay:
+            self.assertEqual(len(replay), 0)
+            self.assertEqual(replay.rescore().get_scores(), (0, 0, 0))
+        
+        with open(self.path, "wb") as f:
+            f.write(b"not a replay at all, just some bytes")
+        with self.assertRaises(ReplayError):
+            ReplayReader(self.path)
+        
+        with open(self.path, "wb") as f:
+            f.write(struct.pack(">4sBBQdBB", b"RPSR", 99, 0, 0, 0.0, 0, 0))
+        with self.assertRaises(ReplayError):
+            ReplayReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for seeded move generation
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from rng import MoveSource, derive_seed
+from strategies import MarkovStrategy, create_strategy
+from tournament import play_match, schedule
+
+
+class TestMoveSource(unittest.TestCase):
+    """Test cases for MoveSource"""
+    
+    def test_seeded_streams_repeat(self):
+        """Test that a seed always gives the same moves"""
+        self.assertEqual(MoveSource(42).moves(1000), MoveSource(42).moves(1000))
+        self.assertNotEqual(MoveSource(42).moves(1000), MoveSource(43).moves(1000))
+    
+    def test_stream_is_stable(self):
+        """Test that a seed gives the same moves on every Python version"""
+        self.assertEqual(MoveSource(1).moves(16),
+                         bytes([2, 0, 2, 1, 2, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 1]))
+    
+    def test_consumption_pattern_does_not_matter(self):
+        """Test that single moves and bulk reads walk the same stream"""
+        bulk = MoveSource(7, block_size=64).moves(500)
+        
+        source = MoveSource(7, block_size=64)
+        mixed = bytes(source.next_move() for _ in range(37)) + source.moves(200)
+        mixed += bytes(source.next_move() for _ in range(263))
+        self.assertEqual(mixed, bulk)
+    
+    def test_moves_are_uniform(self):
+        """Test that every move code appears about a third of the time"""
+        moves = MoveSource(1).moves(300_000)
+        self.assertEqual(set(moves), {0, 1, 2})
+        for code in range(3):
+            self.assertAlmostEqual(moves.count(code) / len(moves), 1 / 3, delta=0.005)
+    
+    def test_blocks_are_prefetched(self):
+        """Test that moves come from a few large draws, not one call each"""
+        source = MoveSource(3, block_size=4096)
+        for _ in range(10_000):
+            source.next_move()
+        self.assertLessEqual(source.refills, 3)
+    
+    def test_spawned_streams(self):
+        """Test that children are reproducible and independent of each other"""
+        first = [child.moves(200) for child in MoveSource(9).spawn_many(3)]
+        again = [child.moves(200) for child in MoveSource(9).spawn_many(3)]
+        self.assertEqual(first, again)
+        self.assertEqual(len(set(first)), 3)
+        self.assertNotEqual(derive_seed(9, 0), derive_seed(9, 1))
+        
+        with self.assertRaises(ValueError):
+            MoveSource(block_size=0)
+
+
+class TestSeededGames(unittest.TestCase):
+    """Test cases for reproducible games and simulations"""
+    
+    def test_seeded_game_logic(self):
+        """Test that a seeded GameLogic plays the same computer moves"""
+        def computer_moves(seed):
+            game = GameLogic(seed=seed)
+            return [game.play_round("Rock")[0] for _ in range(100)]
+        
+        self.assertEqual(computer_moves(5), computer_moves(5))
+        self.assertNotEqual(computer_moves(5), computer_moves(6))
+    
+    def test_seed_reaches_custom_strategy(self):
+        """Test that a given strategy draws from the game's stream"""
+        game = GameLogic(strategy=MarkovStrategy(), seed=11)
+        self.assertIs(game.strategy.rng, game.rng)
+        self.assertIs(create_strategy("cycle", rng=game.rng).rng, game.rng)
+    
+    def test_matches_do_not_share_a_stream(self):
+        """Test that derived match seeds differ and replay the same match"""
+        seeds = [match[3] for match in schedule(["random", "markov", "cycle"], 100, 2, seed=1)]
+        self.assertEqual(len(set(seeds)), len(seeds))
+        self.assertEqual(play_match("random", "random", 500, seeds[0]),
+                         play_match("random", "random", 500, seeds[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
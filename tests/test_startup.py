@@ -0,0 +1,81 @@
+"""
+Startup import budget tests
+Runs a fresh interpreter with -X importtime and checks what `import main` loads
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Cumulative import time allowed for src/main.py (tkinter included), in ms.
+# Override with RPS_IMPORT_BUDGET_MS on unusually slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("RPS_IMPORT_BUDGET_MS", 150))
+
+# Modules that only the multiplayer screens need
+DEFERRED_MODULES = ("socket", "selectors", "json", "threading", "utils",
+                    "netinfo", "discovery", "net_loop", "framing", "binary_codec", "match_engine", "bluetooth",
+                    "sqlite3", "persistence", "heartbeat", "metrics")
+
+
+def import_times(statement):
+    """
+    Run a statement in a fresh interpreter and collect -X importtime output
+    
+    Args:
+        statement: Python code to run with src/ on the path
+    
+    Returns:
+        Dict of module name -> cumulative import time in microseconds
+    """
+    code = f"import sys; sys.path.insert(0, {SRC_DIR!r}); {statement}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, timeout=60)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            times[parts[2].strip()] = int(parts[1])
+        except (IndexError, ValueError):
+            # Header line
+            continue
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the single-player startup path"""
+    
+    @classmethod
+    def setUpClass(cls):
+        try:
+            import tkinter  # noqa: F401
+        except ImportError:
+            raise unittest.SkipTest("tkinter is not available")
+        cls.times = import_times("import main")
+    
+    def test_networking_is_deferred(self):
+        """Test that starting the game does not load the multiplayer stack"""
+        loaded = [name for name in DEFERRED_MODULES if name in self.times]
+        self.assertEqual(loaded, [])
+    
+    def test_import_budget(self):
+        """Test that importing the entry point stays within the budget"""
+        # setUpClass already ran once, so .pyc compilation is not counted
+        times = import_times("import main")
+        self.assertLess(times["main"] / 1000, IMPORT_BUDGET_MS)
+    
+    def test_multiplayer_modules_still_import(self):
+        """Test that the deferred modules load when a multiplayer screen needs them"""
+        times = import_times("import main, framing, match_engine, utils")
+        self.assertIn("socket", times)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Unit tests for the streaming statistics
+"""
+
+import random
+import unittest
+import sys
+import os
+from array import array
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from stats import RoundStats
+
+
+def brute_force(player, opponent, window):
+    """Statistics computed the slow way, from full move lists"""
+    results = [(p - o) % 3 for p, o in zip(player, opponent)]
+    names = {0: "tie", 1: "win", 2: "loss"}
+    
+    longest = {"win": 0, "loss": 0, "tie": 0}
+    streak = 0
+    for i, result in enumerate(results):
+        streak = streak + 1 if i and results[i - 1] == result else 1
+        longest[names[result]] = max(longest[names[result]], streak)
+    
+    transitions = [[0] * 3 for _ in range(3)]
+    for previous, following in zip(player, player[1:]):
+        transitions[previous][following] += 1
+    
+    recent = results[-window:]
+    return {
+        "wins": results.count(1),
+        "losses": results.count(2),
+        "ties": results.count(0),
+        "moves": [player.count(code) for code in range(3)],
+        "transitions": transitions,
+        "streak": {"result": names[results[-1]], "length": streak},
+        "longest_streaks": longest,
+        "window": (recent.count(1), recent.count(2), recent.count(0)),
+    }
+
+
+class TestRoundStats(unittest.TestCase):
+    """Test cases for RoundStats"""
+    
+    def check(self, stats, player, opponent):
+        expected = brute_force(player, opponent, stats.window)
+        snapshot = stats.snapshot()
+        
+        self.assertEqual(snapshot["rounds"], len(player))
+        for key in ("wins", "losses", "ties", "streak", "longest_streaks"):
+            self.assertEqual(snapshot[key], expected[key], key)
+        self.assertEqual(stats.moves, expected["moves"])
+        self.assertEqual(stats.transitions, expected["transitions"])
+        window = snapshot["window"]
+        self.assertEqual((window["wins"], window["losses"], window["ties"]), expected["window"])
+    
+    def test_single_rounds(self):
+        """Test that per-round updates match a full recount"""
+        rng = random.Random(3)
+        player = [rng.randrange(3) for _ in range(300)]
+        opponent = [rng.randrange(3) for _ in range(300)]
+        
+        game = GameLogic()
+        stats = RoundStats(window=10)
+        game.add_listener(stats)
+        for p, o in zip(player, opponent):
+            game.play_round(GameLogic.MOVES[p], GameLogic.MOVES[o])
+        
+        self.check(stats, player, opponent)
+    
+    def test_batches_match_single_rounds(self):
+        """Test that batches of any size (streaks across batch edges) stay exact"""
+        rng = random.Random(5)
+        # Biased moves give long streaks that cross batch boundaries
+        player = [rng.choice((0, 0, 0, 1, 2)) for _ in range(2000)]
+        opponent = [rng.choice((2, 2, 2, 0, 1)) for _ in range(2000)]
+        
+        game = GameLogic()
+        stats = RoundStats(window=25)
+        game.add_listener(stats)
+        start = 0
+        while start < len(player):
+            size = rng.choice((1, 3, 24, 25, 100, 400))
+            game.play_rounds(array('b', player[start:start + size]),
+                             array('b', opponent[start:start + size]))
+            start += size
+        
+        self.check(stats, player, opponent)
+    
+    def test_batch_extending_streak(self):
+        """Test that a batch made of one run continues the current streak"""
+        stats = RoundStats(window=5)
+        game = GameLogic()
+        game.add_listener(stats)
+        game.play_round("Rock", "Scissors")
+        game.play_rounds(array('b', [0] * 30), array('b', [2] * 30))
+        
+        self.assertEqual(stats.snapshot()["streak"], {"result": "win", "length": 31})
+        self.assertEqual(stats.snapshot()["longest_streaks"]["win"], 31)
+    
+    def test_reset_and_empty_snapshot(self):
+        """Test that a reset clears everything and empty rates are zero"""
+        game = GameLogic()
+        stats = RoundStats()
+        game.add_listener(stats)
+        game.play_round("Rock", "Paper")
+        game.reset_scores()
+        
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["rounds"], 0)
+        self.assertEqual(snapshot["win_rate"], 0.0)
+        self.assertEqual(snapshot["streak"], {"result": None, "length": 0})
+        self.assertEqual(snapshot["window"]["win_rate"], 0.0)
+        with self.assertRaises(ValueError):
+            RoundStats(window=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
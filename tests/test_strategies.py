@@ -0,0 +1,65 @@
+"""
+Unit tests for computer opponent strategies
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_logic import GameLogic
+from strategies import CycleStrategy, MarkovStrategy, create_strategy
+
+
+class TestStrategies(unittest.TestCase):
+    """Test cases for strategy implementations"""
+    
+    def test_markov_counters_repeated_move(self):
+        """Test that the Markov opponent learns a player who always plays Rock"""
+        game = GameLogic(strategy=MarkovStrategy(order=1))
+        for _ in range(20):
+            game.play_round("Rock")
+        
+        self.assertEqual(game.get_computer_move(), "Paper")
+    
+    def test_markov_beats_cycle(self):
+        """Test that an order-2 model wins almost every round against a cycle"""
+        markov = MarkovStrategy(order=2)
+        cycle = CycleStrategy()
+        wins = 0
+        for _ in range(300):
+            mine, theirs = markov.choose(), cycle.choose()
+            wins += (mine - theirs) % 3 == 1
+            markov.observe(theirs, mine)
+            cycle.observe(mine, theirs)
+        
+        self.assertGreater(wins, 280)
+    
+    def test_markov_memory_is_bounded(self):
+        """Test that the model size depends only on the order"""
+        markov = MarkovStrategy(order=3)
+        for i in range(10000):
+            markov.observe(i % 3, 0)
+        
+        self.assertEqual(len(markov._counts), 3 ** 4)
+    
+    def test_reset_scores_resets_strategy(self):
+        """Test that reset_scores clears learned state"""
+        strategy = MarkovStrategy(order=1)
+        game = GameLogic(strategy=strategy)
+        for _ in range(5):
+            game.play_round("Scissors")
+        game.reset_scores()
+        
+        self.assertEqual(strategy.predict(), -1)
+    
+    def test_unknown_strategy(self):
+        """Test that unknown strategy names are rejected"""
+        with self.assertRaises(ValueError):
+            create_strategy("psychic")
+
+
+if __name__ == '__main__':
+    unittest.main()
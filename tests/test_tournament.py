@@ -0,0 +1,51 @@
+"""
+Unit tests for the headless tournament runner
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tournament import play_match, run_tournament, schedule
+
+
+class TestTournament(unittest.TestCase):
+    """Test cases for tournament matches and standings"""
+    
+    def test_match_totals(self):
+        """Test that every round of a match is accounted for"""
+        name_a, name_b, a_wins, b_wins, ties = play_match("markov", "cycle", 500, seed=1)
+        
+        self.assertEqual((name_a, name_b), ("markov", "cycle"))
+        self.assertEqual(a_wins + b_wins + ties, 500)
+        self.assertGreater(a_wins, b_wins)
+    
+    def test_seeded_match_is_reproducible(self):
+        """Test that the same seed replays the same match"""
+        self.assertEqual(play_match("random", "markov", 300, seed=7),
+                         play_match("random", "markov", 300, seed=7))
+    
+    def test_round_robin_standings(self):
+        """Test that the tournament plays every pairing and balances the tables"""
+        names = ["random", "cycle", "markov"]
+        final = None
+        for final in run_tournament(names, rounds=200, matches_per_pair=2, workers=2, seed=5):
+            pass
+        
+        self.assertEqual(final.matches_played, len(schedule(names, 200, 2)))
+        wins = sum(totals[0] for totals in final.totals.values())
+        losses = sum(totals[1] for totals in final.totals.values())
+        self.assertEqual(wins, losses)
+        self.assertEqual(len(final.pairs), 3)
+    
+    def test_unknown_strategy(self):
+        """Test that unknown strategies are rejected before any work starts"""
+        with self.assertRaises(ValueError):
+            list(run_tournament(["random", "psychic"], rounds=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
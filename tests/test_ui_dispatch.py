@@ -0,0 +1,86 @@
+"""
+Unit tests for coalesced UI updates (no display needed)
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from ui_dispatch import UIDispatcher
+except ImportError:
+    UIDispatcher = None
+
+
+class FakeWidget:
+    """Records config() calls like a Tk label would receive them"""
+    
+    def __init__(self):
+        self.calls = []
+        self.exists = True
+    
+    def winfo_exists(self):
+        return self.exists
+    
+    def config(self, **options):
+        self.calls.append(options)
+
+
+@unittest.skipIf(UIDispatcher is None, "tkinter is not available")
+class TestUIDispatcher(unittest.TestCase):
+    """Test cases for UIDispatcher"""
+    
+    def setUp(self):
+        self.scheduled = []
+        self.dispatcher = UIDispatcher(lambda ms, callback: self.scheduled.append((ms, callback)))
+    
+    def run_frame(self):
+        _, callback = self.scheduled.pop(0)
+        callback()
+    
+    def test_burst_paints_latest_state_once(self):
+        """Test that 1000 results cost one schedule and one config per widget"""
+        result, score = FakeWidget(), FakeWidget()
+        for round_num in range(1, 1001):
+            self.dispatcher.configure(result, text=f"Round {round_num}", fg="green")
+            self.dispatcher.configure(score, text=f"Score: {round_num} - 0")
+        
+        self.assertEqual(len(self.scheduled), 1)
+        self.run_frame()
+        self.assertEqual(result.calls, [{"text": "Round 1000", "fg": "green"}])
+        self.assertEqual(score.calls, [{"text": "Score: 1000 - 0"}])
+        self.assertEqual(self.dispatcher.frames, 1)
+    
+    def test_options_are_merged(self):
+        """Test that separate updates of different options are all kept"""
+        label = FakeWidget()
+        self.dispatcher.configure(label, text="Connecting...", fg="orange")
+        self.dispatcher.configure(label, text="Connected")
+        self.run_frame()
+        self.assertEqual(label.calls, [{"text": "Connected", "fg": "orange"}])
+    
+    def test_idle_schedules_nothing(self):
+        """Test that a flush only reschedules once new updates arrive"""
+        label = FakeWidget()
+        self.dispatcher.configure(label, text="a")
+        self.run_frame()
+        self.assertEqual(self.scheduled, [])
+        
+        self.dispatcher.configure(label, text="b")
+        self.assertEqual(len(self.scheduled), 1)
+    
+    def test_destroyed_widgets_are_skipped(self):
+        """Test that updates for a screen that was left are dropped"""
+        label = FakeWidget()
+        self.dispatcher.configure(label, text="late result")
+        label.exists = False
+        self.run_frame()
+        self.assertEqual(label.calls, [])
+        self.assertEqual(self.dispatcher.pending(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
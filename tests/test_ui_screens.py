@@ -0,0 +1,130 @@
+"""
+Screen cache and theme tests for GameUI (skipped without a display)
+"""
+
+import socket
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    import tkinter as tk
+    from framing import MessageStream
+    from ui import GameUI, ModernButton, Theme
+except ImportError:
+    tk = None
+
+
+def all_widgets(widget):
+    """Every descendant of a widget"""
+    found = []
+    for child in widget.winfo_children():
+        found.append(child)
+        found.extend(all_widgets(child))
+    return found
+
+
+@unittest.skipIf(tk is None, "tkinter is not available")
+class TestScreenCache(unittest.TestCase):
+    """Test cases for cached screens and in-place theming"""
+    
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("no display")
+        self.addCleanup(self.root.destroy)
+        self.app = GameUI(self.root)
+    
+    def navigate(self):
+        self.app.show_single_player()
+        self.app.play_move("Rock")
+        self.app.show_main_menu()
+        self.app.show_wifi_menu()
+        self.app.show_bluetooth_menu()
+        self.app.show_main_menu()
+    
+    def test_navigation_reuses_widgets(self):
+        """Test that returning to a screen creates no new widgets"""
+        self.navigate()
+        widgets = set(map(str, all_widgets(self.root)))
+        for _ in range(5):
+            self.navigate()
+        self.assertEqual(set(map(str, all_widgets(self.root))), widgets)
+    
+    def test_single_player_is_reset_on_entry(self):
+        """Test that a cached screen still starts a fresh game"""
+        self.app.show_single_player()
+        self.app.play_move("Rock")
+        self.app.show_main_menu()
+        self.app.show_single_player()
+        self.assertEqual(self.app.score_label.cget("text"), "Score: 0 - 0")
+        self.assertEqual(self.app.game_logic.get_scores()[2], 0)
+    
+    def test_theme_toggle_recolors_in_place(self):
+        """Test that toggling the theme keeps every widget and recolors it"""
+        self.navigate()
+        self.app.show_single_player()
+        self.app.play_move("Rock")
+        widgets = set(map(str, all_widgets(self.root)))
+        
+        self.app.toggle_theme()
+        self.assertEqual(set(map(str, all_widgets(self.root))), widgets)
+        self.assertEqual(self.root.cget("bg"), Theme.DARK["bg"])
+        for widget, roles in self.app.themed_widgets.items():
+            if isinstance(widget, ModernButton):
+                self.assertEqual(widget.bg_color, Theme.DARK[roles["button"]])
+                continue
+            for option, role in roles.items():
+                self.assertEqual(widget.cget(option), Theme.DARK[role])
+    
+    def test_exit_button_shuts_down(self):
+        """Test that the menu's Exit button goes through shutdown()"""
+        self.app.show_main_menu()
+        exits = [widget for widget in all_widgets(self.root)
+                 if isinstance(widget, ModernButton)
+                 and widget.itemcget(widget.text_item, "text") == "❌ Exit"]
+        self.assertEqual(len(exits), 1)
+        self.assertEqual(exits[0].command, self.app.shutdown)
+    
+    def test_hosted_game_prompts_guest(self):
+        """Test that the host opens each round for command-line guests"""
+        left, right = socket.socketpair()
+        right.settimeout(5)
+        guest = MessageStream(right)
+        self.addCleanup(guest.close)
+        self.app.is_hosting = self.app.multiplayer_running = True
+        self.app.on_guest_connected(left, ("127.0.0.1", 0))
+        self.addCleanup(self.app.close_session, False)
+        
+        self.assertEqual(guest.receive()["type"], "handshake")
+        self.assertEqual(guest.receive(), {"type": "move", "player": "host", "round": 1})
+        self.app.match_engine.submit("guest", "Rock")
+        self.app.publish_result(self.app.match_engine.submit("host", "Paper"))
+        self.assertEqual(guest.receive()["winner"], "server")
+        self.assertEqual(guest.receive(), {"type": "move", "player": "host", "round": 2})
+    
+    def test_guest_refuses_concurrent_host(self):
+        """Test that joining a --concurrent server fails instead of stalling"""
+        left, right = socket.socketpair()
+        right.settimeout(5)
+        host = MessageStream(right)
+        self.addCleanup(host.close)
+        self.app.show_wifi_join_input()
+        self.app.on_host_connected(left)
+        stream = self.app.stream
+        
+        with mock.patch("ui.messagebox") as messagebox:
+            self.app.handle_network_message(stream, {"type": "handshake", "player": "server",
+                                                     "version": "1.0", "mode": "concurrent"})
+        self.assertIn("concurrent mode", messagebox.showerror.call_args[0][1])
+        self.assertIsNone(self.app.stream)
+        self.assertEqual(host.receive(), {"type": "disconnect"})
+
+
+if __name__ == '__main__':
+    unittest.main()
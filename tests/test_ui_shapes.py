@@ -0,0 +1,105 @@
+"""
+Unit tests for the cached ModernButton shapes
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    import tkinter as tk
+    from ui import ModernButton, ShapeCache, rounded_rect_pixels, rounded_rect_points
+except ImportError:
+    tk = None
+
+
+def parse_rows(data):
+    """Split PhotoImage data back into rows of colors"""
+    return [row.split() for row in data[1:-1].split("} {")]
+
+
+@unittest.skipIf(tk is None, "tkinter is not available")
+class TestRoundedRectPixels(unittest.TestCase):
+    """Test cases for the rendered rounded rectangle"""
+    
+    def test_size_and_colors(self):
+        """Test that the data covers the whole image with two colors"""
+        rows = parse_rows(rounded_rect_pixels(40, 20, 6, "#111111", "#eeeeee"))
+        self.assertEqual(len(rows), 20)
+        self.assertTrue(all(len(row) == 40 for row in rows))
+        self.assertEqual({c for row in rows for c in row}, {"#111111", "#eeeeee"})
+    
+    def test_corners_are_rounded(self):
+        """Test that corners show the background and the middle is filled"""
+        rows = parse_rows(rounded_rect_pixels(40, 20, 6, "F", "B"))
+        for y, x in ((0, 0), (0, 39), (19, 0), (19, 39)):
+            self.assertEqual(rows[y][x], "B")
+        self.assertEqual(rows[0][20], "F")
+        self.assertEqual(rows[10], ["F"] * 40)
+        # Insets shrink towards the middle and mirror top to bottom
+        insets = [row.index("F") for row in rows]
+        self.assertEqual(insets[:6], sorted(insets[:6], reverse=True))
+        self.assertEqual(insets, insets[::-1])
+        self.assertEqual(rows, [row[::-1] for row in rows])
+    
+    def test_radius_is_clamped(self):
+        """Test that a radius larger than the button still renders"""
+        rows = parse_rows(rounded_rect_pixels(8, 6, 10, "F", "B"))
+        self.assertEqual(len(rows), 6)
+        self.assertIn("F", rows[3])
+    
+    def test_results_are_cached(self):
+        """Test that identical shapes reuse one result"""
+        self.assertIs(rounded_rect_pixels(30, 10, 4, "F", "B"),
+                      rounded_rect_pixels(30, 10, 4, "F", "B"))
+        self.assertIs(rounded_rect_points(0, 0, 200, 50, 10),
+                      rounded_rect_points(0, 0, 200, 50, 10))
+        self.assertEqual(len(rounded_rect_points(0, 0, 200, 50, 10)), 40)
+
+
+@unittest.skipIf(tk is None, "tkinter is not available")
+class TestShapeCache(unittest.TestCase):
+    """Test cases for images shared between buttons (skipped without a display)"""
+    
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("no display")
+        self.addCleanup(self.root.destroy)
+        self.frame = tk.Frame(self.root, bg="#ffffff")
+    
+    def test_buttons_share_images(self):
+        """Test that equal buttons render their shape once"""
+        buttons = [ModernButton(self.frame, str(i), None, bg_color="#1A73E8") for i in range(5)]
+        cache = ShapeCache.for_widget(buttons[0])
+        self.assertIs(cache, ShapeCache.for_widget(self.root))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 4)
+        
+        buttons[0]._on_enter(None)
+        buttons[1]._on_enter(None)
+        self.assertEqual(cache.misses, 2)
+    
+    def test_update_colors_uses_new_background(self):
+        """Test that a theme change renders against the new background"""
+        button = ModernButton(self.frame, "Play", None)
+        button.update_colors("#333333", "#444444", canvas_bg="#000000")
+        self.assertTrue(button.itemcget(button.rect, "image"))
+        self.assertIn((200, 50, 10, "#333333", "#000000"), ShapeCache.for_widget(button)._images)
+    
+    def test_polygon_fallback(self):
+        """Test that buttons can still be drawn as canvas polygons"""
+        ModernButton.use_images = False
+        self.addCleanup(setattr, ModernButton, "use_images", True)
+        button = ModernButton(self.frame, "Play", None)
+        self.assertEqual(button.type(button.rect), "polygon")
+        button.update_colors("#333333", "#444444")
+        self.assertEqual(button.itemcget(button.rect, "fill"), "#333333")
+
+
+if __name__ == '__main__':
+    unittest.main()